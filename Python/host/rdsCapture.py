@@ -0,0 +1,98 @@
+# (c) 2024 SA6HBR
+#
+# RDS capture files, written by host/rdsDaemon.py --capture DIR and read by host/rdsIndexer.py
+# One file per receiver and UTC day: DIR/<receiver>-YYYYMMDD.rdsc
+#
+# File, little endian:
+#   header : "RDSC" version u8, name length u8, receiver name
+#   record : time f64 (unix s, host clock), A u16, B u16, C u16, D u16, BLER u8, channel u16
+#            BLER = BLERA<<6 | BLERB<<4 | BLERC<<2 | BLERD, as in imports/rdsFrame.py
+# Records have a fixed size, so a file can be memory mapped and read without parsing.
+#
+
+import mmap
+import os
+import struct
+import time
+
+CAPTURE_MAGIC   = b"RDSC"
+CAPTURE_HEADER  = "<4sBB"
+CAPTURE_RECORD  = "<dHHHHBH"
+HEADER_SIZE     = struct.calcsize(CAPTURE_HEADER)
+RECORD_SIZE     = struct.calcsize(CAPTURE_RECORD)
+CAPTURE_SUFFIX  = ".rdsc"
+
+def fileName(name):
+    # Receiver name or port as part of a file name, /dev/ttyACM0 -> ttyACM0
+    name = os.path.basename(name) or "receiver"
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+class captureWriter():
+    # Appends the groups of one receiver, a new file at each UTC day
+
+    flushInterval = 2  # s, at most this much is lost when the daemon is killed
+
+    def __init__(self, directory, name):
+        self.directory = directory
+        self.name      = name
+        self.path      = None
+        self.file      = None
+        self.day       = None
+        self.records   = 0
+        self.flushTime = 0
+
+    def open(self, day):
+        self.close()
+        self.day  = day
+        self.path = os.path.join(self.directory, fileName(self.name) + "-" + day + CAPTURE_SUFFIX)
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, "ab")
+        if (new):
+            name = self.name.encode()[:255]
+            self.file.write(struct.pack(CAPTURE_HEADER, CAPTURE_MAGIC, 1, len(name)) + name)
+
+    def group(self, now, A, B, C, D, BLER, channel):
+        day = time.strftime("%Y%m%d", time.gmtime(now))
+        if (day != self.day): self.open(day)
+        self.file.write(struct.pack(CAPTURE_RECORD, now, A, B, C, D, BLER, channel))
+        self.records += 1
+        if (now - self.flushTime >= self.flushInterval):
+            self.flushTime = now
+            self.file.flush()
+
+    def rename(self, name):
+        # The receiver told its name (HELLO), continue in a file of that name
+        if (name == self.name): return
+        self.name = name
+        self.close()
+
+    def close(self):
+        if (self.file is not None): self.file.close()
+        self.file = None
+        self.day  = None
+
+def readHeader(data):
+    # (version, receiver name, offset of the first record)
+    magic, version, length = struct.unpack_from(CAPTURE_HEADER, data)
+    if (magic != CAPTURE_MAGIC): raise ValueError("Not an RDS capture")
+    return (version, bytes(data[HEADER_SIZE:HEADER_SIZE + length]).decode("utf-8", "replace"), HEADER_SIZE + length)
+
+def readCapture(path):
+    # Receiver name and an iterator of (time, A, B, C, D, BLER, channel), a partly written last record is left out
+    with open(path, "rb") as f:
+        if (os.fstat(f.fileno()).st_size < HEADER_SIZE): return ("", iter(()))
+        data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    version, name, offset = readHeader(data)
+    end = offset + (len(data) - offset) // RECORD_SIZE * RECORD_SIZE
+    return (name, struct.iter_unpack(CAPTURE_RECORD, memoryview(data)[offset:end]))
+
+def captureFiles(paths):
+    # Capture files among paths, directories are searched
+    files = []
+    for path in paths:
+        if (os.path.isdir(path)):
+            for root, dirs, names in os.walk(path):
+                files += [os.path.join(root, name) for name in names if name.endswith(CAPTURE_SUFFIX)]
+        else:
+            files.append(path)
+    return sorted(files)
@@ -0,0 +1,84 @@
+# (c) 2024 SA6HBR
+#
+# Regression checks of the decoder core (imports/rdsDecoder.py) with hand made groups,
+# no radio and no capture files needed.
+#
+# Run from the Python directory:
+#   python3 -m host.rdsCheck
+#
+
+import sys
+
+from imports.rdsDecoder import rdsDecoder
+from host.rdsIndexer import fileIndexer, KINDNAME, PS
+
+PI = 0xE241
+
+def group0A(segment, text, TA = 0, TP = 1, PTY = 10):
+    # 0A with two PS characters of segment, block C without AF
+    B = (TP << 10) | (PTY << 5) | (TA << 4) | (1 << 3) | segment
+    D = (ord(text[segment * 2]) << 8) | ord(text[segment * 2 + 1])
+    return (PI, B, 0xE0E0, D)
+
+def feedPS(rds, text, rounds = 4, TA = 0):
+    for i in range(rounds):
+        for segment in range(4):
+            rds.feed(*group0A(segment, text, TA))
+
+def checkDynamicPS():
+    # A station scrolling its PS sends the same segments again after a few seconds,
+    # each of them has to be decoded again
+    rds = rdsDecoder()
+    for text in ("RIX FM  ", "NU: ABBA", "RIX FM  ", "NU: ABBA", "RIX FM  "):
+        feedPS(rds, text)
+        PS = bytes(rds.ProgrammeService).decode()
+        if (PS != text): return "PS " + repr(PS) + ", expected " + repr(text)
+    return None
+
+def checkTA():
+    # TA on, off and on again in groups that are otherwise the same
+    rds = rdsDecoder()
+    for TA in (0, 1, 0, 1, 0):
+        feedPS(rds, "RIX FM  ", 2, TA)
+        if (rds.TA != TA or rds.taAnnouncement != TA):
+            return "TA " + str(rds.TA) + ", taAnnouncement " + str(rds.taAnnouncement) + ", expected " + str(TA)
+    return None
+
+def checkRadioText2B():
+    # 2B: two characters per group in block D, the A/B flag starts a new text
+    rds = rdsDecoder()
+    for flag, text in ((0, "Now: ABBA - Waterloo"), (1, "Next: Roxette")):
+        text = (text + " " * 32)[:32]
+        for segment in range(16):
+            rds.feed(PI, (5 << 11) | (flag << 4) | segment, PI, (ord(text[segment * 2]) << 8) | ord(text[segment * 2 + 1]))
+        buffer = rds.RadioTextB if rds.RadioTextFlag else rds.RadioTextA
+        if (bytes(buffer[:32]).decode() != text): return "RT " + repr(bytes(buffer[:32]))
+    return None
+
+def checkReplay():
+    # A capture replayed at CPU speed: every TA change is one event and every PS text is seen
+    indexer = fileIndexer()
+    t = 1700000000.0
+    for TA, text in ((0, "RIX FM  "), (1, "NU: ABBA"), (0, "RIX FM  "), (1, "NU: ABBA"), (0, "RIX FM  ")):
+        for i in range(4):
+            for segment in range(4):
+                indexer.group(t, *group0A(segment, text, TA), 0, 1038)
+                t += 0.0877
+    events = [KINDNAME[kind] for PI, when, channel, kind, value in indexer.events if kind != PS]
+    if (events != ["TA on", "TA off", "TA on", "TA off"]): return "TA events " + str(events)
+    names = [value for PI, when, channel, kind, value in indexer.events if kind == PS and value in ("RIX FM", "NU: ABBA")]
+    if (names != ["RIX FM", "NU: ABBA", "RIX FM", "NU: ABBA", "RIX FM"]): return "PS events " + str(names)
+    return None
+
+CHECKS = (checkDynamicPS, checkTA, checkRadioText2B, checkReplay)
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        error = check()
+        print ("%-16s %s" % (check.__name__, "ok" if error is None else "FAILED: " + error))
+        if (error is not None): failed += 1
+    return failed
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
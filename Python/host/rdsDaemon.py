@@ -0,0 +1,276 @@
+# (c) 2024 SA6HBR
+#
+# RDS daemon for a Linux host
+# Reads the binary group streams (imports/rdsFrame.py) of many Pico receivers running
+# streamRDS.py, decodes them on the host with the same decoder as the Pico (imports/rdsDecoder.py)
+# and serves the state of every receiver as JSON on a unix socket.
+#
+# One asyncio loop, no threads: every serial port is opened raw and non-blocking and
+# handed to loop.add_reader, so a port only costs work when bytes arrive. A receiver
+# that is unplugged is closed and reopened every reconnectInterval seconds.
+#
+# Run from the Python directory:
+#   python3 -m host.rdsDaemon /dev/ttyACM0 /dev/ttyACM1 ...
+#   python3 -m host.rdsSimFeeder 8          # 8 simulated receivers, prints their ptys
+#   python3 -m host.rdsDaemon --capture /var/lib/rds /dev/ttyACM0 ...  # also keep every group, see host/rdsCapture.py
+#
+# Query:
+#   echo status | nc -U /tmp/rdsd.sock     # one JSON object, all receivers
+#   echo stats  | nc -U /tmp/rdsd.sock     # throughput and frame counters
+#   echo watch  | nc -U /tmp/rdsd.sock     # status as one JSON line per second
+#
+
+import asyncio
+import json
+import os
+import sys
+import termios
+import time
+import tty
+
+from imports.rdsFrame import frameReader, unpackGroup, unpackStatus, GROUP, STATUS, HELLO
+from imports.rdsClock import mjdToDate
+from imports.rdsTables import countryName, stationName
+from imports.rdsDecoder import rdsDecoder
+from host.rdsCapture import captureWriter
+
+socketPath        = "/tmp/rdsd.sock"
+reconnectInterval = 2     # s
+statsInterval     = 10    # s between throughput lines on stdout, 0 = off
+readSize          = 4096
+
+def text(buffer):
+    return "".join(chr(c) if 32 <= c < 127 else " " for c in buffer).rstrip()
+
+def decoderState(rds):
+    # JSON friendly state of an rdsDecoder
+    PI    = rds.getPI()
+    clock = rds.clock.lastDecoded()
+    clockTime = ""
+    if (clock is not None):
+        MJD, hour, minute, offset = clock
+        year, month, day, weekday = mjdToDate(MJD)
+        clockTime = "%04d-%02d-%02d %02d:%02d UTC %+.1f h" % (year, month, day, hour, minute, offset / 2)
+    RT = rds.RadioTextB if rds.RadioTextFlag else rds.RadioTextA
+    return {
+        "PI"      : "%04X" % PI,
+        "country" : countryName(PI, rds.ECC) if PI else "",
+        "station" : stationName(PI, rds.ECC) if PI else "",
+        "PS"      : text(rds.ProgrammeService),
+        "RT"      : text(RT.split(b"\r")[0]),
+        "PTY"     : rds.getRdsPTY(),
+        "TP"      : rds.TP,
+        "TA"      : rds.taAnnouncement,
+        "AF"      : sorted(ch / 10 for ch in rds.getAltFreqs()),
+        "clock"   : clockTime,
+        "EON"     : {"%04X" % PI: {"PS": text(o[0]), "MHz": o[1] / 10, "TA": o[2], "TP": o[3]} for PI, o in rds.OtherNetworks.items()},
+    }
+
+class receiver():
+
+    def __init__(self, daemon, path):
+        self.daemon    = daemon
+        self.path      = path
+        self.fd        = -1
+        self.name      = ""
+        self.reader    = frameReader()
+        self.decoder   = rdsDecoder()
+        self.channel   = 0
+        self.RSSI      = 0
+        self.stereo    = 0
+        self.RDSS      = 0
+        self.groups    = 0
+        self.blockErrors = 0  # groups dropped by the decoder, block B, C or D uncorrectable (BLER 3)
+        self.lastFrame = 0
+        self.connects  = 0
+        self.capture   = captureWriter(daemon.captureDir, path) if daemon.captureDir else None
+
+    def open(self):
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        except OSError:
+            return 0
+        try:
+            # USB-CDC ignores the baud rate, but the line discipline must not touch the bytes
+            tty.setraw(fd)
+        except termios.error:
+            pass
+        self.fd = fd
+        # Keep the counters, but do not count the frames missed while unplugged as dropped
+        self.reader.seq    = -1
+        self.reader.buffer = bytearray()
+        self.connects += 1
+        self.daemon.loop.add_reader(fd, self.readable)
+        print ("Open       : " + self.path)
+        return 1
+
+    def close(self):
+        if (self.fd < 0): return
+        self.daemon.loop.remove_reader(self.fd)
+        os.close(self.fd)
+        self.fd = -1
+        print ("Lost       : " + self.path)
+
+    def readable(self):
+        try:
+            data = os.read(self.fd, readSize)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if (not data):
+            self.close()
+            return
+        for frameType, payload in self.reader.feed(data):
+            self.frame(frameType, payload)
+
+    def frame(self, frameType, payload):
+        self.lastFrame = time.time()
+        if (frameType == GROUP):
+            ticks, A, B, C, D, BLER, channel = unpackGroup(payload)
+            if (self.capture is not None): self.capture.group(self.lastFrame, A, B, C, D, BLER, channel)
+            if (channel != self.channel):
+                self.channel = channel
+                self.decoder.clear()
+            self.groups += 1
+            self.daemon.groups += 1
+            PI = self.decoder.getPI()
+            if (PI != 0 and A != PI and ((BLER >> 6) & 0b11) != 3):
+                # An other station, start over
+                self.decoder.clear()
+            if (self.decoder.feed(A, B, C, D, BLER) < 0): self.blockErrors += 1
+        elif (frameType == STATUS):
+            ticks, statusRSSI, channel = unpackStatus(payload)
+            self.channel = channel
+            self.RSSI    = statusRSSI & 0xFF
+            self.stereo  = (statusRSSI >> 8) & 0b1
+            self.RDSS    = (statusRSSI >> 11) & 0b1
+        elif (frameType == HELLO):
+            self.name = payload.decode("ascii", "replace")
+            if (self.capture is not None and self.name): self.capture.rename(self.name)
+
+    def state(self):
+        state = {
+            "port"   : self.path,
+            "name"   : self.name,
+            "online" : self.fd >= 0,
+            "MHz"    : self.channel / 10,
+            "RSSI"   : self.RSSI,
+            "stereo" : self.stereo,
+            "RDSS"   : self.RDSS,
+        }
+        state.update(decoderState(self.decoder))
+        return state
+
+    def stats(self):
+        reader = self.reader
+        return {
+            "port"        : self.path,
+            "name"        : self.name,
+            "online"      : self.fd >= 0,
+            "connects"    : self.connects,
+            "bytes"       : reader.bytes,
+            "frames"      : reader.frames,
+            "dropped"     : reader.dropped,
+            "badFrames"   : reader.badFrames,
+            "skipped"     : reader.skipped,
+            "groups"      : self.groups,
+            "blockErrors" : self.blockErrors,
+            "captured"    : self.capture.records if self.capture is not None else 0,
+            "groupTypes"  : {"%d%s" % (code >> 1, "AB"[code & 1]): n for code, n in enumerate(self.decoder.groupTypeCount) if n},
+        }
+
+class rdsDaemon():
+
+    def __init__(self, paths, path = socketPath, captureDir = None):
+        self.socketPath = path
+        self.captureDir = captureDir
+        self.loop      = None
+        self.receivers = []
+        for p in paths: self.receivers.append(receiver(self, p))
+        self.groups    = 0
+        self.startTime = time.time()
+
+    async def reconnect(self):
+        while True:
+            for r in self.receivers:
+                if (r.fd < 0): r.open()
+            await asyncio.sleep(reconnectInterval)
+
+    async def printStats(self):
+        lastGroups = 0
+        lastTime   = time.time()
+        while True:
+            await asyncio.sleep(statsInterval)
+            now = time.time()
+            online  = sum(1 for r in self.receivers if r.fd >= 0)
+            dropped = sum(r.reader.dropped for r in self.receivers)
+            print ("Groups/s   : %.1f, receivers online: %d/%d, dropped frames: %d" % ((self.groups - lastGroups) / (now - lastTime), online, len(self.receivers), dropped))
+            lastGroups = self.groups
+            lastTime   = now
+
+    def stats(self):
+        uptime = time.time() - self.startTime
+        return {
+            "uptime"    : round(uptime, 1),
+            "groups"    : self.groups,
+            "groupsPerS": round(self.groups / uptime, 1) if uptime > 0 else 0,
+            "receivers" : [r.stats() for r in self.receivers],
+        }
+
+    def status(self):
+        return {"time": time.time(), "receivers": [r.state() for r in self.receivers]}
+
+    async def client(self, reader, writer):
+        try:
+            command = (await reader.readline()).decode().strip().lower()
+            if (command == "watch"):
+                while True:
+                    writer.write((json.dumps(self.status()) + "\n").encode())
+                    await writer.drain()
+                    await asyncio.sleep(1)
+            if (command == "stats"): answer = self.stats()
+            else: answer = self.status()
+            writer.write((json.dumps(answer, indent = 1) + "\n").encode())
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        if (os.path.exists(self.socketPath)): os.unlink(self.socketPath)
+        server = await asyncio.start_unix_server(self.client, self.socketPath)
+        print ("Serving    : " + self.socketPath)
+        tasks = [asyncio.create_task(self.reconnect())]
+        if (statsInterval): tasks.append(asyncio.create_task(self.printStats()))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks: task.cancel()
+            for r in self.receivers:
+                r.close()
+                if (r.capture is not None): r.capture.close()
+            if (os.path.exists(self.socketPath)): os.unlink(self.socketPath)
+
+def main(argv):
+    args = argv[1:]
+    path = socketPath
+    captureDir = None
+    while (len(args) >= 2 and args[0] in ("--socket", "--capture")):
+        if (args[0] == "--socket"): path = args[1]
+        else: captureDir = args[1]
+        args = args[2:]
+    if (not args):
+        print ("Usage: python3 -m host.rdsDaemon [--socket " + socketPath + "] [--capture DIR] /dev/ttyACM0 ...")
+        return
+    if (captureDir is not None): os.makedirs(captureDir, exist_ok = True)
+    try:
+        asyncio.run(rdsDaemon(args, path, captureDir).run())
+    except KeyboardInterrupt:
+        print ("Exit")
+
+if __name__ == "__main__":
+    main(sys.argv)
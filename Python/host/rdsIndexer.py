@@ -0,0 +1,350 @@
+# (c) 2024 SA6HBR
+#
+# Index of RDS capture files (host/rdsCapture.py), answers questions about months of captures
+# without decoding them again. The capture files are decoded in a process pool with the same
+# decoder as the Pico and the daemon (imports/rdsDecoder.py), every worker writes its part of
+# the index sorted, and the parts are merged into fixed-size record files:
+#
+#   pi.idx     : PI u16, first f64, last f64, channel u16                 sorted by PI, first
+#                the PI was received on channel from first to last (gaps up to piGap s)
+#   counts.idx : PI u16, interval start f64, channel u16, group code u8, count u32   sorted by PI, start
+#                groups per type in every countInterval s
+#   events.idx : PI u16, time f64, channel u16, kind u8, offset u32, length u16      sorted by PI, time
+#   events.txt : the text of the events, events.idx points into it
+#
+# Events: TA on/off (0A/0B, debounced), programme service name and RadioText once complete and changed,
+# clock-time (4A). Queries memory map the .idx files and binary search them.
+#
+# Run from the Python directory, times are UTC:
+#   python3 -m host.rdsIndexer build /var/lib/rds/index /var/lib/rds [--workers 8]
+#   python3 -m host.rdsIndexer ranges /var/lib/rds/index E224 [2024-06-01 [2024-06-08T12:00]]
+#   python3 -m host.rdsIndexer ta     /var/lib/rds/index E224 [from [to]]   # when E224 carried TA
+#   python3 -m host.rdsIndexer text   /var/lib/rds/index 103.8 [from [to]]  # RadioText on a channel
+#   python3 -m host.rdsIndexer events /var/lib/rds/index E224 [from [to]]
+#   python3 -m host.rdsIndexer counts /var/lib/rds/index E224 [from [to]]
+#
+
+import calendar
+import heapq
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+
+from host.rdsCapture import readCapture, captureFiles
+from imports.rdsDecoder import rdsDecoder, GROUPNAME
+from imports.rdsClock import mjdToDate
+
+PI_RECORD    = "<HddH"
+COUNT_RECORD = "<HdHBI"
+EVENT_RECORD = "<HdHBIH"
+
+TA_ON  = 1
+TA_OFF = 2
+PS     = 3
+RT     = 4
+CT     = 5
+KINDNAME = {TA_ON: "TA on", TA_OFF: "TA off", PS: "PS", RT: "RT", CT: "CT"}
+
+piGap         = 60    # s without the PI before a new range starts
+countInterval = 300   # s per group count
+
+def formatTime(t):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t))
+
+def parseTime(text):
+    # 2024-06-01, 2024-06-01T12:00 or unix seconds, UTC
+    for pattern in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            return calendar.timegm(time.strptime(text, pattern))
+        except ValueError:
+            pass
+    return float(text)
+
+def text(buffer):
+    return "".join(chr(c) if 32 <= c < 127 else " " for c in buffer).rstrip()
+
+class fileIndexer():
+    # Decodes one capture file into the records of its part of the index
+
+    def __init__(self):
+        # Replayed faster than received, no repeat cache that ages in wall-clock time
+        self.rds     = rdsDecoder(cache = 0)
+        self.ranges  = []   # (PI, first, last, channel)
+        self.counts  = {}   # (PI, interval, channel, group code) -> count
+        self.events  = []   # (PI, time, channel, kind, text)
+        self.current = None # [PI, first, last, channel] of the open range
+        self.groups  = 0
+        self.dropped = 0
+        self.station()
+
+    def station(self):
+        # A new station, nothing of it has been seen
+        self.rds.clear()
+        self.lastTA    = 0
+        self.lastPS    = ""
+        self.lastRT    = ""
+        self.lastClock = None
+
+    def closeRange(self):
+        if (self.current is not None): self.ranges.append(tuple(self.current))
+        self.current = None
+
+    def group(self, t, A, B, C, D, BLER, channel):
+        rds = self.rds
+        self.groups += 1
+        if (self.current is not None and channel != self.current[3]): self.station()
+        PI = rds.getPI()
+        if (PI != 0 and A != PI and ((BLER >> 6) & 0b11) != 3): self.station()
+        groupCode = rds.feed(A, B, C, D, BLER)
+        if (groupCode < 0):
+            self.dropped += 1
+            return
+        PI = rds.getPI()
+
+        current = self.current
+        if (current is None or current[0] != PI or current[3] != channel or t - current[2] > piGap):
+            self.closeRange()
+            self.current = current = [PI, t, t, channel]
+        current[2] = t
+        key = (PI, t - t % countInterval, channel, groupCode)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+        # Field values as the group decoders left them, TA debounced by the decoder (0A and 0B)
+        if (groupCode <= 1 and rds.taAnnouncement != self.lastTA):
+            self.lastTA = rds.taAnnouncement
+            self.events.append((PI, t, channel, TA_ON if rds.taAnnouncement else TA_OFF, "TP " + str(rds.TP)))
+        if (groupCode == 0):
+            if (0 not in rds.ProgrammeService):
+                name = text(rds.ProgrammeService)
+                if (name != self.lastPS):
+                    self.lastPS = name
+                    self.events.append((PI, t, channel, PS, name))
+        elif (groupCode == 4 or groupCode == 5):
+            buffer = rds.RadioTextB if rds.RadioTextFlag else rds.RadioTextA
+            end = buffer.find(b"\r")
+            if (end < 0): end = 32 if groupCode == 5 else len(buffer)
+            if (0 not in buffer[:end]):
+                radioText = text(buffer[:end])
+                if (radioText and radioText != self.lastRT):
+                    self.lastRT = radioText
+                    self.events.append((PI, t, channel, RT, radioText))
+        elif (groupCode == 8):
+            clock = rds.clock.lastDecoded()
+            if (clock is not None and clock != self.lastClock):
+                self.lastClock = clock
+                MJD, hour, minute, offset = clock
+                year, month, day, weekday = mjdToDate(MJD)
+                self.events.append((PI, t, channel, CT, "%04d-%02d-%02d %02d:%02d UTC %+.1f h" % (year, month, day, hour, minute, offset / 2)))
+
+    def write(self, prefix):
+        # Sorted part files prefix.pi / .counts / .events / .txt
+        self.closeRange()
+        with open(prefix + ".pi", "wb") as f:
+            for record in sorted(self.ranges, key = lambda r: (r[0], r[1])):
+                f.write(struct.pack(PI_RECORD, *record))
+        with open(prefix + ".counts", "wb") as f:
+            for key in sorted(self.counts, key = lambda k: (k[0], k[1])):
+                f.write(struct.pack(COUNT_RECORD, key[0], key[1], key[2], key[3], self.counts[key]))
+        offset = 0
+        with open(prefix + ".events", "wb") as f, open(prefix + ".txt", "wb") as t:
+            for PI, when, channel, kind, eventText in sorted(self.events, key = lambda e: (e[0], e[1])):
+                data = eventText.encode()[:65535]
+                f.write(struct.pack(EVENT_RECORD, PI, when, channel, kind, offset, len(data)))
+                t.write(data)
+                offset += len(data)
+
+def indexFile(job):
+    # Worker: (capture file, part prefix) -> (part prefix, groups, dropped)
+    path, prefix = job
+    indexer = fileIndexer()
+    name, records = readCapture(path)
+    for record in records: indexer.group(*record)
+    indexer.write(prefix)
+    return (prefix, indexer.groups, indexer.dropped)
+
+def partRecords(path, recordFormat):
+    with open(path, "rb") as f:
+        data = f.read()
+    return struct.iter_unpack(recordFormat, data)
+
+def shiftedEvents(path, base):
+    # Events of one part with the text offset moved to where its text lands in events.txt
+    for PI, when, channel, kind, offset, length in partRecords(path, EVENT_RECORD):
+        yield (PI, when, channel, kind, offset + base, length)
+
+def merge(directory, prefixes):
+    # Merge the sorted parts into the index files
+    with open(os.path.join(directory, "pi.idx"), "wb") as f:
+        for record in heapq.merge(*[partRecords(p + ".pi", PI_RECORD) for p in prefixes], key = lambda r: (r[0], r[1])):
+            f.write(struct.pack(PI_RECORD, *record))
+    with open(os.path.join(directory, "counts.idx"), "wb") as f:
+        for record in heapq.merge(*[partRecords(p + ".counts", COUNT_RECORD) for p in prefixes], key = lambda r: (r[0], r[1])):
+            f.write(struct.pack(COUNT_RECORD, *record))
+    bases = []
+    with open(os.path.join(directory, "events.txt"), "wb") as t:
+        base = 0
+        for p in prefixes:
+            bases.append(base)
+            with open(p + ".txt", "rb") as part:
+                data = part.read()
+            t.write(data)
+            base += len(data)
+    with open(os.path.join(directory, "events.idx"), "wb") as f:
+        for record in heapq.merge(*[shiftedEvents(p + ".events", b) for p, b in zip(prefixes, bases)], key = lambda r: (r[0], r[1])):
+            f.write(struct.pack(EVENT_RECORD, *record))
+
+def build(directory, paths, workers = None):
+    files = captureFiles(paths)
+    partDir = os.path.join(directory, "parts")
+    os.makedirs(partDir, exist_ok = True)
+    jobs = [(path, os.path.join(partDir, str(n))) for n, path in enumerate(files)]
+    start = time.time()
+    groups = dropped = 0
+    prefixes = []
+    with multiprocessing.Pool(workers) as pool:
+        for prefix, fileGroups, fileDropped in pool.imap_unordered(indexFile, jobs):
+            prefixes.append(prefix)
+            groups  += fileGroups
+            dropped += fileDropped
+    prefixes.sort(key = lambda p: int(os.path.basename(p)))
+    merge(directory, prefixes)
+    for prefix in prefixes:
+        for suffix in (".pi", ".counts", ".events", ".txt"): os.remove(prefix + suffix)
+    os.rmdir(partDir)
+    with open(os.path.join(directory, "files.txt"), "w") as f:
+        for path in files: f.write(path + "\n")
+    elapsed = time.time() - start
+    print ("Indexed    : %d files, %d groups (%d dropped) in %.1f s, %.0f groups/s" % (len(files), groups, dropped, elapsed, groups / elapsed if elapsed > 0 else 0))
+
+class recordTable():
+    # A memory mapped .idx file of fixed-size records
+
+    def __init__(self, path, recordFormat):
+        self.record = struct.Struct(recordFormat)
+        self.data   = b""
+        with open(path, "rb") as f:
+            if (os.fstat(f.fileno()).st_size): self.data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        self.count  = len(self.data) // self.record.size
+
+    def __getitem__(self, i):
+        return self.record.unpack_from(self.data, i * self.record.size)
+
+    def lowerBound(self, key):
+        # First record whose first two fields are >= key
+        low, high = 0, self.count
+        while (low < high):
+            middle = (low + high) // 2
+            if (self[middle][:2] < key): low = middle + 1
+            else: high = middle
+        return low
+
+    def scan(self, PI, start = 0):
+        # Records of PI from the one at or after start, in order
+        for i in range(self.lowerBound((PI, start)), self.count):
+            record = self[i]
+            if (record[0] != PI): break
+            yield record
+
+class rdsIndex():
+
+    def __init__(self, directory):
+        self.ranges = recordTable(os.path.join(directory, "pi.idx"), PI_RECORD)
+        self.counts = recordTable(os.path.join(directory, "counts.idx"), COUNT_RECORD)
+        self.events = recordTable(os.path.join(directory, "events.idx"), EVENT_RECORD)
+        with open(os.path.join(directory, "events.txt"), "rb") as f:
+            self.text = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+
+    def piRanges(self, PI, start = 0, end = float("inf")):
+        # (channel, first, last) of PI overlapping start..end. Ranges are sorted by first, an
+        # earlier one may still reach into the window, so the scan starts at the PI.
+        return [(channel, first, last) for PI, first, last, channel in self.ranges.scan(PI) if last >= start and first <= end]
+
+    def eventList(self, PI, start = 0, end = float("inf"), kinds = None, channel = None):
+        # (time, channel, kind, text) of PI from start to end
+        result = []
+        for record in self.events.scan(PI, start):
+            PI, when, eventChannel, kind, offset, length = record
+            if (when > end): break
+            if (kinds is not None and kind not in kinds): continue
+            if (channel is not None and eventChannel != channel): continue
+            result.append((when, eventChannel, kind, bytes(self.text[offset:offset + length]).decode("utf-8", "replace")))
+        return result
+
+    def channelPIs(self, channel, start = 0, end = float("inf")):
+        # PIs heard on channel in the window, the PI table is small enough to scan
+        PIs = set()
+        for i in range(self.ranges.count):
+            PI, first, last, rangeChannel = self.ranges[i]
+            if (rangeChannel == channel and last >= start and first <= end): PIs.add(PI)
+        return sorted(PIs)
+
+    def channelText(self, channel, start = 0, end = float("inf")):
+        # RadioText on channel, of every PI heard there, by time
+        texts = []
+        for PI in self.channelPIs(channel, start, end):
+            texts += [(when, PI, radioText) for when, eventChannel, kind, radioText in self.eventList(PI, start, end, (RT,), channel)]
+        return sorted(texts)
+
+    def taPeriods(self, PI, start = 0, end = float("inf")):
+        # (on, off) times of TA, off is None while still on at the end of the captures
+        periods = []
+        on = None
+        for when, channel, kind, eventText in self.eventList(PI, start, end, (TA_ON, TA_OFF)):
+            if (kind == TA_ON and on is None): on = when
+            elif (kind == TA_OFF and on is not None):
+                periods.append((on, when))
+                on = None
+        if (on is not None): periods.append((on, None))
+        return periods
+
+    def groupCounts(self, PI, start = 0, end = float("inf")):
+        # Groups per group code of PI, intervals starting in the window
+        totals = [0] * 32
+        for PI, interval, channel, groupCode, count in self.counts.scan(PI, start - start % countInterval):
+            if (interval > end): break
+            totals[groupCode] += count
+        return totals
+
+def main(argv):
+    args = argv[1:]
+    if (len(args) >= 3 and args[0] == "build"):
+        workers = None
+        if ("--workers" in args):
+            i = args.index("--workers")
+            workers = int(args[i + 1])
+            args = args[:i] + args[i + 2:]
+        os.makedirs(args[1], exist_ok = True)
+        build(args[1], args[2:], workers)
+        return
+    if (len(args) < 3 or args[0] not in ("ranges", "ta", "text", "events", "counts")):
+        print ("Usage: python3 -m host.rdsIndexer build INDEX CAPTURE... [--workers N]")
+        print ("       python3 -m host.rdsIndexer ranges|ta|events|counts INDEX PI [FROM [TO]]")
+        print ("       python3 -m host.rdsIndexer text INDEX MHz [FROM [TO]]")
+        return
+    command = args[0]
+    index = rdsIndex(args[1])
+    start = parseTime(args[3]) if len(args) > 3 else 0
+    end   = parseTime(args[4]) if len(args) > 4 else float("inf")
+    if (command == "text"):
+        for when, PI, radioText in index.channelText(int(round(float(args[2]) * 10)), start, end):
+            print ("%s %04X %s" % (formatTime(when), PI, radioText))
+        return
+    PI = int(args[2], 16)
+    if (command == "ranges"):
+        for channel, first, last in index.piRanges(PI, start, end):
+            print ("%s - %s %5.1f MHz" % (formatTime(first), formatTime(last), channel / 10))
+    elif (command == "ta"):
+        for on, off in index.taPeriods(PI, start, end):
+            print ("%s - %s" % (formatTime(on), formatTime(off) if off is not None else "still on"))
+    elif (command == "events"):
+        for when, channel, kind, eventText in index.eventList(PI, start, end):
+            print ("%s %5.1f MHz %-6s %s" % (formatTime(when), channel / 10, KINDNAME.get(kind, str(kind)), eventText))
+    elif (command == "counts"):
+        totals = index.groupCounts(PI, start, end)
+        print (", ".join([GROUPNAME[code] + ": " + str(totals[code]) for code in range(32) if totals[code]]))
+
+if __name__ == "__main__":
+    main(sys.argv)
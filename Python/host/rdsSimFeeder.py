@@ -0,0 +1,73 @@
+# (c) 2024 SA6HBR
+#
+# Simulated receivers for host/rdsDaemon.py
+# Opens n pseudo terminals and writes the same frames as streamRDS.py into each, with groups
+# from the simulated stations in imports/si4703Sim.py. Receiver i listens to station i % stations.
+#
+#   python3 -m host.rdsSimFeeder 8            # prints: /dev/pts/5 /dev/pts/6 ...
+#   python3 -m host.rdsDaemon /dev/pts/5 /dev/pts/6 ...
+#
+# speed > 1 sends groups faster than 11.4/s, to load test the daemon.
+#
+
+import os
+import sys
+import time
+import tty
+
+from imports.rdsFrame import frameWriter
+from imports.si4703Sim import defaultStations
+
+groupPeriod = 0.0876 # s
+
+class ptyStream():
+    # write() for frameWriter, frames are lost when nobody reads the pty, as on a real USB-CDC port
+
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.name    = os.ttyname(self.slave)
+        self.lost    = 0
+
+    def write(self, buf):
+        try:
+            os.write(self.master, buf)
+        except BlockingIOError:
+            self.lost += 1
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 4
+    speed = float(argv[2]) if len(argv) > 2 else 1
+    stations = defaultStations()
+    feeds = []
+    for i in range(count):
+        stream  = ptyStream()
+        station = stations[i % len(stations)]
+        writer  = frameWriter(stream)
+        feeds.append((stream, writer, station))
+    print (" ".join(stream.name for stream, writer, station in feeds))
+    sys.stdout.flush()
+
+    period    = groupPeriod / speed
+    nextGroup = time.monotonic()
+    n = 0
+    try:
+        while True:
+            ticks = int(time.monotonic() * 1000)
+            for stream, writer, station in feeds:
+                A, B, C, D = station.nextGroup()
+                writer.group(ticks, A, B, C, D, 0, station.channel)
+                if (n % 12 == 0):
+                    writer.status(ticks, 0b0000100100000000 | station.RSSI, station.channel)
+                if (n % 120 == 0):
+                    writer.hello("sim-" + stream.name.split("/")[-1])
+            n += 1
+            nextGroup += period
+            wait = nextGroup - time.monotonic()
+            if (wait > 0): time.sleep(wait)
+    except KeyboardInterrupt:
+        print ("Lost frames: " + str(sum(stream.lost for stream, writer, station in feeds)))
+
+if __name__ == "__main__":
+    main(sys.argv)
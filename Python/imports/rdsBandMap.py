@@ -0,0 +1,99 @@
+# (c) 2024 SA6HBR
+#
+# Band map for smart seek, what is known about every channel 87.5 - 108.0 MHz
+# Per channel: last RSSI, whether it is a station (seek stopped there or a tune verified it),
+# whether RDS was received and when it was learned (ticks_ms). A hardware seek also proves the
+# channels it swept over are empty.
+#
+# next() walks from the tuned channel: a known station is returned, known empty or weak
+# channels are skipped, and an unknown or older than maxAge channel on the way makes the map
+# stale (None), then the caller seeks in hardware, which fills in that stretch of the band.
+#
+# Usage:
+#   result = radio.smartSeek(radio.HIGH)   # radio.bandMap is kept up to date by the driver
+#   radio.bandMap.printMap()
+#
+
+from array import array
+from imports.rdsTime import ticks_ms, ticks_diff
+
+FIRSTCHANNEL = 875
+LASTCHANNEL  = 1080
+CHANNELS     = LASTCHANNEL - FIRSTCHANNEL + 1
+
+KNOWN_Mask   = 0b00000001
+STATION_Mask = 0b00000010
+RDS_Mask     = 0b00000100
+
+class bandMap():
+
+    maxAge  = 600000 # ms an entry is trusted
+    minRSSI = 20     # a station weaker than this is skipped
+
+    def __init__(self):
+        self.RSSI  = bytearray(CHANNELS)
+        self.flags = bytearray(CHANNELS)
+        self.time  = array('L', [0] * CHANNELS)
+        self.hits  = 0   # next() found a station
+        self.stale = 0   # next() had to give up
+
+    def clear(self):
+        for i in range(CHANNELS): self.flags[i] = 0
+
+    def record(self, channel, RSSI, station):
+        i = channel - FIRSTCHANNEL
+        if (i < 0 or i >= CHANNELS): return
+        self.RSSI[i]  = min(RSSI, 255)
+        self.flags[i] = (self.flags[i] & RDS_Mask if station else 0) | KNOWN_Mask | (STATION_Mask if station else 0)
+        self.time[i]  = ticks_ms()
+
+    def recordRDS(self, channel):
+        i = channel - FIRSTCHANNEL
+        if (0 <= i < CHANNELS and self.flags[i] & STATION_Mask): self.flags[i] |= RDS_Mask
+
+    def sweep(self, start, end, up):
+        # A seek went from start to end without stopping, the channels between are empty. end is
+        # not included. start == end is a sweep over the whole band.
+        now = ticks_ms()
+        step = 1 if up else -1
+        i = start - FIRSTCHANNEL
+        for n in range(CHANNELS):
+            i = (i + step) % CHANNELS
+            if (i == end - FIRSTCHANNEL): break
+            self.flags[i] = KNOWN_Mask
+            self.RSSI[i]  = 0
+            self.time[i]  = now
+
+    def fresh(self, i, now):
+        return self.flags[i] & KNOWN_Mask and ticks_diff(now, self.time[i]) < self.maxAge
+
+    def next(self, channel, up, wrap = 1):
+        # Next station from channel: a channel, 0 when the map shows none up to the band limit (or
+        # in the whole band when wrapping), None when the map is stale on the way
+        now  = ticks_ms()
+        step = 1 if up else -1
+        i = channel - FIRSTCHANNEL
+        for n in range(CHANNELS - 1):
+            i += step
+            if (i < 0 or i >= CHANNELS):
+                if (not wrap): return 0
+                i %= CHANNELS
+            if (not self.fresh(i, now)):
+                self.stale += 1
+                return None
+            if (self.flags[i] & STATION_Mask and self.RSSI[i] >= self.minRSSI):
+                self.hits += 1
+                return i + FIRSTCHANNEL
+        return 0
+
+    def stations(self):
+        # (channel, RSSI, RDS) of the known stations, fresh or not
+        return [(i + FIRSTCHANNEL, self.RSSI[i], 1 if self.flags[i] & RDS_Mask else 0) for i in range(CHANNELS) if self.flags[i] & STATION_Mask]
+
+    def printMap(self):
+        now = ticks_ms()
+        known = len([i for i in range(CHANNELS) if self.fresh(i, now)])
+        print ("Band map   : " + str(known) + " of " + str(CHANNELS) + " channels fresh, next station from map: " + str(self.hits) + ", stale: " + str(self.stale))
+        for channel, RSSI, RDS in self.stations():
+            age = ticks_diff(now, self.time[channel - FIRSTCHANNEL]) // 1000
+            print (("  " + str(channel / 10))[-5:] + " MHz - RSSI: " + str(RSSI) + (" RDS" if RDS else "") + ", " + str(age) + " s ago")
@@ -0,0 +1,137 @@
+# (c) 2024 SA6HBR
+#
+# Clock-time and date (group 4A) with integer math
+# EN50067_RDS_Standard.pdf 3.1.5.6 Type 4A groups : Clock-time and date
+#
+# The MJD -> date conversion in Annex G uses floating point (15078.2, 365.25, 30.6001).
+# Here the same result is computed with integers only, counting days in 400-year eras.
+#
+# Without machine.RTC (CPython) the time is decoded and checked but no clock is set.
+#
+
+import time
+from imports.rdsTime import ticks_ms, ticks_diff
+
+def mjdToDate(MJD):
+    # Modified Julian Day -> (year, month, day, weekday). Weekday 0 = Monday, as RTC.datetime()
+    days = MJD - 40587 + 719468   # days since 0000-03-01
+    era  = days // 146097
+    doe  = days - era * 146097                                   # day of era     [0, 146096]
+    yoe  = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365 # year of era  [0, 399]
+    doy  = doe - (365 * yoe + yoe // 4 - yoe // 100)             # day of year    [0, 365]
+    mp   = (5 * doy + 2) // 153                                  # month from March [0, 11]
+    day   = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year  = yoe + era * 400 + (1 if month <= 2 else 0)
+    return (year, month, day, (MJD + 2) % 7)
+
+def dateToMJD(year, month, day):
+    # Inverse of mjdToDate
+    if (month <= 2): year -= 1
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month - 3 if month > 2 else month + 9) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468 + 40587
+
+class clockSync():
+
+    driftThreshold = 2     # s, RTC is only written when it is off by more than this
+    tolerance      = 10000 # ms, allowed difference between RDS time and local ticks for two groups
+
+    def __init__(self, rtc = None):
+        if (rtc is None):
+            try:
+                from machine import RTC
+                rtc = RTC()
+            except ImportError:
+                rtc = None
+        self.rtc = rtc
+
+        # Last decoded 4A, not trusted until the next one agrees with it
+        self.lastMinutes = -1
+        self.lastOffset  = 0
+        self.lastTicks   = 0
+
+        # Trusted time
+        self.MJD         = 0
+        self.UtcHour     = 0
+        self.UtcMinute   = 0
+        self.LocalOffset = 0  # half hours, signed
+
+        # Statistics
+        self.groupCount  = 0
+        self.rejectCount = 0
+        self.syncCount   = 0
+        self.writeCount  = 0
+        self.syncTicks   = 0
+        self.lastDrift   = 0
+        self.maxDrift    = 0
+        self.driftSum    = 0
+
+    def feed(self, MJD, UtcHour, UtcMinute, LocalOffset):
+        # Returns 1 when the group was trusted
+        self.groupCount += 1
+        now = ticks_ms()
+        if (UtcHour > 23 or UtcMinute > 59 or LocalOffset > 24 or LocalOffset < -24):
+            self.rejectCount += 1
+            return 0
+
+        minutes = MJD * 1440 + UtcHour * 60 + UtcMinute
+        lastMinutes = self.lastMinutes
+        lastTicks   = self.lastTicks
+        self.lastMinutes = minutes
+        self.lastOffset  = LocalOffset
+        self.lastTicks   = now
+
+        # Two consecutive 4A groups must be as far apart in RDS time as in local time
+        if (lastMinutes < 0 or minutes < lastMinutes): return 0
+        if (abs((minutes - lastMinutes) * 60000 - ticks_diff(now, lastTicks)) > self.tolerance):
+            self.rejectCount += 1
+            return 0
+
+        self.MJD         = MJD
+        self.UtcHour     = UtcHour
+        self.UtcMinute   = UtcMinute
+        self.LocalOffset = LocalOffset
+        self.syncCount  += 1
+        self.syncTicks   = now
+        self.checkDrift(MJD, UtcHour, UtcMinute)
+        return 1
+
+    def checkDrift(self, MJD, UtcHour, UtcMinute):
+        # 4A is sent at the start of the minute, seconds are 0
+        if (self.rtc is None): return
+        year, month, day, weekday, hour, minute, second, subsecond = self.rtc.datetime()
+        rtcSeconds = dateToMJD(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+        drift = rtcSeconds - (MJD * 86400 + UtcHour * 3600 + UtcMinute * 60)
+
+        self.lastDrift = drift
+        self.driftSum += drift
+        if (abs(drift) > abs(self.maxDrift)): self.maxDrift = drift
+
+        if (abs(drift) > self.driftThreshold):
+            year, month, day, weekday = mjdToDate(MJD)
+            # (year, month, mday, week_day, hours, minutes, seconds, sub-seconds)
+            self.rtc.datetime((year, month, day, weekday, UtcHour, UtcMinute, 0, 0))
+            self.writeCount += 1
+
+    def lastSyncAge(self):
+        # ms since last trusted 4A, -1 if never synced
+        if (self.syncCount == 0): return -1
+        return ticks_diff(ticks_ms(), self.syncTicks)
+
+    def lastDecoded(self):
+        # (MJD, UtcHour, UtcMinute, LocalOffset) of the last valid 4A, trusted or not. None before the first.
+        if (self.lastMinutes < 0): return None
+        return (self.lastMinutes // 1440, (self.lastMinutes // 60) % 24, self.lastMinutes % 60, self.lastOffset)
+
+    def getStats(self):
+        # (syncs, RTC writes, rejected, last drift s, max drift s, mean drift s)
+        meanDrift = 0
+        if (self.syncCount > 0): meanDrift = self.driftSum // self.syncCount
+        return (self.syncCount, self.writeCount, self.rejectCount, self.lastDrift, self.maxDrift, meanDrift)
+
+    def localTime(self):
+        # RTC time + local time offset, as time.gmtime()
+        return time.gmtime(time.time() + self.LocalOffset * 1800)
@@ -0,0 +1,384 @@
+# (c) 2024 SA6HBR
+#
+# RDS decoder core, without any hardware
+# Owns all decoded RDS state. A transport only hands it the four blocks of each group:
+#   rds = rdsDecoder()
+#   rds.feed(A, B, C, D, BLER)
+# rdsRadio feeds it from the Si4703 registers (radio.rds). The same decoder serves the host
+# daemon, capture replay and offline decoding, and other tuner chips. It runs unchanged
+# under MicroPython and CPython.
+#
+# The group type decoders are in imports/rdsGroup*.py and are imported at the first group of
+# their type (GROUP_MODULES), so a receiver that only sees a few group types never loads the
+# others. printModules() shows what was loaded, and what it cost in time and heap.
+#
+# EN50067_RDS_Standard.pdf
+#
+
+import gc
+import sys
+from array import array
+from imports.rdsTime import ticks_ms, ticks_us, ticks_diff
+from imports.rdsClock import clockSync
+
+try:
+    mem_alloc = gc.mem_alloc
+except AttributeError:
+    mem_alloc = lambda: 0 # CPython
+
+# Group type names indexed by the top 5 bits of block B (type and version), no string building per group
+GROUPNAME = (
+    "0A", "0B", "1A", "1B", "2A", "2B", "3A", "3B", "4A", "4B", "5A", "5B", "6A", "6B", "7A", "7B",
+    "8A", "8B", "9A", "9B", "10A", "10B", "11A", "11B", "12A", "12B", "13A", "13B", "14A", "14B", "15A", "15B",
+)
+
+# Group code -> "module.function" decoding it, imported at the first group of that type
+GROUP_MODULES = {
+    0:  "imports.rdsGroup0.group0A",
+    2:  "imports.rdsGroup1.group1A",
+    3:  "imports.rdsGroup1.group1B",
+    4:  "imports.rdsGroup2.group2A",
+    5:  "imports.rdsGroup2.group2B",
+    6:  "imports.rdsGroup3.group3A",
+    8:  "imports.rdsGroup4.group4A",
+    14: "imports.rdsGroup7.group7A",
+    16: "imports.rdsOda.odaGroup",
+    20: "imports.rdsGroup10.group10A",
+    28: "imports.rdsGroup14.group14A",
+    29: "imports.rdsGroup14.group14B",
+}
+
+# Modules whose print setPrint() replaces: the driver and the decoders
+PRINT_MODULES = ("imports.si4703", "imports.rdsDecoder", "imports.rdsGroup", "imports.rdsOda", "imports.rdsTmc")
+
+def setPrint(function):
+    # Replace print in every loaded module of PRINT_MODULES (profiler, quiet soak), None puts the
+    # builtin back. A module imported later by importName() gets the replacement too.
+    for name in list(sys.modules):
+        for prefix in PRINT_MODULES:
+            if (name.startswith(prefix)):
+                module = sys.modules[name]
+                if (function is not None): module.print = function
+                elif ("print" in module.__dict__): del module.print
+                break
+
+def importName(name):
+    # "module.attribute" -> the attribute, importing the module
+    moduleName, attribute = name.rsplit(".", 1)
+    module = __import__(moduleName, None, None, [attribute])
+    if ("print" in globals()): module.print = globals()["print"]
+    return getattr(module, attribute)
+
+def rdsText(buffer):
+    # Printable string from an RDS character buffer, other characters as space
+    return "".join([chr(x) if 32 <= x < 126 else " " for x in buffer])
+
+def clearBuffer(buffer):
+    for i in range(len(buffer)):
+        buffer[i] = 0
+
+class rdsDecoder():
+
+    # Instance state only, constants are class attributes
+    __slots__ = (
+        "blocks", "clock", "oda", "groupDecoders", "groupsDropped", "loads", "loadHook",
+        "TP", "PTY", "PiCountry", "PiType", "PiReferens", "ECC", "TA",
+        "taAnnouncement", "taCount", "taChangeTime",
+        "ProgrammeService", "RadioTextFlag", "RadioTextA", "RadioTextB",
+        "RadioPagingFlag", "RadioPagingA", "RadioPagingB",
+        "ProgrammeTypeNameFlag", "ProgrammeTypeNameTextA", "ProgrammeTypeNameTextB",
+        "groupCacheOn", "cacheB", "cacheC", "cacheD", "cacheTime", "cacheUsed",
+        "groupHits", "groupMisses", "groupTypeCount",
+        "AltFreqList", "AltFreqCount", "AltFreqExpected", "OtherNetworks",
+    )
+
+    # Index in blocks
+    RDSA             = 0
+    RDSB             = 1
+    RDSC             = 2
+    RDSD             = 3
+    RBDS             = 0    # 1 = use North American PTY names
+    groupCacheSize   = 64   # recent groups remembered, power of 2
+    groupCacheMaxAge = 30000 # ms, an older repeat is decoded again
+    # Segment/address bits in block B per group code, one cache slot holds the last group of each
+    # segment: 0A/0B PS, 2A/2B RT, 3A application group, 10A PTYN, 14A variant. 14A/14B add PI(ON).
+    CACHE_ADDRESS    = bytes((3, 3, 0, 0, 15, 15, 31, 0, 0, 0, 0, 0, 0, 0, 15, 0,
+                              0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 15, 0, 0, 0))
+    taDebounce       = 2    # 0A/0B groups in a row before taAnnouncement changes
+    FIRSTCHANNEL     = 875
+
+    def __init__(self, clock = None, cache = 1):
+        # 4A clock-time, owns the RTC when there is one
+        self.clock = clock if clock is not None else clockSync()
+
+        # The group being decoded and the RDS text buffers, allocated once
+        self.blocks                 = array('H', [0] * 4)
+        self.ProgrammeService       = bytearray(8)
+        self.AltFreqList            = bytearray(25) # AF codes, channel = code + FIRSTCHANNEL
+        self.RadioTextA             = bytearray(64)
+        self.RadioTextB             = bytearray(64)
+        self.RadioPagingA           = bytearray(64)
+        self.RadioPagingB           = bytearray(64)
+        self.ProgrammeTypeNameTextA = bytearray(8)
+        self.ProgrammeTypeNameTextB = bytearray(8)
+        self.groupsDropped          = 0
+
+        # Recent-group cache, direct mapped on group code and segment, holds the last B, C and D.
+        # It ages with ticks_ms, cache = 0 for groups that are not fed as they are received (capture replay).
+        self.groupCacheOn           = cache
+        self.cacheB                 = array('H', [0] * self.groupCacheSize)
+        self.cacheC                 = array('H', [0] * self.groupCacheSize)
+        self.cacheD                 = array('H', [0] * self.groupCacheSize)
+        self.cacheTime              = array('L', [0] * self.groupCacheSize)
+        self.cacheUsed              = bytearray(self.groupCacheSize)
+        self.groupTypeCount         = array('L', [0] * 32)
+        self.groupHits              = 0
+        self.groupMisses            = 0
+
+        # Decoder function(rds, silent) per group code (B >> 11), None = not loaded yet or not decoded.
+        # Open data applications announced in 3A take over the entry of the group type they use,
+        # see imports/rdsOda.py. The registry is made at the first 3A or ODA group.
+        self.oda           = None
+        self.groupDecoders = [None] * 32
+        self.loads         = []    # (group code, module.function, us, heap bytes) per decoder loaded
+        self.loadHook      = None  # function(group code, decoder) -> decoder to use, see imports/rdsProfile.py
+        self.clear()
+
+    def clear(self):
+        # New station, every group has to be decoded again and the open data applications are unknown
+        self.flushGroupCache()
+        if (self.oda is not None): self.oda.clear()
+
+        # RDS Basic information
+        self.TP               = 0
+        self.PTY              = 0
+        self.PiCountry        = 0
+        self.PiType           = 0
+        self.PiReferens       = 0
+        self.ECC              = 0 # Extended Country Code from 1A variant 0
+        
+        # RDS Type 0 groups: Basic tuning and switching information
+        self.TA               = 0
+        self.taAnnouncement   = 0 # TP and TA debounced, see trafficGroup
+        self.taCount          = 0
+        self.taChangeTime     = 0
+        clearBuffer(self.ProgrammeService)
+        self.AltFreqCount     = 0
+        self.AltFreqExpected  = -1 # -1 = no AF count code seen yet
+        
+        # RDS Type 2 groups: RadioText
+        self.RadioTextFlag    = 0
+        clearBuffer(self.RadioTextA)
+        clearBuffer(self.RadioTextB)
+        
+        # RDS Type 7 groups: RadioPaging
+        self.RadioPagingFlag  = 0
+        clearBuffer(self.RadioPagingA)
+        clearBuffer(self.RadioPagingB)
+        
+        # RDS Type 10 groups: Programme Type Name
+        self.ProgrammeTypeNameFlag  = 0
+        clearBuffer(self.ProgrammeTypeNameTextA)
+        clearBuffer(self.ProgrammeTypeNameTextB)
+
+        # RDS Type 14 groups: Enhanced Other Networks
+        self.OtherNetworks = {}
+
+    def restore(self, PI, PTY, ECC, PS, AF):
+        # Known station from a database, until live groups say otherwise. AF as channels.
+        self.PiCountry  = PI >> 12
+        self.PiType     = (PI >> 8) & 0b1111
+        self.PiReferens = PI & 0b11111111
+        self.PTY        = PTY
+        self.ECC        = ECC
+        self.ProgrammeService[0:len(PS)] = PS
+        for code in [ch - self.FIRSTCHANNEL for ch in AF]:
+            self.AltFreqList[self.AltFreqCount] = code
+            self.AltFreqCount += 1
+        self.AltFreqExpected = self.AltFreqCount
+
+    def getAltFreqs(self):
+        # AF list of the tuned station as channels, e.g. [1038, 1029]
+        return [code + self.FIRSTCHANNEL for code in self.AltFreqList[:self.AltFreqCount]]
+
+    def altFreqComplete(self):
+        return self.AltFreqExpected >= 0 and self.AltFreqCount >= self.AltFreqExpected
+
+    def getOda(self):
+        # Open data application registry, made when first needed
+        if (self.oda is None):
+            from imports.rdsOda import odaRegistry
+            self.oda = odaRegistry(self)
+        return self.oda
+
+    def loadDecoder(self, groupCode):
+        # Import the decoder of groupCode, None when the group type is not decoded
+        name = GROUP_MODULES.get(groupCode)
+        if (name is None): return None
+        alloc = mem_alloc()
+        start = ticks_us()
+        decoder = importName(name)
+        self.loads.append((groupCode, name, ticks_diff(ticks_us(), start), mem_alloc() - alloc))
+        if (self.loadHook is not None): decoder = self.loadHook(groupCode, decoder)
+        self.groupDecoders[groupCode] = decoder
+        return decoder
+
+    def printModules(self):
+        # Decoders loaded so far, in load order. A module shared by two group types is only
+        # imported by the first, the second costs a lookup.
+        print ("Decoders   : " + str(len(self.loads)) + " of " + str(len(GROUP_MODULES)) + " loaded")
+        for groupCode, name, us, alloc in self.loads:
+            print ("  " + (GROUPNAME[groupCode] + "    ")[:4] + (name + " " * 32)[:32] + ("        " + str(us))[-8:] + " us" +
+                   ("        " + str(alloc))[-8:] + " bytes")
+        print ("Not loaded : " + ", ".join([GROUPNAME[code] for code in sorted(GROUP_MODULES) if self.groupDecoders[code] is None]))
+
+    def getRdsPTY(self):
+        from imports.rdsTables import ptyName
+        return ptyName(self.PTY, self.RBDS)
+        
+    def getPI(self):
+        return (self.PiCountry << 12) | (self.PiType << 8) | self.PiReferens
+
+    def getRdsPi(self):
+        #EN50067_RDS_Standard.pdf Annex D
+        # (country, area, station name)
+        from imports.rdsTables import piArea, countryName, stationName
+        PI   = self.getPI()
+        name = stationName(PI, self.ECC)
+        if (name is None): name = hex(self.PiReferens)[2:]
+        return (countryName(PI, self.ECC), piArea(PI), name)
+
+    def feed(self, A, B, C, D, BLER=0, debug=0, FindNew=0, FilterGroup="", silent=1):
+        # Decode one group. BLER = BLERA<<6 | BLERB<<4 | BLERC<<2 | BLERD, as the Si4703 reports them.
+        # Returns the group code, or -1 when the group was dropped.
+
+        GroupType_Mask     = 0b1111000000000000
+        GroupFormat_Mask   = 0b0000100000000000
+        GroupFormat_Offset = 11
+        TP_Mask            = 0b0000010000000000
+        TP_Offset          = 10
+        PTY_Mask           = 0b0000001111100000
+        PTY_Offset         = 5
+        
+        PI_Country_Mask    = 0b1111000000000000
+        PI_Country_Offset  = 12
+        PI_Type_Mask       = 0b0000111100000000
+        PI_Type_Offset     = 8
+        PI_Referens_Mask   = 0b0000000011111111
+
+        # 3 = more than 5 errors, uncorrectable. A bad block A only makes the PI unknown for this group.
+        if (((BLER >> 4) & 0b11) == 3 or ((BLER >> 2) & 0b11) == 3 or (BLER & 0b11) == 3):
+            self.groupsDropped += 1
+            return -1
+        blocks = self.blocks
+        if (((BLER >> 6) & 0b11) == 3): A = self.getPI()
+        blocks[self.RDSA] = A
+        blocks[self.RDSB] = B
+        blocks[self.RDSC] = C
+        blocks[self.RDSD] = D
+
+        groupCode  = (self.blocks[self.RDSB] & (GroupType_Mask | GroupFormat_Mask)) >> GroupFormat_Offset
+        groupType  = GROUPNAME[groupCode]
+        self.TP         = (self.blocks[self.RDSB] & TP_Mask) >> TP_Offset
+        self.PTY        = (self.blocks[self.RDSB] & PTY_Mask) >> PTY_Offset
+        self.PiCountry  = (self.blocks[self.RDSA] & PI_Country_Mask) >> PI_Country_Offset
+        self.PiType     = (self.blocks[self.RDSA] & PI_Type_Mask) >> PI_Type_Offset
+        self.PiReferens = (self.blocks[self.RDSA] & PI_Referens_Mask)
+        self.groupTypeCount[groupCode] += 1
+        if (groupCode <= 1): self.trafficGroup(B)
+
+        # A repeat of a recent group changes nothing, skip the decode unless it is to be printed.
+        # Not for open data: TMC (8A) counts the repeats of a message and keeps it alive with them.
+        if (self.groupCacheOn and groupCode != 16 and (self.oda is None or self.oda.groupApp[groupCode] is None)):
+            repeat = self.groupSeen(groupCode, self.blocks[self.RDSB], self.blocks[self.RDSC], self.blocks[self.RDSD])
+            if (repeat and debug == 0 and FindNew == 0 and (silent == 1 or FilterGroup not in ("", groupType))): return groupCode
+        else:
+            self.groupMisses += 1
+
+        if (debug==1):
+            print ("GroupType  : " + groupType)
+            PiCountry, PiType, PiReferens = self.getRdsPi()
+            print ("TP         : " + hex(self.TP)[2:])
+            print ("PTY        : " + self.getRdsPTY())
+            print ("PI Country : " + PiCountry)
+            print ("PI Type    : " + PiType)
+            print ("PI Referens: " + PiReferens)
+
+        decoder = self.groupDecoders[groupCode]
+        if (decoder is None): decoder = self.loadDecoder(groupCode)
+        if (FindNew == 0 or FilterGroup != ""):
+            if (decoder is not None and FilterGroup in ("", groupType)): decoder(self, silent)
+            elif (silent == 0 and FilterGroup in ("", groupType)):
+                print ("GroupType  : " + groupType)
+                print ("RDSA Bin : " + str(bin(self.blocks[self.RDSA])))
+                print ("RDSB Bin : " + str(bin(self.blocks[self.RDSB])))
+                print ("RDSC Bin : " + str(bin(self.blocks[self.RDSC])))
+                print ("RDSD Bin : " + str(bin(self.blocks[self.RDSD])))
+
+        if (FindNew == 1 and decoder is None):
+            print ("GroupType  : " + groupType)
+            print ("RDSA Bin : " + str(bin(self.blocks[self.RDSA])))
+            print ("RDSB Bin : " + str(bin(self.blocks[self.RDSB])))
+            print ("RDSC Bin : " + str(bin(self.blocks[self.RDSC])))
+            print ("RDSD Bin : " + str(bin(self.blocks[self.RDSD])))
+
+        # Keep the state of the other group types up to date, the filtered one is already decoded
+        if (decoder is not None and FilterGroup != "" and FilterGroup != groupType): decoder(self, 1)
+        return groupCode
+
+    def trafficGroup(self, B):
+        # Traffic announcement on the tuned programme: TP = 1 and TA = 1 in taDebounce 0A/0B groups
+        # in a row turns taAnnouncement on, as many without turn it off. Counted before the repeat
+        # cache, a repeated group is one more in the row. taChangeTime is the first group of the change.
+        TA = (B >> 10) & (B >> 4) & 0b1
+        if (TA == self.taAnnouncement):
+            self.taCount = 0
+            return
+        if (self.taCount == 0): self.taChangeTime = ticks_ms()
+        self.taCount += 1
+        if (self.taCount >= self.taDebounce):
+            self.taAnnouncement = TA
+            self.taCount        = 0
+
+    def groupSeen(self, groupCode, B, C, D):
+        # Look up and remember a group, returns 1 when it is the same as the last group of its type
+        # and segment. A segment that changed and changed back (dynamic PS) is decoded every time.
+        key = groupCode * 41 + (B & self.CACHE_ADDRESS[groupCode])
+        if (groupCode >= 28): key += D ^ (D >> 5)
+        i   = key & (self.groupCacheSize - 1)
+        now = ticks_ms()
+        if (self.cacheUsed[i] and self.cacheB[i] == B and self.cacheC[i] == C and self.cacheD[i] == D
+                and ticks_diff(now, self.cacheTime[i]) < self.groupCacheMaxAge):
+            self.cacheTime[i] = now
+            self.groupHits += 1
+            return 1
+        self.cacheB[i]    = B
+        self.cacheC[i]    = C
+        self.cacheD[i]    = D
+        self.cacheTime[i] = now
+        self.cacheUsed[i] = 1
+        self.groupMisses += 1
+        return 0
+
+    def flushGroupCache(self):
+        # Forget all recent groups, after a channel change or when decoded state was thrown away
+        clearBuffer(self.cacheUsed)
+
+    def groupStats(self):
+        # (hits, misses, hit rate %, count per group code)
+        total = self.groupHits + self.groupMisses
+        return (self.groupHits, self.groupMisses, self.groupHits * 100 // total if total else 0, self.groupTypeCount)
+
+    def printGroupStats(self):
+        hits, misses, rate, counts = self.groupStats()
+        print ("Groups     : " + str(hits + misses) + ", repeats skipped: " + str(hits) + " (" + str(rate) + " %), decoded: " + str(misses))
+        print (", ".join([GROUPNAME[code] + ": " + str(counts[code]) for code in range(32) if counts[code]]))
+
+    def otherNetwork(self, PI):
+        # [PS, channel, TA, TP, PTY] of an other network
+        other = self.OtherNetworks.get(PI)
+        if (other is None):
+            other = [bytearray(8), 0, 0, 0, 0]
+            self.OtherNetworks[PI] = other
+        return other
+
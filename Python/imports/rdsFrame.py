@@ -0,0 +1,117 @@
+# (c) 2024 SA6HBR
+#
+# Binary framing of raw RDS groups and status samples for the USB-CDC serial link.
+# The same module is used on the Pico (frameWriter) and on the Linux host (frameReader).
+#
+# Frame:
+#   0xA5  type  seq  len  payload[len]  check
+#   check = (type + seq + len + sum(payload)) & 0xFF
+#   seq counts every frame 0..255, a gap on the host side is counted as dropped frames
+#
+# Payload, little endian:
+#   GROUP  : ticks_ms u32, A u16, B u16, C u16, D u16, BLER u8, channel u16
+#            BLER = BLERA<<6 | BLERB<<4 | BLERC<<2 | BLERD
+#   STATUS : ticks_ms u32, STATUSRSSI u16, channel u16
+#   HELLO  : receiver name, ascii
+#
+
+import struct
+
+SYNC   = 0xA5
+GROUP  = 0x01
+STATUS = 0x02
+HELLO  = 0x03
+
+GROUP_FORMAT  = "<IHHHHBH"
+STATUS_FORMAT = "<IHH"
+GROUP_SIZE    = struct.calcsize(GROUP_FORMAT)
+STATUS_SIZE   = struct.calcsize(STATUS_FORMAT)
+
+class frameWriter():
+    # Frames are packed into preallocated buffers, nothing is allocated per frame
+
+    def __init__(self, stream):
+        self.stream      = stream
+        self.seq         = 0
+        self.groupBuffer = bytearray(5 + GROUP_SIZE)
+        self.statusBuffer= bytearray(5 + STATUS_SIZE)
+
+    def send(self, buf, frameType):
+        length = len(buf) - 5
+        buf[0] = SYNC
+        buf[1] = frameType
+        buf[2] = self.seq
+        buf[3] = length
+        check = 0
+        for i in range(1, 4 + length):
+            check += buf[i]
+        buf[4 + length] = check & 0xFF
+        self.seq = (self.seq + 1) & 0xFF
+        self.stream.write(buf)
+
+    def group(self, ticks, A, B, C, D, BLER, channel):
+        struct.pack_into(GROUP_FORMAT, self.groupBuffer, 4, ticks & 0xFFFFFFFF, A, B, C, D, BLER, channel)
+        self.send(self.groupBuffer, GROUP)
+
+    def status(self, ticks, statusRSSI, channel):
+        struct.pack_into(STATUS_FORMAT, self.statusBuffer, 4, ticks & 0xFFFFFFFF, statusRSSI, channel)
+        self.send(self.statusBuffer, STATUS)
+
+    def hello(self, name):
+        name = name.encode()
+        buf = bytearray(5 + len(name))
+        buf[4:4 + len(name)] = name
+        self.send(buf, HELLO)
+
+class frameReader():
+    # Feed any chunk of bytes, complete frames come back as (type, payload)
+
+    def __init__(self):
+        self.buffer     = bytearray()
+        self.seq        = -1
+        self.bytes      = 0
+        self.frames     = 0
+        self.dropped    = 0  # frames lost, from seq gaps
+        self.badFrames  = 0  # checksum errors
+        self.skipped    = 0  # bytes thrown away while looking for SYNC
+
+    def feed(self, data):
+        self.bytes += len(data)
+        self.buffer += data
+        frames = []
+        buf = self.buffer
+        pos = 0
+        while True:
+            start = buf.find(bytes((SYNC,)), pos)
+            if (start < 0):
+                self.skipped += len(buf) - pos
+                pos = len(buf)
+                break
+            self.skipped += start - pos
+            pos = start
+            if (len(buf) - pos < 5): break
+            length = buf[pos + 3]
+            if (len(buf) - pos < 5 + length): break
+            check = sum(buf[pos + 1:pos + 4 + length]) & 0xFF
+            if (check != buf[pos + 4 + length]):
+                # Not a frame, try the next SYNC byte
+                self.badFrames += 1
+                pos += 1
+                continue
+            seq = buf[pos + 2]
+            if (self.seq >= 0):
+                self.dropped += (seq - self.seq - 1) & 0xFF
+            self.seq = seq
+            self.frames += 1
+            frames.append((buf[pos + 1], bytes(buf[pos + 4:pos + 4 + length])))
+            pos += 5 + length
+        self.buffer = buf[pos:]
+        return frames
+
+def unpackGroup(payload):
+    # (ticks, A, B, C, D, BLER, channel)
+    return struct.unpack(GROUP_FORMAT, payload)
+
+def unpackStatus(payload):
+    # (ticks, STATUSRSSI, channel)
+    return struct.unpack(STATUS_FORMAT, payload)
@@ -0,0 +1,72 @@
+# (c) 2024 SA6HBR
+#
+# Group type 0A: basic tuning and switching information, PS and AF
+# Loaded by imports/rdsDecoder.py at the first 0A group.
+#
+
+from imports.rdsDecoder import rdsText
+
+def group0A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.1 Type 0 groups: Basic tuning and switching information")
+    # Programme Service
+    DI_Mask              = 0b0000000000000100
+    DI_RightShift        = 2
+    MS_Mask              = 0b0000000000001000
+    MS_RightShift        = 3
+    TA_Mask              = 0b0000000000010000
+    TA_RightShift        = 4
+    PSIndex_Mask         = 0b0000000000000011
+    PSIndex_RightShift   = 0
+    PSCharA_Mask         = 0b1111111100000000
+    PSCharA_RightShift   = 8
+    PSCharB_Mask         = 0b0000000011111111
+    PSCharB_RightShift   = 0
+
+    ProgrammeServiceIndex = (rds.blocks[rds.RDSB] & PSIndex_Mask) >> PSIndex_RightShift
+    ProgrammeCharA = (rds.blocks[rds.RDSD] & PSCharA_Mask) >> PSCharA_RightShift
+    ProgrammeCharB = (rds.blocks[rds.RDSD] & PSCharB_Mask) >> PSCharB_RightShift
+    DI = (rds.blocks[rds.RDSB] & DI_Mask) >> DI_RightShift
+    MS = (rds.blocks[rds.RDSB] & MS_Mask) >> MS_RightShift
+    rds.TA = (rds.blocks[rds.RDSB] & TA_Mask) >> TA_RightShift
+
+    if    (rds.TP==0 and rds.TA==0):TPTA="No TA" #This program does not carry traffic announcements nor does it refer, via EON, to a program that does.
+    elif  (rds.TP==0 and rds.TA==1):TPTA="EON" #This program carries EON information about another program which gives traffic information.
+    elif  (rds.TP==1 and rds.TA==0):TPTA="TA & EON" #This program carries traffic announcements but none are being broadcast at present.
+    elif  (rds.TP==1 and rds.TA==1):TPTA="Active" #A traffic announcement is being broadcast on this program at present.
+
+    if (silent == 0):
+        print ("DI : " + str(DI) + ", MS : " + str(MS) + ", TA : " + TPTA + ", Index : " + str(ProgrammeServiceIndex) + " [" + chr(ProgrammeCharA) + ":" + chr(ProgrammeCharB) + "]")
+
+    rds.ProgrammeService[ProgrammeServiceIndex * 2 + 0] = ProgrammeCharA
+    rds.ProgrammeService[ProgrammeServiceIndex * 2 + 1] = ProgrammeCharB
+
+    if (silent == 0):
+        print ("ProgrammeService : " + rdsText(rds.ProgrammeService))
+
+    AltFreqA_Mask        = 0b1111111100000000
+    AltFreqA_RightShift  = 8
+    AltFreqB_Mask        = 0b0000000011111111
+    AltFreqB_RightShift  = 0
+
+    AltFreqCodeA = (rds.blocks[rds.RDSC] & AltFreqA_Mask) >> AltFreqA_RightShift
+    AltFreqCodeB = (rds.blocks[rds.RDSC] & AltFreqB_Mask) >> AltFreqB_RightShift
+    AltFreqA = (AltFreqCodeA+875)/10
+    AltFreqB = (AltFreqCodeB+875)/10
+
+    #3.2.1.6.1 AF code tables: 224-249 = number of AFs that follow, 1-204 = 87.6-107.9 MHz, 205 = filler
+    for AltFreqCode in (AltFreqCodeA, AltFreqCodeB):
+        if (224 <= AltFreqCode <= 249):
+            rds.AltFreqExpected = AltFreqCode - 224
+        elif (1 <= AltFreqCode <= 204 and rds.AltFreqCount < len(rds.AltFreqList)):
+            # Index loop, a slice of the list would be allocated for every 0A group
+            for i in range(rds.AltFreqCount):
+                if (rds.AltFreqList[i] == AltFreqCode): break
+            else:
+                rds.AltFreqList[rds.AltFreqCount] = AltFreqCode
+                rds.AltFreqCount += 1
+
+    if (silent == 0):
+        print ("Alt. freq. A: " + str(AltFreqA))
+        print ("Alt. freq. B: " + str(AltFreqB))
@@ -0,0 +1,72 @@
+# (c) 2024 SA6HBR
+#
+# Group type 1A/1B: programme item number and slow labelling codes (ECC)
+# Loaded by imports/rdsDecoder.py at the first 1A or 1B group.
+#
+
+def group1A(rds, silent = 0):
+    group1(rds, "A", silent)
+
+def group1B(rds, silent = 0):
+    group1(rds, "B", silent)
+
+def group1(rds, char, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.2 Type 1 groups: Programme Item Number and slow labelling codes")
+    # Programme item number code
+    PinDay_Mask          = 0b1111100000000000
+    PinDay_RightShift    = 11
+    PinHour_Mask         = 0b0000011111000000
+    PinHour_RightShift   = 6
+    PinMinute_Mask       = 0b0000000000111111
+    PinMinute_RightShift = 0
+
+    PinDay    = (rds.blocks[rds.RDSD] & PinDay_Mask) >> PinDay_RightShift
+    PinHour   = (rds.blocks[rds.RDSD] & PinHour_Mask) >> PinHour_RightShift
+    PinMinute = (rds.blocks[rds.RDSD] & PinMinute_Mask) >> PinMinute_RightShift
+    Pin       = ("0"+str(PinDay))[-2:] + ("0"+str(PinHour))[-2:] + ("0"+str(PinMinute))[-2:]
+
+    #Radio Paging Codes
+    RPC_Mask       = 0b0000000000011111
+    RPC_RightShift = 0
+
+    RPC    = (rds.blocks[rds.RDSB] & RPC_Mask) >> RPC_RightShift
+    if (char == "B"):
+        if (silent == 0):
+            print ("Programme item number code : " + Pin)
+    else:
+        #Slow labelling codes
+        LinkageActuator_Mask           = 0b1000000000000000
+        LinkageActuator_RightShift     = 15
+        VariantCode_Mask               = 0b0111000000000000
+        VariantCode_RightShift         = 12
+        Paging_Mask                    = 0b0000111100000000
+        Paging_RightShift              = 8
+        ExtendedCountryCode_Mask       = 0b0000000011111111
+        ExtendedCountryCode_RightShift = 0
+        Other_Mask                     = 0b0000111111111111
+        Other_RightShift               = 0
+
+        LinkageActuator           = (rds.blocks[rds.RDSC] & LinkageActuator_Mask) >> LinkageActuator_RightShift
+        VariantCode               = (rds.blocks[rds.RDSC] & VariantCode_Mask) >> VariantCode_RightShift
+        Paging                    = (rds.blocks[rds.RDSC] & Paging_Mask) >> Paging_RightShift
+        ExtendedCountryCode       = (rds.blocks[rds.RDSC] & ExtendedCountryCode_Mask) >> ExtendedCountryCode_RightShift
+        Other                     = (rds.blocks[rds.RDSC] & Other_Mask) >> Other_RightShift
+
+        if (VariantCode == 0b000): rds.ECC = ExtendedCountryCode
+
+        if (silent == 0):
+            from imports.rdsTables import piCountry, countryName
+            print ("Programme item number code : " + Pin + " Radio Paging Codes: " + str(RPC) + " LinkageActuator: " + str(LinkageActuator) + " VariantCode: " + str(VariantCode))
+
+            if  (VariantCode == 0b000 and piCountry(rds.blocks[rds.RDSA], ExtendedCountryCode) is not None):print ("Paging: " + str(Paging) + " ExtendedCountryCode: " + countryName(rds.blocks[rds.RDSA], ExtendedCountryCode))
+            elif(VariantCode == 0b000):print ("Paging: " + str(Paging) + " ExtendedCountryCode: " + str(ExtendedCountryCode))
+            elif(VariantCode == 0b001):print ("TMC identification: " + str(Other) )
+            elif(VariantCode == 0b010):print ("Paging identification: " + str(Other) )
+            elif(VariantCode == 0b011 and Other == 0x28):print ("Language codes: Swedish" )
+            elif(VariantCode == 0b011):print ("Language codes: " + str(hex(Other)) )
+            elif(VariantCode == 0b100):print ("not assigned: " + str(Other) )
+            elif(VariantCode == 0b101):print ("not assigned: " + str(Other) )
+            elif(VariantCode == 0b110):print ("For use by broadcasters: " + str(Other) )
+            elif(VariantCode == 0b111):print ("Identification of EWS channel: " + str(Other) )
@@ -0,0 +1,57 @@
+# (c) 2024 SA6HBR
+#
+# Group type 10A: programme type name
+# Loaded by imports/rdsDecoder.py at the first 10A group.
+#
+
+from imports.rdsDecoder import rdsText, clearBuffer
+
+def group10A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.14 Type 10 groups: Programme Type Name (Group type 10A) and Open data (Group type 10B)")
+
+    # Programme Type Name
+    PTYN_index_Mask         = 0b0000000000000001
+    PTYN_index_RightShift   = 0
+    PTYN_flag_Mask          = 0b0000000000010000
+    PTYN_flag_RightShift    = 4
+    PTYN_CharA_Mask         = 0b1111111100000000
+    PTYN_CharA_RightShift   = 8
+    PTYN_CharB_Mask         = 0b0000000011111111
+    PTYN_CharB_RightShift   = 0
+    PTYN_CharC_Mask         = 0b1111111100000000
+    PTYN_CharC_RightShift   = 8
+    PTYN_CharD_Mask         = 0b0000000011111111
+    PTYN_CharD_RightShift   = 0
+
+    PTYN_index = (rds.blocks[rds.RDSB] & PTYN_index_Mask) >> PTYN_index_RightShift
+    PTYN_flag  = (rds.blocks[rds.RDSB] & PTYN_flag_Mask) >> PTYN_flag_RightShift
+    PTYN_CharA = (rds.blocks[rds.RDSC] & PTYN_CharA_Mask) >> PTYN_CharA_RightShift
+    PTYN_CharB = (rds.blocks[rds.RDSC] & PTYN_CharB_Mask) >> PTYN_CharB_RightShift
+    PTYN_CharC = (rds.blocks[rds.RDSD] & PTYN_CharC_Mask) >> PTYN_CharC_RightShift
+    PTYN_CharD = (rds.blocks[rds.RDSD] & PTYN_CharD_Mask) >> PTYN_CharD_RightShift
+
+    if (silent == 0):
+        print ("PTYN_flag: " + str(PTYN_flag) + ", PTYN_index: " + str(PTYN_index) + " " + chr(PTYN_CharA)+chr(PTYN_CharB)+chr(PTYN_CharC)+chr(PTYN_CharD))
+
+    if(PTYN_flag == 0):
+        if(rds.ProgrammeTypeNameFlag==1):clearBuffer(rds.ProgrammeTypeNameTextA)
+        rds.ProgrammeTypeNameTextA[PTYN_index * 4 + 0] = PTYN_CharA
+        rds.ProgrammeTypeNameTextA[PTYN_index * 4 + 1] = PTYN_CharB
+        rds.ProgrammeTypeNameTextA[PTYN_index * 4 + 2] = PTYN_CharC
+        rds.ProgrammeTypeNameTextA[PTYN_index * 4 + 3] = PTYN_CharD
+    else:
+        if(rds.ProgrammeTypeNameFlag==0):clearBuffer(rds.ProgrammeTypeNameTextB)
+        rds.ProgrammeTypeNameTextB[PTYN_index * 4 + 0] = PTYN_CharA
+        rds.ProgrammeTypeNameTextB[PTYN_index * 4 + 1] = PTYN_CharB
+        rds.ProgrammeTypeNameTextB[PTYN_index * 4 + 2] = PTYN_CharC
+        rds.ProgrammeTypeNameTextB[PTYN_index * 4 + 3] = PTYN_CharD
+
+    # A/B flip cleared a buffer, cached segments of that text must be decoded again
+    if (PTYN_flag != rds.ProgrammeTypeNameFlag): rds.flushGroupCache()
+    rds.ProgrammeTypeNameFlag = PTYN_flag
+
+    if (silent == 0):
+        print ("ProgrammeTypeNameTextA : " + rdsText(rds.ProgrammeTypeNameTextA))
+        print ("ProgrammeTypeNameTextB : " + rdsText(rds.ProgrammeTypeNameTextB))
@@ -0,0 +1,93 @@
+# (c) 2024 SA6HBR
+#
+# Group type 14A/14B: enhanced other networks
+# Loaded by imports/rdsDecoder.py at the first 14A or 14B group.
+#
+
+def group14A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print("3.1.5.19 Type 14 groups: Enhanced Other Networks information")
+    # Other Networks
+    TP_Mask                = 0b0000000000010000
+    TP_RightShift          = 4
+    PI_Country_Mask        = 0b1111000000000000
+    PI_Country_RightShift  = 12
+    PI_Type_Mask           = 0b0000111100000000
+    PI_Type_RightShift     = 8
+    PI_Referens_Mask       = 0b0000000011111111
+    PI_Referens_RightShift = 8
+
+    TP         = (rds.blocks[rds.RDSB] & TP_Mask) >> TP_RightShift
+    PiCountry  = (rds.blocks[rds.RDSD] & PI_Country_Mask) >> PI_Country_RightShift
+    PiType     = (rds.blocks[rds.RDSD] & PI_Type_Mask) >> PI_Type_RightShift
+    PiReferens = (rds.blocks[rds.RDSD] & PI_Referens_Mask) >> PI_Referens_RightShift
+
+    if (silent == 0):
+        print ("Other Networks TP:" + str(TP) + ", PiCountry: " + str(hex(PiCountry)[2:])  + ", PiType: " + str(PiType)  + ", PiReferens: " + str(PiReferens))
+
+    VariantCode_Mask       = 0b0000000000001111
+    VariantCode_RightShift = 0
+    PartA_Mask             = 0b1111111100000000
+    PartA_RightShift       = 8
+    PartB_Mask             = 0b0000000011111111
+    PartB_RightShift       = 0
+    Other_Mask             = 0b1111111111111111
+    Other_RightShift       = 0
+    PTY_Mask               = 0b1111100000000000
+    PTY_RightShift         = 11
+    TA_Mask                = 0b0000000000000001
+    TA_RightShift          = 0
+
+    VariantCode            = (rds.blocks[rds.RDSB] & VariantCode_Mask) >> VariantCode_RightShift
+    PartA                  = (rds.blocks[rds.RDSC] & PartA_Mask) >> PartA_RightShift
+    PartB                  = (rds.blocks[rds.RDSC] & PartB_Mask) >> PartB_RightShift
+    Other                  = (rds.blocks[rds.RDSC] & Other_Mask) >> Other_RightShift
+    PTY                    = (rds.blocks[rds.RDSC] & PTY_Mask) >> PTY_RightShift
+    TA                     = (rds.blocks[rds.RDSC] & TA_Mask) >> TA_RightShift
+
+    PinDay_Mask          = 0b1111100000000000
+    PinDay_RightShift    = 11
+    PinHour_Mask         = 0b0000011111000000
+    PinHour_RightShift   = 6
+    PinMinute_Mask       = 0b0000000000111111
+    PinMinute_RightShift = 0
+
+    PinDay    = (rds.blocks[rds.RDSC] & PinDay_Mask) >> PinDay_RightShift
+    PinHour   = (rds.blocks[rds.RDSC] & PinHour_Mask) >> PinHour_RightShift
+    PinMinute = (rds.blocks[rds.RDSC] & PinMinute_Mask) >> PinMinute_RightShift
+    Pin       = ("0"+str(PinDay))[-2:] + ("0"+str(PinHour))[-2:] + ("0"+str(PinMinute))[-2:]
+
+    if (silent == 0):
+        if  (0b0000 <= VariantCode <= 0b0011):print ("PS: index;" + str(VariantCode) + "-" + chr(PartA) + chr(PartB))
+        elif(VariantCode == 0b0100):print ("Alt. Freq.: " + str((PartA + 875)/10) + " + " + str((PartB + 875)/10))
+        elif(0b0101 <= VariantCode <= 0b1001):print ("Tuning freq. : " + str((PartA + 875)/10) + " Mapped FM freq. " + str(VariantCode - 5) + " : " + str((PartB + 875)/10) )
+        elif(0b1010 <= VariantCode <= 0b1011):print ("Unallocated: " + str(Other))
+        elif(VariantCode == 0b1100):print ("Linkage information: " + str(Other) )
+        elif(VariantCode == 0b1101):print ("PTY: " + str(PTY) + " TA: " + str(TA) )
+        elif(VariantCode == 0b1110):print ("PIN: " + str(Pin) )
+        elif(VariantCode == 0b1111):print ("Reserved for broadcasters use: " + str(Other) )
+
+    # Keep what is learned about the other network, its PI is in block D
+    other = rds.otherNetwork(rds.blocks[rds.RDSD])
+    other[3] = TP
+    if (VariantCode <= 0b0011):
+        other[0][VariantCode * 2 + 0] = PartA
+        other[0][VariantCode * 2 + 1] = PartB
+    elif (VariantCode == 0b0100 and PartA == 225 and 1 <= PartB <= 204):
+        other[1] = PartB + rds.FIRSTCHANNEL
+    elif (0b0101 <= VariantCode <= 0b1000 and 1 <= PartB <= 204):
+        other[1] = PartB + rds.FIRSTCHANNEL
+    elif (VariantCode == 0b1101):
+        other[2] = TA
+        other[4] = PTY
+
+def group14B(rds, silent = 0):
+    # Other network switching: TP(ON) b4, TA(ON) b3, PI(ON) in block D
+    other = rds.otherNetwork(rds.blocks[rds.RDSD])
+    other[3] = (rds.blocks[rds.RDSB] >> 4) & 0b1
+    other[2] = (rds.blocks[rds.RDSB] >> 3) & 0b1
+    if (silent == 0):
+        print()
+        print("3.1.5.20 Type 14B groups: Enhanced Other Networks information")
+        print ("Other Networks PI: " + hex(rds.blocks[rds.RDSD]) + ", TP: " + str(other[3]) + ", TA: " + str(other[2]))
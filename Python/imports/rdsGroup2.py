@@ -0,0 +1,94 @@
+# (c) 2024 SA6HBR
+#
+# Group type 2A and 2B: RadioText
+# Loaded by imports/rdsDecoder.py at the first 2A or 2B group.
+#
+
+from imports.rdsDecoder import rdsText, clearBuffer
+
+def group2A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.3 Type 2 groups: RadioText")
+    RT_index_Mask         = 0b0000000000001111
+    RT_index_RightShift   = 0
+    RT_flag_Mask          = 0b0000000000010000
+    RT_flag_RightShift    = 4
+    RT_CharA_Mask         = 0b1111111100000000
+    RT_CharA_RightShift   = 8
+    RT_CharB_Mask         = 0b0000000011111111
+    RT_CharB_RightShift   = 0
+    RT_CharC_Mask         = 0b1111111100000000
+    RT_CharC_RightShift   = 8
+    RT_CharD_Mask         = 0b0000000011111111
+    RT_CharD_RightShift   = 0
+
+    RT_index = (rds.blocks[rds.RDSB] & RT_index_Mask) >> RT_index_RightShift
+    RT_flag  = (rds.blocks[rds.RDSB] & RT_flag_Mask) >> RT_flag_RightShift
+    RT_CharA = (rds.blocks[rds.RDSC] & RT_CharA_Mask) >> RT_CharA_RightShift
+    RT_CharB = (rds.blocks[rds.RDSC] & RT_CharB_Mask) >> RT_CharB_RightShift
+    RT_CharC = (rds.blocks[rds.RDSD] & RT_CharC_Mask) >> RT_CharC_RightShift
+    RT_CharD = (rds.blocks[rds.RDSD] & RT_CharD_Mask) >> RT_CharD_RightShift
+
+    if (silent == 0):
+        print ("RT_flag: " + str(RT_flag) + ", RT_index: " + str(RT_index) + " " + chr(RT_CharA)+chr(RT_CharB)+chr(RT_CharC)+chr(RT_CharD))
+
+    if(RT_flag == 0):
+        if(rds.RadioTextFlag==1):clearBuffer(rds.RadioTextA)
+        rds.RadioTextA[RT_index * 4 + 0] = RT_CharA
+        rds.RadioTextA[RT_index * 4 + 1] = RT_CharB
+        rds.RadioTextA[RT_index * 4 + 2] = RT_CharC
+        rds.RadioTextA[RT_index * 4 + 3] = RT_CharD
+    else:
+        if(rds.RadioTextFlag==0):clearBuffer(rds.RadioTextB)
+        rds.RadioTextB[RT_index * 4 + 0] = RT_CharA
+        rds.RadioTextB[RT_index * 4 + 1] = RT_CharB
+        rds.RadioTextB[RT_index * 4 + 2] = RT_CharC
+        rds.RadioTextB[RT_index * 4 + 3] = RT_CharD
+
+    # A/B flip cleared a buffer, cached segments of that text must be decoded again
+    if (RT_flag != rds.RadioTextFlag): rds.flushGroupCache()
+    rds.RadioTextFlag = RT_flag
+
+    if (silent == 0):
+        print ("RadioTextA : " + rdsText(rds.RadioTextA))
+        print ("RadioTextB : " + rdsText(rds.RadioTextB))
+
+def group2B(rds, silent = 0):
+    # 2B: 32 characters, two per group in block D, block C is the PI
+    if (silent == 0):
+        print()
+        print ("3.1.5.3 Type 2 groups: RadioText (2B)")
+    RT_index_Mask         = 0b0000000000001111
+    RT_index_RightShift   = 0
+    RT_flag_Mask          = 0b0000000000010000
+    RT_flag_RightShift    = 4
+    RT_CharC_Mask         = 0b1111111100000000
+    RT_CharC_RightShift   = 8
+    RT_CharD_Mask         = 0b0000000011111111
+    RT_CharD_RightShift   = 0
+
+    RT_index = (rds.blocks[rds.RDSB] & RT_index_Mask) >> RT_index_RightShift
+    RT_flag  = (rds.blocks[rds.RDSB] & RT_flag_Mask) >> RT_flag_RightShift
+    RT_CharC = (rds.blocks[rds.RDSD] & RT_CharC_Mask) >> RT_CharC_RightShift
+    RT_CharD = (rds.blocks[rds.RDSD] & RT_CharD_Mask) >> RT_CharD_RightShift
+
+    if (silent == 0):
+        print ("RT_flag: " + str(RT_flag) + ", RT_index: " + str(RT_index) + " " + chr(RT_CharC)+chr(RT_CharD))
+
+    if(RT_flag == 0):
+        if(rds.RadioTextFlag==1):clearBuffer(rds.RadioTextA)
+        rds.RadioTextA[RT_index * 2 + 0] = RT_CharC
+        rds.RadioTextA[RT_index * 2 + 1] = RT_CharD
+    else:
+        if(rds.RadioTextFlag==0):clearBuffer(rds.RadioTextB)
+        rds.RadioTextB[RT_index * 2 + 0] = RT_CharC
+        rds.RadioTextB[RT_index * 2 + 1] = RT_CharD
+
+    # A/B flip cleared a buffer, cached segments of that text must be decoded again
+    if (RT_flag != rds.RadioTextFlag): rds.flushGroupCache()
+    rds.RadioTextFlag = RT_flag
+
+    if (silent == 0):
+        print ("RadioTextA : " + rdsText(rds.RadioTextA))
+        print ("RadioTextB : " + rdsText(rds.RadioTextB))
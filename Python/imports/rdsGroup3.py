@@ -0,0 +1,28 @@
+# (c) 2024 SA6HBR
+#
+# Group type 3A: application identification for open data, see imports/rdsOda.py
+# Loaded by imports/rdsDecoder.py at the first 3A group.
+#
+
+from imports.rdsDecoder import GROUPNAME
+
+def group3A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.4 Type 3A groups: Application identification for Open data")
+    # Programme Service
+    Type_Mask            = 0b0000000000011111
+    Type_RightShift      = 0
+    Message_Mask         = 0b1111111111111111
+    Message_RightShift   = 0
+    ID_Mask              = 0b1111111111111111
+    ID_RightShift        = 0
+
+    ApplicationGroupTypeCode  = (rds.blocks[rds.RDSB] & Type_Mask) >> Type_RightShift
+    MessageBits               = (rds.blocks[rds.RDSC] & Message_Mask) >> Message_RightShift
+    ApplicationIdentification = (rds.blocks[rds.RDSD] & ID_Mask) >> ID_RightShift
+
+    if (silent == 0):
+        print ("ApplicationGroupType : " + GROUPNAME[ApplicationGroupTypeCode] + ", MessageBits : " + str(MessageBits) + ", AID: " + hex(ApplicationIdentification))
+
+    rds.getOda().announce(ApplicationIdentification, ApplicationGroupTypeCode, MessageBits, silent)
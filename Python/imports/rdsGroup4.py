@@ -0,0 +1,49 @@
+# (c) 2024 SA6HBR
+#
+# Group type 4A: clock-time and date, the RTC is set by rds.clock (imports/rdsClock.py)
+# Loaded by imports/rdsDecoder.py at the first 4A group.
+#
+
+from imports.rdsClock import mjdToDate
+
+def group4A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.6 Type 4A groups : Clock-time and date")
+
+    LocalTimeOffset_Mask         = 0b0000000000011111
+    LocalTimeOffset_RightShift   = 0
+    LocalTimeSense_Mask          = 0b0000000000100000
+    LocalTimeSense_RightShift    = 5
+
+    LocalTimeOffset = (rds.blocks[rds.RDSD] & LocalTimeOffset_Mask) >> LocalTimeOffset_RightShift # half hours
+    if(((rds.blocks[rds.RDSD] & LocalTimeSense_Mask) >> LocalTimeSense_RightShift) == 1):
+        LocalTimeOffset = -LocalTimeOffset
+
+    UtcMinute_Mask               = 0b0000111111000000
+    UtcMinute_RightShift         = 6
+    UtcHourPartLow_Mask          = 0b1111000000000000
+    UtcHourPartLow_RightShift    = 12
+    UtcHourPartHigh_Mask         = 0b0000000000000001
+    UtcHourPartHigh_LeftShift    = 4
+
+    UtcMinute = (rds.blocks[rds.RDSD] & UtcMinute_Mask) >> UtcMinute_RightShift
+    UtcHour   = ((rds.blocks[rds.RDSD] & UtcHourPartLow_Mask) >> UtcHourPartLow_RightShift)+((rds.blocks[rds.RDSC] & UtcHourPartHigh_Mask) << UtcHourPartHigh_LeftShift)
+
+    # Modified Julian Day Code
+    MJDCodePartLow_Mask          = 0b1111111111111110
+    MJDCodePartLow_RightShift    = 1
+    MJDCodePartHigh_Mask         = 0b0000000000000011
+    MJDCodePartHigh_LeftShift    = 15
+    MJD = ((rds.blocks[rds.RDSC] & MJDCodePartLow_Mask) >> MJDCodePartLow_RightShift) + ((rds.blocks[rds.RDSB] & MJDCodePartHigh_Mask) << MJDCodePartHigh_LeftShift)
+
+    # The RTC is only written by clockSync, after two groups agree and the drift is large enough
+    trusted = rds.clock.feed(MJD, UtcHour, UtcMinute, LocalTimeOffset)
+
+    if (silent == 0):
+        MJD_Year, MJD_Month, MJD_Day, MJD_WeekDay = mjdToDate(MJD)
+        print ("MJD + UTC       : " + str(MJD_Year)+"-"+("0"+str(MJD_Month))[-2:]+"-"+("0"+str(MJD_Day))[-2:] + " " + ("0"+str(UtcHour))[-2:] +":"+ ("0"+str(UtcMinute))[-2:] + " TZ: " + str(LocalTimeOffset / 2))
+        syncCount, writeCount, rejectCount, lastDrift, maxDrift, meanDrift = rds.clock.getStats()
+        print ("Clock sync      : " + ("trusted" if trusted else "waiting") + ", drift " + str(lastDrift) + " s, RTC writes " + str(writeCount) + ", rejected " + str(rejectCount))
+        year, month, day, hour, minute, second, weekday, yearday = rds.clock.localTime()
+        print ("RTC-localtime   : " + str(year)+"-"+("0"+str(month))[-2:]+"-"+("0"+str(day))[-2:]+ " " + ("0"+str(hour))[-2:] +":"+ ("0"+str(minute))[-2:] +":"+ ("0"+str(second))[-2:])
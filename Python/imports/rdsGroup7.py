@@ -0,0 +1,56 @@
+# (c) 2024 SA6HBR
+#
+# Group type 7A: radio paging
+# Loaded by imports/rdsDecoder.py at the first 7A group.
+#
+
+from imports.rdsDecoder import rdsText, clearBuffer
+
+def group7A(rds, silent = 0):
+    if (silent == 0):
+        print()
+        print ("3.1.5.10 Type 7A groups: Radio Paging or ODA")
+
+    RP_index_Mask         = 0b0000000000001111
+    RP_index_RightShift   = 0
+    RP_flag_Mask          = 0b0000000000010000
+    RP_flag_RightShift    = 4
+    RP_CharA_Mask         = 0b1111111100000000
+    RP_CharA_RightShift   = 8
+    RP_CharB_Mask         = 0b0000000011111111
+    RP_CharB_RightShift   = 0
+    RP_CharC_Mask         = 0b1111111100000000
+    RP_CharC_RightShift   = 8
+    RP_CharD_Mask         = 0b0000000011111111
+    RP_CharD_RightShift   = 0
+
+    RP_index = (rds.blocks[rds.RDSB] & RP_index_Mask) >> RP_index_RightShift
+    RP_flag  = (rds.blocks[rds.RDSB] & RP_flag_Mask) >> RP_flag_RightShift
+    RP_CharA = (rds.blocks[rds.RDSC] & RP_CharA_Mask) >> RP_CharA_RightShift
+    RP_CharB = (rds.blocks[rds.RDSC] & RP_CharB_Mask) >> RP_CharB_RightShift
+    RP_CharC = (rds.blocks[rds.RDSD] & RP_CharC_Mask) >> RP_CharC_RightShift
+    RP_CharD = (rds.blocks[rds.RDSD] & RP_CharD_Mask) >> RP_CharD_RightShift
+
+    if (silent == 0):
+        print ("RP_flag: " + str(RP_flag) + " RP_index: " + str(RP_index) + " " + chr(RP_CharA)+chr(RP_CharB)+chr(RP_CharC)+chr(RP_CharD))
+
+    if(RP_flag == 0):
+        if(rds.RadioPagingFlag==1):clearBuffer(rds.RadioPagingA)
+        rds.RadioPagingA[RP_index * 4 + 0] = RP_CharA
+        rds.RadioPagingA[RP_index * 4 + 1] = RP_CharB
+        rds.RadioPagingA[RP_index * 4 + 2] = RP_CharC
+        rds.RadioPagingA[RP_index * 4 + 3] = RP_CharD
+    else:
+        if(rds.RadioPagingFlag==0):clearBuffer(rds.RadioPagingB)
+        rds.RadioPagingB[RP_index * 4 + 0] = RP_CharA
+        rds.RadioPagingB[RP_index * 4 + 1] = RP_CharB
+        rds.RadioPagingB[RP_index * 4 + 2] = RP_CharC
+        rds.RadioPagingB[RP_index * 4 + 3] = RP_CharD
+
+    # A/B flip cleared a buffer, cached segments of that text must be decoded again
+    if (RP_flag != rds.RadioPagingFlag): rds.flushGroupCache()
+    rds.RadioPagingFlag = RP_flag
+
+    if (silent == 0):
+        print ("RadioPagingA : " + rdsText(rds.RadioPagingA))
+        print ("RadioPagingB : " + rdsText(rds.RadioPagingB))
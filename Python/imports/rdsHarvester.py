@@ -0,0 +1,145 @@
+# (c) 2024 SA6HBR
+#
+# Round-robin RDS harvester
+# Visits a list of channels and stays on each only until PI, PS, PTY, ECC and the AF list are
+# complete, or the per-station budget is spent. The next station is the one with the highest
+# staleness: time since the last visit, times the number of fields still missing. Complete
+# stations are only revisited after refreshAge.
+#
+# A station without RDS sync after syncTimeout is left at once.
+#
+# Usage:
+#   harvester = stationHarvester(radio, radio.getAllChannel())
+#   harvester.run(rounds = 2)
+#   harvester.printReport()
+#
+
+from imports.rdsTime import ticks_ms, ticks_diff, sleep_ms
+from imports.rdsScheduler import groupScheduler
+from imports.rdsDecoder import rdsText
+
+FIELDS = ("PI", "PS", "PTY", "ECC", "AF")
+
+class stationRecord():
+
+    def __init__(self, channel):
+        self.channel   = channel
+        self.PI        = 0
+        self.PS        = ""
+        self.PTY       = -1
+        self.ECC       = 0
+        self.AF        = None  # None = not complete yet
+        self.noRDS     = 0     # visits that ended without RDS sync
+        self.visits    = 0
+        self.airTime   = 0     # ms dwelling
+        self.lastVisit = None
+
+    def found(self):
+        # Bit per field in FIELDS
+        return ((self.PI != 0) | ((self.PS != "") << 1) | ((self.PTY >= 0) << 2) |
+                ((self.ECC != 0) << 3) | ((self.AF is not None) << 4))
+
+    def missing(self):
+        found = self.found()
+        return sum(1 for i in range(len(FIELDS)) if not (found >> i) & 1)
+
+class stationHarvester():
+
+    budget      = 8000    # ms on a station per visit
+    syncTimeout = 1500    # ms without RDSS before a station is left
+    refreshAge  = 600000  # ms before a complete station is visited again
+
+    def __init__(self, radio, channels):
+        self.radio     = radio
+        self.scheduler = groupScheduler(radio)
+        self.stations  = {}
+        for channel in channels: self.stations[channel] = stationRecord(channel)
+        self.fieldsFound = 0
+        self.airTime     = 0
+        self.tuneTime    = 0
+
+    def next(self, now):
+        # Highest staleness first, never visited stations before all others
+        best      = None
+        bestScore = -1
+        for record in self.stations.values():
+            missing = record.missing()
+            if (record.lastVisit is None): score = 1 << 30
+            else:
+                age = ticks_diff(now, record.lastVisit)
+                if (missing == 0 and age < self.refreshAge): continue
+                # A station that never had RDS is only revisited when nothing else is missing
+                score = age * (missing + 1) // (1 + record.noRDS * 4)
+            if (score > bestScore):
+                best      = record
+                bestScore = score
+        return best
+
+    def visit(self, record):
+        radio = self.radio
+        start = ticks_ms()
+        radio.setChannel(record.channel)
+        self.scheduler.reset()
+        dwellStart = ticks_ms()
+        self.tuneTime += ticks_diff(dwellStart, start)
+        before = record.found()
+        synced = 0
+        while True:
+            now = ticks_ms()
+            dwell = ticks_diff(now, dwellStart)
+            if (dwell > self.budget): break
+            if (self.scheduler.poll()):
+                radio.decodeGroup()
+                synced = 1
+                self.update(record)
+                if (record.missing() == 0): break
+            elif (not synced and dwell > self.syncTimeout and not radio.RDSS): break
+            # Without sync the scheduler backs off up to a second, the timeouts above are checked more often
+            wait = min(self.scheduler.waitMs(), 50)
+            if (wait > 0): sleep_ms(wait)
+        dwell = ticks_diff(ticks_ms(), dwellStart)
+        record.visits   += 1
+        record.airTime  += dwell
+        record.lastVisit = ticks_ms()
+        if (not synced): record.noRDS += 1
+        self.airTime += dwell
+        new = record.found() & ~before
+        self.fieldsFound += sum(1 for i in range(len(FIELDS)) if (new >> i) & 1)
+
+    def update(self, record):
+        rds = self.radio.rds
+        PI = rds.getPI()
+        if (PI == 0): return
+        if (record.PI != PI):
+            # Another station on this channel, start over
+            record.PS  = ""
+            record.ECC = 0
+            record.AF  = None
+        record.PI  = PI
+        record.PTY = rds.PTY
+        if (rds.ECC): record.ECC = rds.ECC
+        if (record.PS == "" and 0 not in rds.ProgrammeService): record.PS = rdsText(rds.ProgrammeService)
+        if (record.AF is None and rds.altFreqComplete()): record.AF = rds.getAltFreqs()
+
+    def run(self, maxTime = 0, rounds = 1):
+        # Visit stations until every one has had `rounds` visits or all are complete, or maxTime ms
+        start = ticks_ms()
+        while True:
+            record = self.next(ticks_ms())
+            if (record is None or record.visits >= rounds): break
+            if (maxTime and ticks_diff(ticks_ms(), start) > maxTime): break
+            self.visit(record)
+        return ticks_diff(ticks_ms(), start)
+
+    def fieldsPerSecond(self):
+        return self.fieldsFound * 1000 / self.airTime if self.airTime else 0
+
+    def printReport(self):
+        print ("  MHz   PI   PS       PTY ECC visits  air ms  AF")
+        for channel in sorted(self.stations):
+            r = self.stations[channel]
+            print (("  " + str(channel / 10))[-5:] + " " + (("%04X" % r.PI) if r.PI else "----") + " " + (r.PS + "        ")[:8] + " " +
+                   ("  " + str(r.PTY))[-3:] + " " + (("%02X" % r.ECC) if r.ECC else "--") + "  " + ("     " + str(r.visits))[-5:] +
+                   ("        " + str(r.airTime))[-8:] + "  " + (", ".join([str(af / 10) for af in r.AF]) if r.AF is not None else "-"))
+        print ("Fields: " + str(self.fieldsFound) + " in " + str(self.airTime) + " ms air time (" + ("%.2f" % self.fieldsPerSecond()) +
+               " fields/s), tuning: " + str(self.tuneTime) + " ms")
@@ -0,0 +1,158 @@
+# (c) 2024 SA6HBR
+#
+# Duty-cycled RDS monitoring for battery use
+# The radio stays powered and muted. Every interval ms the MCU wakes for a window of
+# windowGroups groups, read in step with the group rate by the scheduler, and sleeps in
+# between (machine.lightsleep). Across the sleep the scheduler keeps its phase, so a window
+# starts just after a group arrives instead of searching for it again.
+# It wakes fully (run returns) on one of the triggers:
+#   TA    : traffic announcement starts, rds.taAnnouncement as debounced by the decoder
+#   ALARM : PTY 31
+#   RT    : new RadioText, the A/B flag of 2A/2B toggles
+#   CT    : the clock was synced from 4A
+#
+# lightsleep stops USB, use sleeper = time.sleep_ms when connected to a computer.
+#
+# Usage:
+#   monitor = rdsMonitor(radio, ("TA", "ALARM"))
+#   trigger = monitor.run()
+#   monitor.printReport()
+#
+
+from array import array
+from imports.rdsTime import ticks_ms, ticks_diff, sleep_ms
+from imports.rdsScheduler import groupScheduler, LOCKED
+
+TRIGGERS = ("TA", "ALARM", "RT", "CT")
+
+class rdsMonitor():
+
+    interval      = 2000  # ms from window to window
+    windowGroups  = 4     # groups read per window
+    windowTimeout = 600   # ms a window waits for its groups
+    minutes       = 60    # minutes kept in the awake ms history
+
+    def __init__(self, radio, triggers = TRIGGERS, sleeper = None):
+        self.radio     = radio
+        self.triggers  = triggers
+        if (sleeper is None):
+            try:
+                from machine import lightsleep
+                sleeper = lightsleep
+            except ImportError:
+                sleeper = sleep_ms
+        self.sleeper   = sleeper
+        self.scheduler = groupScheduler(radio)
+        self.awakeHistory = array('H', [0] * self.minutes) # ring, awake ms in each of the last minutes
+        self.minuteIndex  = 0
+        self.triggerCount = {}
+        for trigger in TRIGGERS: self.triggerCount[trigger] = 0
+        self.wakes    = 0
+        self.groups   = 0
+        self.slept    = 0    # ms
+        self.awake    = 0    # ms
+        self.reset()
+
+    def reset(self):
+        # Forget the last seen state, e.g. after a tune
+        self.lastTA   = 0
+        self.lastPTY  = -1
+        self.lastRT   = -1
+        self.lastSync = self.radio.rds.clock.syncCount
+        self.scheduler.reset()
+
+    def sleep(self, ms):
+        if (ms <= 0): return
+        start = ticks_ms()
+        self.sleeper(ms)
+        self.slept += ticks_diff(ticks_ms(), start)
+
+    def check(self):
+        # The trigger raised by the group just decoded, or None
+        rds = self.radio.rds
+        groupCode = rds.blocks[rds.RDSB] >> 11
+        trigger = None
+        if (groupCode in (0, 1)):
+            TA = rds.taAnnouncement
+            if (TA and not self.lastTA): trigger = "TA"
+            self.lastTA = TA
+        elif (groupCode in (4, 5)):
+            if (self.lastRT >= 0 and rds.RadioTextFlag != self.lastRT): trigger = "RT"
+            self.lastRT = rds.RadioTextFlag
+        if (rds.PTY == 31 and self.lastPTY != 31): trigger = "ALARM"
+        self.lastPTY = rds.PTY
+        if (rds.clock.syncCount != self.lastSync):
+            self.lastSync = rds.clock.syncCount
+            trigger = "CT"
+        if (trigger is not None):
+            self.triggerCount[trigger] += 1
+            if (trigger not in self.triggers): trigger = None
+        return trigger
+
+    def window(self):
+        # Read up to windowGroups groups, sleeping between them. Returns a trigger or None.
+        self.wakes += 1
+        start = ticks_ms()
+        count = 0
+        while (count < self.windowGroups and ticks_diff(ticks_ms(), start) < self.windowTimeout):
+            if (self.scheduler.poll()):
+                count += 1
+                trigger = self.check() if self.radio.decodeGroup() >= 0 else None
+                if (trigger is not None):
+                    self.groups += count
+                    return trigger
+                if (count == self.windowGroups): break
+            self.sleep(min(self.scheduler.waitMs(), self.windowTimeout))
+        self.groups += count
+        return None
+
+    def run(self, maxTime = 0):
+        # Monitor muted until a trigger (returned) or maxTime ms (None)
+        radio = self.radio
+        radio.setMute(1)
+        start  = ticks_ms()
+        minute = start
+        trigger = None
+        while (maxTime == 0 or ticks_diff(ticks_ms(), start) < maxTime):
+            wakeStart = ticks_ms()
+            slept = self.slept
+            trigger = self.window()
+            if (trigger is None):
+                # Sleep whole group periods so the next window starts at a group
+                periods = self.interval * 1000 // self.scheduler.period
+                self.scheduler.skip(periods)
+                self.sleep(self.scheduler.waitMs() if self.scheduler.state == LOCKED else self.interval)
+            now = ticks_ms()
+            self.account(ticks_diff(now, wakeStart) - (self.slept - slept))
+            if (ticks_diff(now, minute) >= 60000):
+                minute = now
+                self.minuteIndex = (self.minuteIndex + 1) % self.minutes
+                self.awakeHistory[self.minuteIndex] = 0
+            if (trigger is not None): break
+        self.onTrigger(trigger)
+        return trigger
+
+    def account(self, awake):
+        self.awake += awake
+        self.awakeHistory[self.minuteIndex] = min(self.awakeHistory[self.minuteIndex] + awake, 65535)
+
+    def onTrigger(self, trigger):
+        # Announcements and alarms are to be heard
+        if (trigger in ("TA", "ALARM")): self.radio.setMute(0)
+
+    def awakePerMinute(self):
+        # Mean awake ms per minute since start
+        total = self.awake + self.slept
+        return self.awake * 60000 // total if total else 0
+
+    def groupsPerWake(self):
+        return self.groups / self.wakes if self.wakes else 0
+
+    def printReport(self):
+        total = self.awake + self.slept
+        print ("Monitor    : " + str(self.wakes) + " wakes, " + ("%.1f" % self.groupsPerWake()) + " groups/wake, awake " +
+               str(self.awake) + " of " + str(total) + " ms (" + str(self.awakePerMinute()) + " ms/min, duty " +
+               ("%.1f" % (self.awake * 100 / total if total else 0)) + " %)")
+        print ("Triggers   : " + ", ".join([trigger + ": " + str(self.triggerCount[trigger]) for trigger in TRIGGERS]))
+        history = [self.awakeHistory[(self.minuteIndex + 1 + i) % self.minutes] for i in range(self.minutes)]
+        print ("Awake ms/min (oldest first): " + " ".join([str(ms) for ms in history if ms]))
@@ -0,0 +1,217 @@
+# (c) 2024 SA6HBR
+#
+# Open Data Applications
+# EN50067_RDS_Standard.pdf 3.1.4.2 Open Data Applications and 3.1.5.4 Type 3A groups
+#
+# A 3A group announces an application: AID (block D), the group type that carries its data
+# (block B bit 4:0, the same code as B >> 11 of the data group) and 16 message bits (block C).
+# The registry keeps one decoder per announced AID and routes the data groups to it by
+# replacing the entry of that group code in the decoder table of rdsDecoder, so dispatch stays O(1).
+#
+# New applications:
+#   class myApp(odaDecoder):
+#       name = "My app"
+#       def group(self, B, C, D, silent): ...
+#   registerDecoder(0x1234, myApp)
+# or by name, imported at the first announcement so an unused decoder costs no RAM:
+#   registerDecoder(0x1234, "imports.myModule.myApp")
+#
+# 8A is TMC by definition (3.1.5.12), its groups are decoded even before a 3A announcement.
+#
+
+from imports.rdsDecoder import GROUPNAME, rdsText, importName
+
+# Group codes that may carry ODA data: 3B, 4B, 5A-9B, 10B, 11A-13B
+ODA_GROUPS = (7, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 23, 24, 25, 26, 27)
+
+AID_NAME = {
+    0x4BD7: "RadioText+",
+    0x4BD8: "RadioText+ for eRT",
+    0x6552: "Enhanced RadioText",
+    0xCD46: "TMC ALERT-C",
+    0xCD47: "TMC ALERT-C",
+    0x0D45: "TMC test",
+    0xC737: "Utility messaging",
+    0xE911: "Emergency alert",
+}
+
+# AID -> decoder class, or "module.class" imported when first needed
+ODA_DECODERS = {}
+
+# Group code -> AID used when the group arrives before its 3A announcement
+DEFAULT_APP = {16: 0xCD46}
+
+def registerDecoder(AID, decoderClass):
+    ODA_DECODERS[AID] = decoderClass
+
+def decoderClass(AID):
+    decoder = ODA_DECODERS.get(AID)
+    if (isinstance(decoder, str)):
+        decoder = importName(decoder)
+        ODA_DECODERS[AID] = decoder
+    return decoder
+
+def odaGroup(rds, silent = 0):
+    # Entry in rds.groupDecoders of the group types routed to an application
+    rds.getOda().decode(rds.blocks[rds.RDSB] >> 11, silent)
+
+class odaDecoder():
+
+    name = "ODA"
+
+    def __init__(self, rds, AID):
+        self.rds     = rds
+        self.AID     = AID
+        self.groups  = 0
+
+    def message(self, message, silent):
+        # The 16 message bits of the 3A group
+        pass
+
+    def group(self, B, C, D, silent):
+        # A data group, B/C/D as received
+        pass
+
+    def summary(self):
+        return ""
+
+class odaRegistry():
+
+    def __init__(self, rds):
+        self.rds      = rds
+        self.apps     = {}           # AID -> decoder or None when unknown
+        self.groupApp = [None] * 32  # group code -> decoder
+        self.replaced = {}           # group code -> decoder it replaced in rds.groupDecoders
+        self.announcements = 0
+
+    def clear(self):
+        # New station: forget the applications and give the group codes back
+        for groupCode in self.replaced:
+            self.rds.groupDecoders[groupCode] = self.replaced[groupCode]
+        self.replaced = {}
+        self.apps     = {}
+        for i in range(32): self.groupApp[i] = None
+
+    def announce(self, AID, groupCode, message, silent = 1):
+        self.announcements += 1
+        app = self.bind(AID, groupCode)
+        if (app is not None): app.message(message, silent)
+
+    def bind(self, AID, groupCode):
+        # Decoder for AID, and route groupCode to it
+        app = self.apps.get(AID)
+        if (app is None and AID not in self.apps):
+            decoder = decoderClass(AID)
+            if (decoder is not None): app = decoder(self.rds, AID)
+            self.apps[AID] = app
+        if (app is None): return None
+        if (groupCode in ODA_GROUPS and self.groupApp[groupCode] is not app):
+            if (groupCode not in self.replaced): self.replaced[groupCode] = self.rds.groupDecoders[groupCode]
+            self.groupApp[groupCode] = app
+            self.rds.groupDecoders[groupCode] = odaGroup
+            # From now on its groups skip the repeat cache, see rdsDecoder.feed
+        return app
+
+    def decode(self, groupCode, silent = 1):
+        app = self.groupApp[groupCode]
+        if (app is None and groupCode in DEFAULT_APP): app = self.bind(DEFAULT_APP[groupCode], groupCode)
+        if (app is None): return
+        blocks = self.rds.blocks
+        app.groups += 1
+        if (silent == 0):
+            print()
+            print ("Open data " + GROUPNAME[groupCode] + " : " + app.name)
+        app.group(blocks[self.rds.RDSB], blocks[self.rds.RDSC], blocks[self.rds.RDSD], silent)
+
+    def app(self, AID):
+        return self.apps.get(AID)
+
+    def printApplications(self):
+        if (not self.apps):
+            print ("No open data applications announced")
+            return
+        for AID in self.apps:
+            app = self.apps[AID]
+            groups = [GROUPNAME[code] for code in range(32) if self.groupApp[code] is app and app is not None]
+            print (hex(AID) + " " + AID_NAME.get(AID, "unknown") + " in " + (", ".join(groups) if groups else "-") +
+                   ((", groups: " + str(app.groups) + " " + app.summary()) if app is not None else ""))
+
+# RadioText+, content types 0 - 63
+RTPLUS_TYPE = (
+    "DUMMY", "ITEM.TITLE", "ITEM.ALBUM", "ITEM.TRACKNUMBER", "ITEM.ARTIST", "ITEM.COMPOSITION", "ITEM.MOVEMENT", "ITEM.CONDUCTOR",
+    "ITEM.COMPOSER", "ITEM.BAND", "ITEM.COMMENT", "ITEM.GENRE", "INFO.NEWS", "INFO.NEWS.LOCAL", "INFO.STOCKMARKET", "INFO.SPORT",
+    "INFO.LOTTERY", "INFO.HOROSCOPE", "INFO.DAILY_DIVERSION", "INFO.HEALTH", "INFO.EVENT", "INFO.SCENE", "INFO.CINEMA", "INFO.STUPIDITY_MACHINE",
+    "INFO.DATE_TIME", "INFO.WEATHER", "INFO.TRAFFIC", "INFO.ALARM", "INFO.ADVERTISEMENT", "INFO.URL", "INFO.OTHER", "STATIONNAME.SHORT",
+    "STATIONNAME.LONG", "PROGRAMME.NOW", "PROGRAMME.NEXT", "PROGRAMME.PART", "PROGRAMME.HOST", "PROGRAMME.EDITORIAL_STAFF", "PROGRAMME.FREQUENCY", "PROGRAMME.HOMEPAGE",
+    "PROGRAMME.SUBCHANNEL", "PHONE.HOTLINE", "PHONE.STUDIO", "PHONE.OTHER", "SMS.STUDIO", "SMS.OTHER", "EMAIL.HOTLINE", "EMAIL.STUDIO",
+    "EMAIL.OTHER", "MMS.OTHER", "CHAT", "CHAT.CENTRE", "VOTE.QUESTION", "VOTE.CENTRE", "RFU", "RFU",
+    "PRIVATE", "PRIVATE", "PRIVATE", "PLACE", "APPOINTMENT", "IDENTIFIER", "PURCHASE", "GET_DATA",
+)
+
+class rtPlus(odaDecoder):
+    # RadioText+ (AID 0x4BD7). Tags point into the RadioText: content type, start and extra length.
+    # Block B: item toggle b4, item running b3, type 1 bit 5:3 in b2:0
+    # Block C: type 1 bit 2:0 in b15:13, start 1 b12:7, length 1 b6:1, type 2 bit 5 in b0
+    # Block D: type 2 bit 4:0 in b15:11, start 2 b10:5, length 2 b4:0
+
+    name = "RadioText+"
+
+    def __init__(self, rds, AID):
+        super().__init__(rds, AID)
+        self.itemToggle  = -1
+        self.itemRunning = 0
+        self.template    = 0
+        self.tags = {}  # content type -> (start, length)
+
+    def message(self, message, silent):
+        # 3A message: CB b12, SCB b11:8, template number b7:0
+        self.template = message & 0b0000000011111111
+
+    def group(self, B, C, D, silent):
+        ItemToggle_Mask   = 0b0000000000010000
+        ItemToggle_Offset = 4
+        ItemRunning_Mask  = 0b0000000000001000
+        ItemRunning_Offset= 3
+
+        itemToggle = (B & ItemToggle_Mask) >> ItemToggle_Offset
+        self.itemRunning = (B & ItemRunning_Mask) >> ItemRunning_Offset
+        if (itemToggle != self.itemToggle):
+            # A new item, the ITEM.* tags of the old one are no longer valid
+            for contentType in [t for t in self.tags if 1 <= t <= 11]: del self.tags[contentType]
+            self.itemToggle = itemToggle
+
+        type1  = ((B & 0b111) << 3) | (C >> 13)
+        start1 = (C >> 7) & 0b111111
+        len1   = (C >> 1) & 0b111111
+        type2  = ((C & 0b1) << 5) | (D >> 11)
+        start2 = (D >> 5) & 0b111111
+        len2   = D & 0b11111
+        if (type1): self.tags[type1] = (start1, len1)
+        if (type2): self.tags[type2] = (start2, len2)
+
+        if (silent == 0):
+            print ("Item running: " + str(self.itemRunning) + ", toggle: " + str(itemToggle))
+            for contentType, start, length in ((type1, start1, len1), (type2, start2, len2)):
+                if (contentType): print (RTPLUS_TYPE[contentType] + " : " + self.tagText(start, length))
+
+    def radioText(self):
+        rds = self.rds
+        return rds.RadioTextB if rds.RadioTextFlag else rds.RadioTextA
+
+    def tagText(self, start, length):
+        return rdsText(self.radioText()[start:start + length + 1]).strip()
+
+    def getTags(self):
+        # {content type name: text} from the current RadioText
+        tags = {}
+        for contentType in self.tags:
+            start, length = self.tags[contentType]
+            tags[RTPLUS_TYPE[contentType]] = self.tagText(start, length)
+        return tags
+
+    def summary(self):
+        return ", ".join([name + ": " + text for name, text in self.getTags().items()])
+
+registerDecoder(0x4BD7, rtPlus)
+registerDecoder(0xCD46, "imports.rdsTmc.tmcDecoder")
+registerDecoder(0xCD47, "imports.rdsTmc.tmcDecoder")
@@ -0,0 +1,127 @@
+# (c) 2024 SA6HBR
+#
+# Preset bank
+# A preset is channel, PI, PTY and PS, 14 bytes in presets.db. Recall tunes directly, shows
+# the stored name at once and then checks the PI of the first live group. When the PI is
+# wrong (or nothing is heard) the station's AF list is tried: the one from the station
+# database if attached, otherwise the one the radio has collected.
+#
+# Usage:
+#   presets = presetBank()
+#   presets.store(1, radio)
+#   presets.recall(1, radio)
+#
+
+import struct
+from imports.rdsTime import ticks_ms, ticks_diff
+from imports.rdsDecoder import rdsText
+
+PRESET_FORMAT = "<HHB8sx"
+PRESET_SIZE   = struct.calcsize(PRESET_FORMAT) # 14
+
+class presetBank():
+
+    verifyTime = 1500 # ms to wait for a group with the preset's PI
+
+    def __init__(self, path = "presets.db", size = 10):
+        self.path     = path
+        self.size     = size
+        self.presets  = [None] * size  # (channel, PI, PTY, PS)
+        self.recalls  = 0
+        self.fallbacks= 0
+        self.lastTune = 0   # ms, tune only
+        self.lastShow = 0   # ms, from recall to name shown
+        self.lastVerify = 0 # ms, from recall to PI verified
+        self.tuneSum  = 0
+        self.showSum  = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        for i in range(min(self.size, len(data) // PRESET_SIZE)):
+            channel, PI, PTY, PS = struct.unpack_from(PRESET_FORMAT, data, i * PRESET_SIZE)
+            if (channel): self.presets[i] = (channel, PI, PTY, PS)
+
+    def save(self):
+        data = bytearray(self.size * PRESET_SIZE)
+        for i in range(self.size):
+            if (self.presets[i] is not None): struct.pack_into(PRESET_FORMAT, data, i * PRESET_SIZE, *self.presets[i])
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def store(self, n, radio):
+        if (n < 0 or n >= self.size): return 0
+        radio.readRadioRegisters()
+        self.presets[n] = (radio.CHANNEL, radio.rds.getPI(), radio.rds.PTY, bytes(radio.rds.ProgrammeService))
+        self.save()
+        print ("Preset " + str(n) + " : " + str(radio.CHANNEL / 10) + " MHz " + rdsText(radio.rds.ProgrammeService))
+        return 1
+
+    def verify(self, radio, PI):
+        # 1 when a live group with PI arrives within verifyTime
+        startTime = ticks_ms()
+        while (ticks_diff(ticks_ms(), startTime) < self.verifyTime):
+            if (radio.waitRDS(self.verifyTime) == radio.HIGH):
+                radio.decodeGroup()
+                return radio.radioRegister[radio.RDSA] == PI
+        return 0
+
+    def recall(self, n, radio):
+        if (n < 0 or n >= self.size or self.presets[n] is None):
+            print ("Preset " + str(n) + " is empty")
+            return 0
+        channel, PI, PTY, PS = self.presets[n]
+        startTime = ticks_ms()
+        radio.setChannel(channel)
+        self.lastTune = ticks_diff(ticks_ms(), startTime)
+        if (PI != 0 and 0 in radio.rds.ProgrammeService and 0 not in PS):
+            # No station database or an unknown station, show the preset's name. It belongs to PI,
+            # the first live group of another PI throws it away before it can be remembered.
+            radio.rds.ProgrammeService[0:8] = PS
+            radio.rds.PTY = PTY
+            radio.stationPI = PI
+        self.lastShow = ticks_diff(ticks_ms(), startTime)
+        print ("Preset " + str(n) + " : " + str(channel / 10) + " MHz " + rdsText(radio.rds.ProgrammeService))
+        self.recalls += 1
+        self.tuneSum += self.lastTune
+        self.showSum += self.lastShow
+
+        ok = PI == 0 or self.verify(radio, PI)
+        if (not ok):
+            ok = self.fallback(n, radio)
+        self.lastVerify = ticks_diff(ticks_ms(), startTime)
+        print ("Tune: " + str(self.lastTune) + " ms, name shown: " + str(self.lastShow) + " ms, " +
+               ("PI verified" if ok else "PI not found") + ": " + str(self.lastVerify) + " ms")
+        return ok
+
+    def fallback(self, n, radio):
+        # The preset PI is not on its channel, try the alternative frequencies of that PI
+        channel, PI, PTY, PS = self.presets[n]
+        AF = []
+        if (radio.stationDb is not None):
+            info = radio.stationDb.lookupPI(PI)
+            if (info is not None): AF = info.AF + [info.channel]
+        if (not AF): AF = radio.rds.getAltFreqs()
+        for alt in AF:
+            if (alt == channel): continue
+            radio.setChannel(alt)
+            if (self.verify(radio, PI)):
+                self.fallbacks += 1
+                self.presets[n] = (alt, PI, PTY, PS)
+                self.save()
+                print ("Preset " + str(n) + " moved to " + str(alt / 10) + " MHz")
+                return 1
+        return 0
+
+    def printPresets(self):
+        for i in range(self.size):
+            if (self.presets[i] is None): continue
+            channel, PI, PTY, PS = self.presets[i]
+            print (str(i) + " : " + ("  " + str(channel / 10))[-5:] + " MHz " + ("%04X" % PI) + " " + rdsText(PS))
+        if (self.recalls):
+            print ("Recalls: " + str(self.recalls) + ", mean tune: " + str(self.tuneSum // self.recalls) + " ms, mean name shown: " +
+                   str(self.showSum // self.recalls) + " ms, AF fallbacks: " + str(self.fallbacks))
@@ -0,0 +1,200 @@
+# (c) 2024 SA6HBR
+#
+# Opt-in profiler for the driver
+# enable() replaces the rdsRadio methods in OPERATIONS with timed wrappers, and the entries of
+# the group decoders (radio.rds) with wrappers named after the group type, also those first loaded
+# while profiling. disable() puts the originals back. Nothing is patched while disabled, so it costs nothing then.
+#
+# Per operation: calls, total/max us (ticks_us, inclusive of nested operations), heap bytes
+# allocated (gc.mem_alloc delta, a collection during the call counts as 0) and a histogram:
+#   bucket 0 : < 16 us,  bucket n : 2^(n+3) .. 2^(n+4) us,  bucket 15 : >= 262 ms
+# print in the driver and decoder modules (rdsDecoder.PRINT_MODULES) is timed as "print".
+#
+# Binary dump, little endian:
+#   "RPRF" version u8 operations u8
+#   per operation: name length u8, name, count u32, total us u32, max us u32, alloc u32, 16 x u32 buckets
+#
+# Usage:
+#   profiler = rdsProfiler(radio)
+#   profiler.enable()
+#   ...
+#   profiler.disable()
+#   profiler.printTable()
+#   blob = profiler.dump()   # unpackProfile(blob) on the host
+#
+
+import gc
+import struct
+from array import array
+from imports.rdsTime import ticks_us, ticks_diff
+import imports.rdsDecoder as decoder
+
+OPERATIONS = ("readRadioRegisters", "writeRadioRegisters", "readStatusRSSI", "setChannel", "radioSeek", "decodeGroup")
+
+BUCKETS        = 16
+PROFILE_MAGIC  = b"RPRF"
+PROFILE_HEADER = "<4sBB"
+PROFILE_RECORD = "<IIII" + str(BUCKETS) + "I"
+
+try:
+    mem_alloc = gc.mem_alloc
+except AttributeError:
+    mem_alloc = lambda: 0 # CPython
+
+def bucket(us):
+    us >>= 4
+    n = 0
+    while (us and n < BUCKETS - 1):
+        us >>= 1
+        n += 1
+    return n
+
+def bucketLimit(n):
+    # Upper edge of bucket n in us
+    return 1 << (n + 4)
+
+class opStats():
+
+    def __init__(self, name):
+        self.name  = name
+        self.count = 0
+        self.total = 0
+        self.max   = 0
+        self.alloc = 0
+        self.histogram = array('L', [0] * BUCKETS)
+
+    def add(self, us, alloc):
+        self.count += 1
+        self.total += us
+        if (us > self.max): self.max = us
+        if (alloc > 0): self.alloc += alloc
+        self.histogram[bucket(us)] += 1
+
+    def percentile(self, p):
+        # Upper edge of the bucket holding the p:th percentile
+        if (self.count == 0): return 0
+        limit = self.count * p // 100
+        seen = 0
+        for n in range(BUCKETS):
+            seen += self.histogram[n]
+            if (seen > limit): return bucketLimit(n)
+        return bucketLimit(BUCKETS - 1)
+
+def timed(stats, function):
+    def wrapper(*args, **kwargs):
+        alloc = mem_alloc()
+        start = ticks_us()
+        result = function(*args, **kwargs)
+        stats.add(ticks_diff(ticks_us(), start), mem_alloc() - alloc)
+        return result
+    return wrapper
+
+class rdsProfiler():
+
+    def __init__(self, radio, operations = OPERATIONS):
+        self.radio      = radio
+        self.operations = operations
+        self.stats      = {}
+        self.methods    = {}    # name -> original class attribute
+        self.decoders   = None  # original decoder table
+        self.wrappers   = None  # wrapped decoder table
+        self.enabled    = 0
+
+    def get(self, name):
+        stats = self.stats.get(name)
+        if (stats is None):
+            stats = opStats(name)
+            self.stats[name] = stats
+        return stats
+
+    def enable(self):
+        if (self.enabled): return
+        cls = type(self.radio)
+        for name in self.operations:
+            self.methods[name] = getattr(cls, name)
+            setattr(cls, name, timed(self.get(name), self.methods[name]))
+        # Wrap the table entries themselves, None is a decoder not loaded yet
+        table = self.radio.rds.groupDecoders
+        self.decoders = list(table)
+        for groupCode in range(len(table)):
+            if (table[groupCode] is not None):
+                table[groupCode] = timed(self.get("group" + decoder.GROUPNAME[groupCode]), table[groupCode])
+        self.wrappers = list(table)
+        self.radio.rds.loadHook = self.loaded
+        decoder.setPrint(timed(self.get("print"), print))
+        self.enabled = 1
+
+    def loaded(self, groupCode, function):
+        # rds.loadHook while enabled, a decoder loaded now is timed as well
+        self.decoders[groupCode] = function
+        self.wrappers[groupCode] = timed(self.get("group" + decoder.GROUPNAME[groupCode]), function)
+        return self.wrappers[groupCode]
+
+    def disable(self):
+        if (not self.enabled): return
+        cls = type(self.radio)
+        for name in self.methods: setattr(cls, name, self.methods[name])
+        self.methods = {}
+        self.radio.rds.loadHook = None
+        table = self.radio.rds.groupDecoders
+        for groupCode in range(len(table)):
+            # An ODA bound while profiling replaced its entry, keep that one
+            if (table[groupCode] is self.wrappers[groupCode]): table[groupCode] = self.decoders[groupCode]
+        self.decoders = None
+        self.wrappers = None
+        decoder.setPrint(None)
+        self.enabled = 0
+
+    def clear(self):
+        self.stats = {}
+        if (self.enabled):
+            self.disable()
+            self.enable()
+
+    def byTotal(self):
+        # Most total time first
+        return sorted(self.stats.values(), key = lambda stats: -stats.total)
+
+    def printTable(self):
+        print ("Operation              calls   mean us    max us    p50    p90    p99  alloc/call")
+        for stats in self.byTotal():
+            if (stats.count == 0): continue
+            print ((stats.name + " " * 20)[:20] + ("          " + str(stats.count))[-8:] + ("          " + str(stats.total // stats.count))[-10:] +
+                   ("          " + str(stats.max))[-10:] + ("       " + str(stats.percentile(50)))[-7:] +
+                   ("       " + str(stats.percentile(90)))[-7:] + ("       " + str(stats.percentile(99)))[-7:] +
+                   ("            " + str(stats.alloc // stats.count))[-12:])
+
+    def printHistogram(self, name):
+        stats = self.stats.get(name)
+        if (stats is None): return
+        print (name + ", " + str(stats.count) + " calls")
+        for n in range(BUCKETS):
+            if (stats.histogram[n]):
+                print (("        <" + str(bucketLimit(n)))[-9:] + " us " + ("      " + str(stats.histogram[n]))[-7:] + " " +
+                       "#" * (stats.histogram[n] * 40 // stats.count))
+
+    def dump(self):
+        stats = [stats for stats in self.byTotal() if stats.count]
+        blob = bytearray(struct.pack(PROFILE_HEADER, PROFILE_MAGIC, 1, len(stats)))
+        for s in stats:
+            name = s.name.encode()
+            blob += bytes((len(name),)) + name
+            blob += struct.pack(PROFILE_RECORD, s.count, s.total & 0xFFFFFFFF, s.max & 0xFFFFFFFF, s.alloc & 0xFFFFFFFF, *s.histogram)
+        return bytes(blob)
+
+def unpackProfile(blob):
+    # Blob from dump() -> [opStats]
+    magic, version, count = struct.unpack_from(PROFILE_HEADER, blob)
+    if (magic != PROFILE_MAGIC): raise ValueError("Not a profile dump")
+    offset = struct.calcsize(PROFILE_HEADER)
+    result = []
+    for i in range(count):
+        length = blob[offset]
+        stats  = opStats(bytes(blob[offset + 1:offset + 1 + length]).decode())
+        offset += 1 + length
+        values = struct.unpack_from(PROFILE_RECORD, blob, offset)
+        offset += struct.calcsize(PROFILE_RECORD)
+        stats.count, stats.total, stats.max, stats.alloc = values[:4]
+        for n in range(BUCKETS): stats.histogram[n] = values[4 + n]
+        result.append(stats)
+    return result
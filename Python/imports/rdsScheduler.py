@@ -0,0 +1,156 @@
+# (c) 2024 SA6HBR
+#
+# Group-rate locked RDS polling, for boards without GPIO2 connected
+# A group is 104 bits at 1187.5 bit/s, so RDSR rises every 87.6 ms. Instead of reading on a
+# free running timer, the scheduler locks its phase to the observed RDSR transitions and
+# reads STATUSRSSI (2 bytes) just after each expected arrival. Only when RDSR is set are
+# all registers read.
+#
+#   ACQUIRE : no phase yet, poll every acquireInterval
+#   LOCKED  : poll at the expected arrival + guard, retry every retryInterval when it is late.
+#             A group found on the first poll pulls the phase earlier by earlyStep, a late
+#             one corrects it by gain * error. It settles where most first polls hit.
+#   NOSYNC  : RDSS low, poll interval doubles up to maxBackoff until sync returns
+#
+# Usage:
+#   scheduler = groupScheduler(radio)
+#   while True:
+#       if (scheduler.poll()): radio.decodeGroup()
+#       sleep_ms(scheduler.waitMs())
+#
+
+from imports.rdsTime import ticks_ms, ticks_us, ticks_diff, ticks_add, sleep_ms
+
+ACQUIRE = 0
+LOCKED  = 1
+NOSYNC  = 2
+STATENAME = ("acquire", "locked", "no sync")
+
+class groupScheduler():
+
+    period          = 87600  # us, 104 bits / 1187.5 bit/s
+    guard           = 2000   # us after the expected arrival before the first poll
+    retryInterval   = 4000   # us between polls when the group is late
+    maxRetries      = 8      # late polls before the lock is dropped
+    acquireInterval = 10000  # us between polls without a lock
+    earlyStep       = 500    # us the phase moves earlier for each first poll hit
+    gainShift       = 2      # phase correction = error >> gainShift
+    maxBackoff      = 1000000 # us between polls without RDS sync
+
+    RDSS_Mask = 0b0000100000000000
+
+    def __init__(self, radio):
+        self.radio = radio
+        self.polls       = 0
+        self.groups      = 0
+        self.missed      = 0  # estimated from the gaps between read groups
+        self.locks       = 0
+        self.syncLost    = 0
+        self.errorSum    = 0  # |phase error| of late groups, us
+        self.errorCount  = 0
+        self.reset()
+
+    def reset(self):
+        # After a tune or seek, find the phase again
+        now = ticks_us()
+        self.state       = ACQUIRE
+        self.nextPoll    = now
+        self.lastPoll    = now
+        self.expected    = now
+        self.lastArrival = None
+        self.retries     = 0
+        self.backoff     = self.period
+
+    def poll(self):
+        # Non-blocking, returns 1 when a new group has been read into the radio registers
+        now = ticks_us()
+        if (ticks_diff(now, self.nextPoll) < 0): return 0
+        self.polls += 1
+        status = self.radio.readStatusRSSI()
+
+        if (not (status & self.RDSS_Mask)):
+            if (self.state != NOSYNC):
+                self.state   = NOSYNC
+                self.backoff = self.period
+                self.syncLost += 1
+            else:
+                self.backoff = min(self.backoff * 2, self.maxBackoff)
+            self.lastArrival = None
+            self.lastPoll = now
+            self.nextPoll = ticks_add(now, self.backoff)
+            return 0
+        if (self.state == NOSYNC): self.state = ACQUIRE
+
+        if (not self.radio.newGroup(status)):
+            # No group, or RDSR still set from one already read
+            if (self.state == LOCKED):
+                self.retries += 1
+                if (self.retries > self.maxRetries):
+                    self.state = ACQUIRE
+                self.nextPoll = ticks_add(now, self.retryInterval)
+            else:
+                self.nextPoll = ticks_add(now, self.acquireInterval)
+            self.lastPoll = now
+            return 0
+
+        # New group
+        self.radio.readRadioRegisters()
+        self.groups += 1
+        if (self.state == LOCKED):
+            if (self.retries == 0):
+                # Already there at the first poll, the arrival could be earlier than we think
+                arrival = ticks_add(self.expected, -self.earlyStep)
+            else:
+                # Arrived between the last two polls
+                error = ticks_diff(ticks_add(self.lastPoll, ticks_diff(now, self.lastPoll) // 2), self.expected)
+                self.errorSum   += abs(error)
+                self.errorCount += 1
+                arrival = ticks_add(self.expected, error >> self.gainShift if error >= 0 else -((-error) >> self.gainShift))
+        else:
+            arrival = ticks_add(self.lastPoll, ticks_diff(now, self.lastPoll) // 2)
+            self.state = LOCKED
+            self.locks += 1
+
+        if (self.lastArrival is not None):
+            gaps = (ticks_diff(arrival, self.lastArrival) + self.period // 2) // self.period
+            if (gaps > 1): self.missed += gaps - 1
+        self.lastArrival = arrival
+        self.expected = ticks_add(arrival, self.period)
+        # A group that was very late must not make the next poll come before now
+        while (ticks_diff(self.expected, now) < 0): self.expected = ticks_add(self.expected, self.period)
+        self.nextPoll = ticks_add(self.expected, self.guard)
+        self.retries  = 0
+        self.lastPoll = now
+        return 1
+
+    def skip(self, periods):
+        # Keep the phase over a pause of whole group periods, e.g. while the MCU sleeps.
+        # The next poll is at the expected arrival after the pause.
+        if (self.state != LOCKED): return
+        self.expected    = ticks_add(self.expected, periods * self.period)
+        self.nextPoll    = ticks_add(self.expected, self.guard)
+        self.lastArrival = None
+        self.retries     = 0
+
+    def waitMs(self):
+        # ms until the next poll is due
+        wait = ticks_diff(self.nextPoll, ticks_us()) // 1000
+        return wait if wait > 0 else 0
+
+    def run(self, maxTime = 10000, decode = 1):
+        startTime = ticks_ms()
+        while (ticks_diff(ticks_ms(), startTime) < maxTime):
+            if (self.poll() and decode): self.radio.decodeGroup()
+            wait = self.waitMs()
+            if (wait > 0): sleep_ms(wait)
+
+    def getStats(self):
+        # (state, polls, groups, missed, polls per group x100, mean phase error us)
+        return (STATENAME[self.state], self.polls, self.groups, self.missed,
+                self.polls * 100 // self.groups if self.groups else 0,
+                self.errorSum // self.errorCount if self.errorCount else 0)
+
+    def printStats(self):
+        state, polls, groups, missed, pollsPerGroup, meanError = self.getStats()
+        print ("Scheduler  : " + state + ", polls: " + str(polls) + ", groups: " + str(groups) + ", missed: " + str(missed) +
+               ", polls/group: " + str(pollsPerGroup / 100) + ", phase error: " + str(meanError) + " us, sync lost: " + str(self.syncLost))
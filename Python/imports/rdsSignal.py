@@ -0,0 +1,146 @@
+# (c) 2024 SA6HBR
+#
+# Signal quality sampler
+# Reads only STATUSRSSI (2 bytes) at a fixed rate and keeps:
+#   - the last `size` raw samples in a ring: AFCRL (bit 12), ST (bit 8) and RSSI (bit 7:0)
+#   - decimated buckets of `bucket` samples: min/max/mean RSSI, stereo % and AFC rail count
+# All arrays are allocated once, long runs do not grow the heap.
+#
+# When a sample shows a new group (RDSR went 0 -> 1, radio.newGroup) the full register set is
+# read and the group decoded once, so RDS keeps flowing while sampling. RDSR stays set for
+# about 40 ms, the samples after the first one do not touch the group.
+#
+# Usage:
+#   sampler = signalSampler(radio, 200)   # 200 Hz
+#   sampler.run(60000)
+#   sampler.printHistory()
+#
+
+import time
+from array import array
+
+class signalSampler():
+
+    SAMPLE_MASK = 0b0001000111111111 # AFCRL, ST, RSSI
+
+    def __init__(self, radio, rate = 200, size = 1024, bucket = 100, buckets = 240):
+        self.radio    = radio
+        self.period   = 1000000 // rate # us
+        self.size     = size
+        self.bucket   = bucket
+        self.buckets  = buckets
+
+        # Raw ring
+        self.samples  = array('H', [0] * size)
+        self.index    = 0
+        self.count    = 0
+
+        # Decimated ring
+        self.bucketMin    = bytearray(buckets)
+        self.bucketMax    = bytearray(buckets)
+        self.bucketMean   = bytearray(buckets)
+        self.bucketStereo = bytearray(buckets) # % of samples with ST
+        self.bucketAfcRail= bytearray(buckets) # samples with AFCRL, max 255
+        self.bucketIndex  = 0
+        self.bucketCount  = 0
+
+        # Running bucket
+        self.runMin    = 255
+        self.runMax    = 0
+        self.runSum    = 0
+        self.runStereo = 0
+        self.runAfc    = 0
+        self.runCount  = 0
+
+        self.nextSample   = time.ticks_us()
+        self.lateCount    = 0
+        self.groupCount   = 0
+
+    def poll(self, decodeRDS = 1):
+        # Take a sample if it is due, returns 1 when a sample was taken
+        now = time.ticks_us()
+        if (time.ticks_diff(now, self.nextSample) < 0): return 0
+        self.nextSample = time.ticks_add(self.nextSample, self.period)
+        if (time.ticks_diff(now, self.nextSample) > 0):
+            # More than one period behind, skip ahead instead of bursting
+            self.lateCount += 1
+            self.nextSample = time.ticks_add(now, self.period)
+
+        status = self.radio.readStatusRSSI()
+        self.addSample(status & self.SAMPLE_MASK)
+
+        if (self.radio.newGroup(status) and decodeRDS):
+            self.radio.readRadioRegisters()
+            self.radio.decodeGroup()
+            self.groupCount += 1
+        return 1
+
+    def addSample(self, sample):
+        self.samples[self.index] = sample
+        self.index += 1
+        if (self.index == self.size): self.index = 0
+        if (self.count < self.size): self.count += 1
+
+        RSSI = sample & 0xFF
+        if (RSSI < self.runMin): self.runMin = RSSI
+        if (RSSI > self.runMax): self.runMax = RSSI
+        self.runSum    += RSSI
+        self.runStereo += (sample >> 8) & 1
+        self.runAfc    += (sample >> 12) & 1
+        self.runCount  += 1
+        if (self.runCount == self.bucket): self.closeBucket()
+
+    def closeBucket(self):
+        i = self.bucketIndex
+        self.bucketMin[i]     = self.runMin
+        self.bucketMax[i]     = self.runMax
+        self.bucketMean[i]    = self.runSum // self.runCount
+        self.bucketStereo[i]  = self.runStereo * 100 // self.runCount
+        self.bucketAfcRail[i] = min(self.runAfc, 255)
+        self.bucketIndex += 1
+        if (self.bucketIndex == self.buckets): self.bucketIndex = 0
+        if (self.bucketCount < self.buckets): self.bucketCount += 1
+        self.runMin    = 255
+        self.runMax    = 0
+        self.runSum    = 0
+        self.runStereo = 0
+        self.runAfc    = 0
+        self.runCount  = 0
+
+    def run(self, maxTime = 10000, decodeRDS = 1):
+        startTime = time.ticks_ms()
+        self.nextSample = time.ticks_us()
+        while True:
+            if(time.ticks_diff(time.ticks_ms(), startTime) > maxTime) :break
+            if (self.poll(decodeRDS) == 0):
+                wait = time.ticks_diff(self.nextSample, time.ticks_us())
+                if (wait > 1000): time.sleep_us(wait - 500)
+
+    def lastSamples(self, n):
+        # The last n raw samples, oldest first
+        if (n > self.count): n = self.count
+        result = []
+        i = self.index - n
+        if (i < 0): i += self.size
+        for x in range(n):
+            result.append(self.samples[i])
+            i += 1
+            if (i == self.size): i = 0
+        return result
+
+    def history(self):
+        # Decimated buckets, oldest first: (min, max, mean, stereo %, afc rail)
+        result = []
+        i = self.bucketIndex - self.bucketCount
+        if (i < 0): i += self.buckets
+        for x in range(self.bucketCount):
+            result.append((self.bucketMin[i], self.bucketMax[i], self.bucketMean[i], self.bucketStereo[i], self.bucketAfcRail[i]))
+            i += 1
+            if (i == self.buckets): i = 0
+        return result
+
+    def printHistory(self):
+        print ("Bucket of " + str(self.bucket) + " samples at " + str(1000000 // self.period) + " Hz, late: " + str(self.lateCount) + ", RDS groups: " + str(self.groupCount))
+        print ("  min  max mean  ST% AFC")
+        for RSSImin, RSSImax, RSSImean, stereo, afcRail in self.history():
+            print (("    " + str(RSSImin))[-5:] + ("    " + str(RSSImax))[-5:] + ("    " + str(RSSImean))[-5:] + ("    " + str(stereo))[-5:] + ("    " + str(afcRail))[-4:])
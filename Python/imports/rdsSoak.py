@@ -0,0 +1,192 @@
+# (c) 2024 SA6HBR
+#
+# Scripted soak test of the main.py command set
+# A script is run over and over, each step timed. Per step: runs, failures, latency
+# percentiles (ms, log2 buckets as in imports/rdsProfile.py) and the heap high-water mark
+# (gc.mem_alloc right after the step, before any collection). After every iteration the heap
+# in use after a collection is sampled, its growth after the first iteration is a leak.
+#
+# One step per line, # starts a comment:
+#   command [argument] [xN] [<ms]
+#   xN  : run the step N times in a row
+#   <ms : the step fails when it takes longer. Wait steps (PS, group types) give up at this limit.
+#
+# Commands, as in main.py:
+#   PU, PD, 1, 2, +, -, 3, 4, 8   power up/down, seek down/up, volume, scan, one group, registers
+#   0A, 2A, 4A ...               wait for and decode a group of that type
+#   TUNE 1038                    setChannel
+#   PS                           wait until the programme service name is complete, a name
+#                                recalled from the station database counts
+#   RDS 2000                     decode groups for 2000 ms
+#   SLEEP 100                    wait 100 ms
+#
+# quiet = 1 silences print in the driver and the decoders (the scan of 3, the registers of 8,
+# group types printed) while running.
+#
+# Usage:
+#   soak = soakRunner(radio, SCRIPT)
+#   soak.run(1000)
+#   soak.printReport()
+#
+
+import gc
+from imports.rdsTime import ticks_ms, ticks_us, ticks_diff, sleep_ms
+from imports.rdsProfile import opStats
+from imports.rdsDecoder import GROUPNAME, setPrint
+
+try:
+    mem_alloc = gc.mem_alloc
+except AttributeError:
+    mem_alloc = lambda: 0 # CPython
+
+class soakStep():
+
+    def __init__(self, line):
+        words = line.upper().split()
+        self.text    = " ".join([word for word in words if word[0] not in "X<"])
+        self.command = words[0]
+        self.arg     = None
+        self.repeat  = 1
+        self.limit   = 0    # ms, 0 = no limit
+        for word in words[1:]:
+            if (word[0] == "X"): self.repeat = int(word[1:])
+            elif (word[0] == "<"): self.limit = int(word[1:])
+            else: self.arg = int(word)
+        self.stats     = opStats(self.text) # ms
+        self.fails     = 0
+        self.highWater = 0
+        self.total     = 0  # ms since the last report
+        self.count     = 0
+
+class soakRunner():
+
+    groupTimeout = 5000  # ms a wait step without a limit waits
+    reportEvery  = 100   # iterations between progress lines, 0 = none
+    maxFailLines = 20    # failures printed as they happen
+
+    def __init__(self, radio, script, quiet = 1):
+        self.radio = radio
+        self.steps = [soakStep(line.split("#")[0]) for line in script.split("\n") if line.split("#")[0].strip()]
+        self.quiet = quiet
+        self.iterations = 0
+        self.failLines  = 0
+        self.elapsed    = 0  # ms
+        self.heapFirst  = 0  # in use after a collection, after the first iteration
+        self.heapLast   = 0
+        self.heapMax    = 0
+        self.freeMin    = -1
+
+    def waitGroup(self, groupCode, maxTime):
+        # Decode groups until one of groupCode arrives (None = any), 1 when it did
+        radio = self.radio
+        start = ticks_ms()
+        while (ticks_diff(ticks_ms(), start) < maxTime):
+            if (radio.waitRDS(maxTime - ticks_diff(ticks_ms(), start)) == radio.HIGH):
+                if (radio.decodeGroup() == groupCode or groupCode is None): return 1
+        return 0
+
+    def execute(self, step):
+        # Run one step, 1 when it succeeded
+        radio   = self.radio
+        command = step.command
+        maxTime = step.limit if step.limit else self.groupTimeout
+        if   (command == "PU"): radio.powerUp()
+        elif (command == "PD"): radio.powerDown()
+        elif (command == "2"):  return 1 if radio.smartSeek(radio.HIGH) == radio.SEEK_OK else 0
+        elif (command == "1"):  return 1 if radio.smartSeek(radio.LOW) == radio.SEEK_OK else 0
+        elif (command == "+"):  radio.setVolume(radio.getVolume() + 1)
+        elif (command == "-"):  radio.setVolume(radio.getVolume() - 1)
+        elif (command == "3"):  return 1 if radio.getAllChannel() else 0
+        elif (command == "4"):  return self.waitGroup(None, 1000)
+        elif (command == "8"):  radio.viewRadioRegisters()
+        elif (command == "TUNE"):
+            radio.setChannel(step.arg)
+            return 1 if radio.CHANNEL == step.arg else 0
+        elif (command == "PS"):
+            start = ticks_ms()
+            while (0 in radio.rds.ProgrammeService):
+                if (not self.waitGroup(0, maxTime - ticks_diff(ticks_ms(), start))): return 0
+        elif (command == "RDS"):
+            start = ticks_ms()
+            while (ticks_diff(ticks_ms(), start) < step.arg): self.waitGroup(None, step.arg - ticks_diff(ticks_ms(), start))
+        elif (command == "SLEEP"): sleep_ms(step.arg)
+        elif (command in GROUPNAME): return self.waitGroup(GROUPNAME.index(command), maxTime)
+        else: raise ValueError("Unknown soak step: " + step.text)
+        return 1
+
+    def runStep(self, step):
+        start = ticks_us()
+        ok = self.execute(step)
+        ms = ticks_diff(ticks_us(), start) // 1000
+        alloc = mem_alloc()
+        step.stats.add(ms, 0)
+        step.total += ms
+        step.count += 1
+        if (alloc > step.highWater): step.highWater = alloc
+        if (step.limit and ms > step.limit): ok = 0
+        if (not ok):
+            step.fails += 1
+            if (self.failLines < self.maxFailLines):
+                self.failLines += 1
+                print ("Fail       : iteration " + str(self.iterations + 1) + ", " + step.text + ", " + str(ms) + " ms")
+
+    def iteration(self):
+        for step in self.steps:
+            for i in range(step.repeat): self.runStep(step)
+        self.iterations += 1
+        # Heap in use once the garbage is gone. The first iteration loads decoders and tables.
+        gc.collect()
+        self.heapLast = mem_alloc()
+        if (self.iterations == 1): self.heapFirst = self.heapLast
+        if (self.heapLast > self.heapMax): self.heapMax = self.heapLast
+        try:
+            free = gc.mem_free()
+            if (self.freeMin < 0 or free < self.freeMin): self.freeMin = free
+        except AttributeError:
+            pass
+
+    def run(self, iterations = 1000, maxTime = 0):
+        # iterations of the script, or until maxTime ms (0 = no limit). Ctrl-C stops early.
+        if (self.quiet): setPrint(lambda *args, **kwargs: None)
+        start = ticks_ms()
+        try:
+            while (self.iterations < iterations):
+                if (maxTime and ticks_diff(ticks_ms(), start) >= maxTime): break
+                self.iteration()
+                self.elapsed = ticks_diff(ticks_ms(), start)
+                if (self.reportEvery and self.iterations % self.reportEvery == 0): self.printProgress()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if (self.quiet): setPrint(None)
+            self.elapsed = ticks_diff(ticks_ms(), start)
+
+    def failures(self):
+        return sum([step.fails for step in self.steps])
+
+    def leakPerIteration(self):
+        # Bytes per iteration the heap grew after the first one
+        if (self.iterations < 2): return 0
+        return (self.heapLast - self.heapFirst) // (self.iterations - 1)
+
+    def printProgress(self):
+        # Mean ms per step since the last progress line, a slowdown shows up as a growing mean
+        print ("Iteration " + str(self.iterations) + ", " + str(self.elapsed // 1000) + " s, fails: " + str(self.failures()) +
+               ", heap: " + str(self.heapLast) + " (+" + str(self.heapLast - self.heapFirst) + "), ms/step: " +
+               ", ".join([step.text + " " + str(step.total // step.count) for step in self.steps if step.count]))
+        for step in self.steps:
+            step.total = 0
+            step.count = 0
+
+    def printReport(self):
+        print ("Soak       : " + str(self.iterations) + " iterations in " + str(self.elapsed // 1000) + " s, fails: " + str(self.failures()))
+        print ("Step                   runs  fails   mean ms    max ms    p50    p90    p99  high-water")
+        for step in self.steps:
+            stats = step.stats
+            if (stats.count == 0): continue
+            print ((step.text + " " * 20)[:20] + ("          " + str(stats.count))[-7:] + ("       " + str(step.fails))[-7:] +
+                   ("          " + str(stats.total // stats.count))[-10:] + ("          " + str(stats.max))[-10:] +
+                   ("       " + str(stats.percentile(50)))[-7:] + ("       " + str(stats.percentile(90)))[-7:] +
+                   ("       " + str(stats.percentile(99)))[-7:] + ("            " + str(step.highWater))[-12:])
+        print ("Heap       : after first iteration " + str(self.heapFirst) + ", last " + str(self.heapLast) + ", max " + str(self.heapMax) +
+               ", growth " + str(self.leakPerIteration()) + " bytes/iteration" + (", free low-water " + str(self.freeMin) if self.freeMin >= 0 else ""))
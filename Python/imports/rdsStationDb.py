@@ -0,0 +1,151 @@
+# (c) 2024 SA6HBR
+#
+# Station database on the Pico filesystem
+# One 48 byte record per station, slot n at offset n * 48:
+#   channel u16, PI u16, PTY u8, ECC u8, PS 8 bytes, AF count u8, AF codes 25 bytes,
+#   RSSI u8, last seen u32 (time.time()), flags u8, 2 spare
+# Only the two indexes (PI -> slot, channel -> slot) are kept in RAM, records are read from
+# flash when needed. Changed records wait in RAM and are written together when maxDirty
+# records have changed or the oldest change is flushDelay ms old, or on flush().
+#
+# Usage:
+#   radio.attachStationDb(stationDb("stations.db"))
+#   ... setChannel/radioSeek now restore a known station at once and store what was learned
+#
+
+import struct
+from imports.rdsTime import ticks_ms, ticks_diff
+
+RECORD_FORMAT = "<HHBB8sB25sBIBxx"
+RECORD_SIZE   = struct.calcsize(RECORD_FORMAT) # 48
+
+class stationInfo():
+
+    def __init__(self, channel, PI, PTY = 0, ECC = 0, PS = b"", AF = (), RSSI = 0, lastSeen = 0, flags = 0):
+        self.channel  = channel
+        self.PI       = PI
+        self.PTY      = PTY
+        self.ECC      = ECC
+        self.PS       = bytes(PS)[:8]
+        self.AF       = list(AF)[:25]   # channels
+        self.RSSI     = RSSI
+        self.lastSeen = lastSeen
+        self.flags    = flags
+
+    def pack(self):
+        AF = bytes([ch - 875 for ch in self.AF])
+        return struct.pack(RECORD_FORMAT, self.channel, self.PI, self.PTY, self.ECC, self.PS,
+                           len(AF), AF, self.RSSI, self.lastSeen, self.flags)
+
+def unpackStation(data):
+    channel, PI, PTY, ECC, PS, AFcount, AF, RSSI, lastSeen, flags = struct.unpack(RECORD_FORMAT, data)
+    return stationInfo(channel, PI, PTY, ECC, PS.rstrip(b"\x00"), [code + 875 for code in AF[:AFcount]], RSSI, lastSeen, flags)
+
+class stationDb():
+
+    flushDelay = 30000 # ms a change may wait in RAM
+    maxDirty   = 8     # changed records that force a write
+    seenInterval = 3600 # s, last seen alone is written at most this often
+
+    def __init__(self, path = "stations.db"):
+        self.path      = path
+        self.byPI      = {}
+        self.byChannel = {}
+        self.slots     = 0
+        self.dirty     = {}   # slot -> packed record not yet on flash
+        self.dirtyTime = 0
+        self.writes    = 0    # flash writes (flushes)
+        self.records   = 0    # records written
+        self.load()
+
+    def load(self):
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        slot = 0
+        seen = {}   # channel -> last seen of the record it points to
+        while True:
+            data = f.read(RECORD_SIZE)
+            if (len(data) < RECORD_SIZE): break
+            channel, PI = struct.unpack_from("<HH", data)
+            if (PI != 0):
+                self.byPI[PI] = slot
+                # Several records can name a channel when a station moved, the last seen one has it
+                lastSeen = struct.unpack_from("<I", data, RECORD_SIZE - 7)[0]
+                if (lastSeen >= seen.get(channel, 0)):
+                    self.byChannel[channel] = slot
+                    seen[channel] = lastSeen
+            slot += 1
+        f.close()
+        self.slots = slot
+
+    def read(self, slot):
+        data = self.dirty.get(slot)
+        if (data is None):
+            with open(self.path, "rb") as f:
+                f.seek(slot * RECORD_SIZE)
+                data = f.read(RECORD_SIZE)
+        return unpackStation(data)
+
+    def lookupChannel(self, channel):
+        slot = self.byChannel.get(channel)
+        return None if slot is None else self.read(slot)
+
+    def lookupPI(self, PI):
+        slot = self.byPI.get(PI)
+        return None if slot is None else self.read(slot)
+
+    def store(self, info):
+        if (info.PI == 0): return
+        data = info.pack()
+        slot = self.byPI.get(info.PI)
+        if (slot is None):
+            slot = self.slots
+            self.slots += 1
+        else:
+            old = self.dirty.get(slot)
+            if (old is None): old = self.read(slot).pack()
+            if (self.byChannel.get(info.channel) == slot and old[:RECORD_SIZE - 8] == data[:RECORD_SIZE - 8] and
+                    info.lastSeen - struct.unpack_from("<I", old, RECORD_SIZE - 7)[0] < self.seenInterval):
+                # Only RSSI and last seen changed, not worth a flash write yet
+                return
+            # One record per PI with the channel it was last heard on, the old channel is not its any more
+            oldChannel = struct.unpack_from("<H", old)[0]
+            if (oldChannel != info.channel and self.byChannel.get(oldChannel) == slot): del self.byChannel[oldChannel]
+        # The channel now belongs to this PI, a record of another PI on it is only found by PI
+        self.byPI[info.PI] = slot
+        self.byChannel[info.channel] = slot
+        if (not self.dirty): self.dirtyTime = ticks_ms()
+        self.dirty[slot] = data
+        self.poll()
+
+    def poll(self):
+        # Write the batch when it is big or old enough
+        if (self.dirty and (len(self.dirty) >= self.maxDirty or ticks_diff(ticks_ms(), self.dirtyTime) >= self.flushDelay)):
+            self.flush()
+
+    def flush(self):
+        if (not self.dirty): return
+        try:
+            f = open(self.path, "r+b")
+        except OSError:
+            f = open(self.path, "wb")
+        for slot in sorted(self.dirty):
+            f.seek(slot * RECORD_SIZE)
+            f.write(self.dirty[slot])
+            self.records += 1
+        f.close()
+        self.writes += 1
+        self.dirty = {}
+
+    def stations(self):
+        return [self.read(slot) for slot in sorted(self.byPI.values())]
+
+    def printStations(self):
+        print ("  MHz   PI   PS       PTY ECC RSSI  AF")
+        for info in self.stations():
+            print (("  " + str(info.channel / 10))[-5:] + " " + ("%04X" % info.PI) + " " + (info.PS.decode() + "        ")[:8] + " " +
+                   ("  " + str(info.PTY))[-3:] + " " + ("%02X" % info.ECC) + "  " + ("   " + str(info.RSSI))[-3:] + "  " +
+                   ", ".join([str(af / 10) for af in info.AF]))
+        print ("Stations: " + str(len(self.byPI)) + ", flash writes: " + str(self.writes) + ", records written: " + str(self.records) + ", waiting: " + str(len(self.dirty)))
@@ -0,0 +1,125 @@
+# (c) 2024 SA6HBR
+#
+# Lookup tables for PTY, PI and ECC
+# EN50067_RDS_Standard.pdf
+#   Annex D  - Programme identification codes and Extended country codes
+#   Annex F  - Programme type codes
+#   NRSC-4-B - RBDS programme type codes (North America)
+#
+# All tables are built once at import and only indexed afterwards.
+#
+
+# Annex F. Programme type codes, RDS (Europe)
+PTY_RDS = (
+    "None",              "News",              "Current Affairs",   "Information",
+    "Sport",             "Education",         "Drama",             "Culture",
+    "Science",           "Varied",            "Pop Music",         "Rock Music",
+    "Easy Listening",    "Light Classical",   "Serious Classical", "Other Music",
+    "Weather",           "Finance",           "Children's progs",  "Social Affairs",
+    "Religion",          "Phone In",          "Travel",            "Leisure",
+    "Jazz Music",        "Country Music",     "National Music",    "Oldies Music",
+    "Folk Music",        "Documentary",       "Alarm Test",        "Alarm",
+)
+
+# NRSC-4-B. Programme type codes, RBDS (North America)
+PTY_RBDS = (
+    "None",              "News",              "Information",       "Sports",
+    "Talk",              "Rock",              "Classic Rock",      "Adult Hits",
+    "Soft Rock",         "Top 40",            "Country",           "Oldies",
+    "Soft",              "Nostalgia",         "Jazz",              "Classical",
+    "Rhythm and Blues",  "Soft R & B",        "Foreign Language",  "Religious Music",
+    "Religious Talk",    "Personality",       "Public",            "College",
+    "Spanish Talk",      "Spanish Music",     "Hip Hop",           "Unassigned",
+    "Unassigned",        "Weather",           "Emergency Test",    "Emergency",
+)
+
+# Annex D. PI area coverage code, second nibble of PI
+PI_AREA = (
+    "Local",          "International",  "National",       "Supra-regional",
+    "Regional 1",     "Regional 2",     "Regional 3",     "Regional 4",
+    "Regional 5",     "Regional 6",     "Regional 7",     "Regional 8",
+    "Regional 9",     "Regional 10",    "Regional 11",    "Regional 12",
+)
+
+# Annex D. Extended country code -> ISO 3166 codes for PI country nibble 1..F, two characters each.
+# "  " is an unallocated combination.
+ECC_COUNTRY = {
+    0xE0: "dedzadilitberupsalathumtde  eg",
+    0xE1: "grcysmchjofilubgdkgiiqgblyrofr",
+    0xE2: "maczplvasksytn  liismcltrsesno",
+    0xE3: "meietrmk      nllvlbazhrkzseby",
+    0xE4: "mdeekg    uaxkptsiamuzge  tmba",
+}
+
+# Used when no 1A group with ECC has been received yet
+defaultECC = 0xE3 # Sweden
+
+COUNTRY_NAME = {
+    "ad": "Andorra",        "al": "Albania",        "am": "Armenia",        "at": "Austria",
+    "az": "Azerbaijan",     "ba": "Bosnia-Herzegovina", "be": "Belgium",    "bg": "Bulgaria",
+    "by": "Belarus",        "ch": "Switzerland",    "cy": "Cyprus",         "cz": "Czechia",
+    "de": "Germany",        "dk": "Denmark",        "dz": "Algeria",        "ee": "Estonia",
+    "eg": "Egypt",          "es": "Spain",          "fi": "Finland",        "fr": "France",
+    "gb": "United Kingdom", "ge": "Georgia",        "gi": "Gibraltar",      "gr": "Greece",
+    "hr": "Croatia",        "hu": "Hungary",        "ie": "Ireland",        "il": "Israel",
+    "iq": "Iraq",           "is": "Iceland",        "it": "Italy",          "jo": "Jordan",
+    "kg": "Kyrgyzstan",     "kz": "Kazakhstan",     "lb": "Lebanon",        "li": "Liechtenstein",
+    "lt": "Lithuania",      "lu": "Luxembourg",     "lv": "Latvia",         "ly": "Libya",
+    "ma": "Morocco",        "mc": "Monaco",         "md": "Moldova",        "me": "Montenegro",
+    "mk": "North Macedonia","mt": "Malta",          "nl": "Netherlands",    "no": "Norway",
+    "pl": "Poland",         "ps": "Palestine",      "pt": "Portugal",       "ro": "Romania",
+    "rs": "Serbia",         "ru": "Russia",         "se": "Sweden",         "si": "Slovenia",
+    "sk": "Slovakia",       "sm": "San Marino",     "sy": "Syria",          "tm": "Turkmenistan",
+    "tn": "Tunisia",        "tr": "Turkey",         "ua": "Ukraine",        "uz": "Uzbekistan",
+    "va": "Vatican",        "xk": "Kosovo",
+}
+
+# PI -> station name. Built in: Swedish stations, keyed on the PI reference byte
+# rds-koder-i-det-svenska-fm-natet2.pdf
+SWEDISH_REFERENCE = {
+    0x01: "SR P1",   0x02: "SR P2",       0x03: "SR P3",         0x24: "SR P4",
+    0x41: "Rix FM",  0x43: "Mix Megapol", 0xA0: "Rockklassiker",
+}
+
+# Loaded with loadStationNames(), full 16 bit PI -> name
+stationNames = {}
+
+def ptyName(PTY, rbds = 0):
+    if (rbds): return PTY_RBDS[PTY & 0x1F]
+    return PTY_RDS[PTY & 0x1F]
+
+def piArea(PI):
+    return PI_AREA[(PI >> 8) & 0x0F]
+
+def piCountry(PI, ECC = 0):
+    # ISO code from PI country nibble and ECC, None when unknown
+    nibble = PI >> 12
+    if (nibble == 0): return None
+    codes = ECC_COUNTRY.get(ECC or defaultECC)
+    if (codes is None): return None
+    code = codes[nibble * 2 - 2:nibble * 2]
+    if (code == "  "): return None
+    return code
+
+def countryName(PI, ECC = 0):
+    code = piCountry(PI, ECC)
+    if (code is None): return hex(PI >> 12)[2:]
+    return COUNTRY_NAME.get(code, code)
+
+def stationName(PI, ECC = 0):
+    name = stationNames.get(PI)
+    if (name is not None): return name
+    if (piCountry(PI, ECC) == "se"): return SWEDISH_REFERENCE.get(PI & 0xFF)
+    return None
+
+def loadStationNames(path):
+    # One station per line: "E224;SR P4". Lines starting with # are ignored.
+    count = 0
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if (line == "" or line[0] == "#"): continue
+            PI, name = line.split(";", 1)
+            stationNames[int(PI, 16)] = name.strip()
+            count += 1
+    return count
@@ -0,0 +1,29 @@
+# (c) 2024 SA6HBR
+#
+# ticks_ms/ticks_us for code that also runs on a Linux host.
+# MicroPython has them in time, CPython does not, there they are taken from time.monotonic().
+#
+
+import time
+
+try:
+    ticks_ms   = time.ticks_ms
+    ticks_us   = time.ticks_us
+    ticks_diff = time.ticks_diff
+    ticks_add  = time.ticks_add
+    sleep_ms   = time.sleep_ms
+except AttributeError:
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_us():
+        return int(time.monotonic() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+    def ticks_add(a, b):
+        return a + b
+
+    def sleep_ms(ms):
+        time.sleep(ms / 1000)
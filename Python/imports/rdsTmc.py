@@ -0,0 +1,292 @@
+# (c) 2024 SA6HBR
+#
+# Traffic Message Channel, ALERT-C on group 8A (ISO 14819-1)
+# Loaded by imports/rdsOda.py for AID 0xCD46/0xCD47, or at the first 8A group.
+#
+# 3A message (system information)
+#   Variant 0: LTN b11:6, AFI b5, M b4, scope I/N/R/U b3:0
+#   Variant 1: gap b13:12, SID b11:6
+#
+# 8A user message, block B: T b4 (1 = tuning information), F b3 (1 = single group), DP/CI b2:0
+#   Single group : C = diversion b15, direction b14, extent b13:11, event b10:0, D = location
+#   Multi group  : CI (continuity index) in B b2:0, the same for all groups of one message
+#     first      : C = 1 b15, direction b14, extent b13:11, event b10:0, D = location
+#     following  : C = 0 b15, second group b14, GSI b13:12 (groups left), 28 bits free format in C b11:0 + D
+#
+# Event and location names are looked up in index files on flash, not held in RAM:
+#   "TMCI"  count u16  reserved u16
+#   count x (code u16, text offset u32), sorted by code  -> binary search
+#   texts: length u8 + bytes
+# Build them from "code;text" lines with buildIndex(), e.g. on the host:
+#   python3 -c "from imports.rdsTmc import buildIndex; buildIndex('events.txt', 'tmc/events.idx')"
+#
+
+import struct
+from imports.rdsTime import ticks_ms, ticks_diff, ticks_add
+from imports.rdsOda import odaDecoder
+
+eventIndexPath    = "tmc/events.idx"
+locationIndexPath = "tmc/locations%d.idx" # % LTN
+
+# Duration and persistence (DP) -> minutes a message stays active, 7 = rest of the day
+PERSISTENCE = (15, 15, 30, 60, 120, 180, 240, 1440)
+
+# Free format labels -> field length in bits
+LABEL_BITS = (3, 3, 5, 5, 5, 8, 8, 8, 8, 11, 16, 16, 16, 16, 0, 0)
+LABEL_NAME = ("duration", "control", "length", "speed limit", "quantifier", "quantifier", "supplementary", "start time",
+              "stop time", "event", "diversion", "destination", "reserved", "cross linkage", "separator", "reserved")
+
+INDEX_MAGIC  = b"TMCI"
+INDEX_HEADER = "<4sHH"
+INDEX_RECORD = "<HI"
+HEADER_SIZE  = struct.calcsize(INDEX_HEADER)
+RECORD_SIZE  = struct.calcsize(INDEX_RECORD)
+
+class tmcIndex():
+    # Sorted code -> text index in a file. cache = 1 keeps the records (6 bytes per code) in RAM,
+    # the texts are always read from the file.
+
+    def __init__(self, path, cache = 0):
+        self.file = open(path, "rb")
+        magic, self.count, reserved = struct.unpack(INDEX_HEADER, self.file.read(HEADER_SIZE))
+        if (magic != INDEX_MAGIC):
+            self.file.close()
+            raise ValueError("Not a TMC index: " + path)
+        self.textStart = HEADER_SIZE + self.count * RECORD_SIZE
+        self.records   = None
+        if (cache): self.records = self.file.read(self.count * RECORD_SIZE)
+
+    def record(self, i):
+        if (self.records is not None): return struct.unpack_from(INDEX_RECORD, self.records, i * RECORD_SIZE)
+        self.file.seek(HEADER_SIZE + i * RECORD_SIZE)
+        return struct.unpack(INDEX_RECORD, self.file.read(RECORD_SIZE))
+
+    def lookup(self, code):
+        low  = 0
+        high = self.count - 1
+        while (low <= high):
+            middle = (low + high) >> 1
+            key, offset = self.record(middle)
+            if (key < code): low = middle + 1
+            elif (key > code): high = middle - 1
+            else:
+                self.file.seek(self.textStart + offset)
+                length = self.file.read(1)[0]
+                return self.file.read(length).decode()
+        return None
+
+    def close(self):
+        self.file.close()
+
+def buildIndex(sourcePath, indexPath):
+    # "code;text" lines -> index file, returns the number of codes
+    entries = {}
+    with open(sourcePath) as source:
+        for line in source:
+            line = line.strip()
+            if (not line or line[0] == "#" or ";" not in line): continue
+            code, text = line.split(";", 1)
+            entries[int(code)] = text.strip().encode()[:255]
+    codes = sorted(entries)
+    with open(indexPath, "wb") as index:
+        index.write(struct.pack(INDEX_HEADER, INDEX_MAGIC, len(codes), 0))
+        offset = 0
+        for code in codes:
+            index.write(struct.pack(INDEX_RECORD, code, offset))
+            offset += 1 + len(entries[code])
+        for code in codes:
+            index.write(bytes((len(entries[code]),)) + entries[code])
+    return len(codes)
+
+def openIndex(path):
+    try:
+        return tmcIndex(path)
+    except (OSError, ValueError):
+        return None
+
+class tmcMessage():
+
+    def __init__(self, event, location, direction, extent, diversion, minutes):
+        self.event     = event
+        self.location  = location
+        self.direction = direction
+        self.extent    = extent
+        self.diversion = diversion
+        self.labels    = []   # (label, value) from the free format of a multi group message
+        self.received  = ticks_ms()
+        self.expires   = ticks_add(self.received, minutes * 60000)
+        self.count     = 1
+
+class tmcDecoder(odaDecoder):
+
+    name = "TMC"
+    GAP  = (3, 5, 8, 11)
+    expireInterval = 10000 # ms between expiry sweeps
+
+    def __init__(self, rds, AID):
+        super().__init__(rds, AID)
+        self.LTN   = -1
+        self.AFI   = 0
+        self.mode  = 0
+        self.scope = 0
+        self.SID   = -1
+        self.gap   = 0
+        self.active  = {}  # (location, direction, event) -> tmcMessage
+        self.single  = 0
+        self.multi   = 0
+        self.broken  = 0   # multi group messages with a CI or GSI out of sequence
+        self.tuning  = 0
+        self.expired = 0
+        self.multiCI       = -1
+        self.multiMessage  = None
+        self.multiGSI      = -1
+        self.multiBits     = []
+        self.lastExpire    = ticks_ms()
+        self.events    = None
+        self.locations = None
+
+    def message(self, message, silent):
+        variant = message >> 14
+        if (variant == 0):
+            LTN = (message >> 6) & 0b111111
+            if (LTN != self.LTN and self.locations is not None):
+                self.locations.close()
+                self.locations = None
+            self.LTN   = LTN
+            self.AFI   = (message >> 5) & 0b1
+            self.mode  = (message >> 4) & 0b1
+            self.scope = message & 0b1111
+        elif (variant == 1):
+            self.gap   = self.GAP[(message >> 12) & 0b11]
+            self.SID   = (message >> 6) & 0b111111
+        if (silent == 0):
+            print ("TMC location table: " + str(self.LTN) + ", service id: " + str(self.SID) + ", AFI: " + str(self.AFI) + ", mode: " + str(self.mode) + ", gap: " + str(self.gap))
+
+    def group(self, B, C, D, silent):
+        Tuning_Mask    = 0b0000000000010000
+        Single_Mask    = 0b0000000000001000
+        DP_Mask        = 0b0000000000000111
+        First_Mask     = 0b1000000000000000
+        Diversion_Mask = 0b1000000000000000
+        Direction_Mask = 0b0100000000000000
+        Second_Mask    = 0b0100000000000000
+        Extent_Mask    = 0b0011100000000000
+        Extent_Offset  = 11
+        Event_Mask     = 0b0000011111111111
+        GSI_Mask       = 0b0011000000000000
+        GSI_Offset     = 12
+        Free_Mask      = 0b0000111111111111
+
+        if (ticks_diff(ticks_ms(), self.lastExpire) > self.expireInterval): self.expire()
+
+        if (B & Tuning_Mask):
+            # Tuning information, other networks carrying the service
+            self.tuning += 1
+            return
+
+        if (B & Single_Mask):
+            self.single += 1
+            message = tmcMessage(C & Event_Mask, D, (C & Direction_Mask) >> 14, (C & Extent_Mask) >> Extent_Offset,
+                                 (C & Diversion_Mask) >> 15, PERSISTENCE[B & DP_Mask])
+            self.store(message, silent)
+            return
+
+        CI = B & DP_Mask
+        if (C & First_Mask):
+            # First group of a multi group message
+            self.multiCI      = CI
+            self.multiMessage = tmcMessage(C & Event_Mask, D, (C & Direction_Mask) >> 14, (C & Extent_Mask) >> Extent_Offset, 0, PERSISTENCE[0])
+            self.multiGSI     = -1
+            self.multiBits    = []
+            return
+
+        GSI = (C & GSI_Mask) >> GSI_Offset
+        if (self.multiMessage is None or CI != self.multiCI or
+                ((C & Second_Mask) == 0 and GSI != self.multiGSI - 1) or ((C & Second_Mask) and self.multiGSI != -1)):
+            # Missed a group of this message, or a group of another one
+            if (self.multiMessage is not None): self.broken += 1
+            self.multiMessage = None
+            return
+        self.multiGSI = GSI
+        self.multiBits.append(((C & Free_Mask) << 16) | D)
+        if (GSI == 0):
+            message = self.multiMessage
+            self.multiMessage = None
+            message.labels = self.freeFormat(self.multiBits)
+            for label, value in message.labels:
+                if (label == 0):
+                    message.expires = ticks_add(message.received, PERSISTENCE[value] * 60000)
+                elif (label == 10 or label == 11):
+                    message.diversion = 1
+            self.multi += 1
+            self.store(message, silent)
+
+    def freeFormat(self, chunks):
+        # 28 bit chunks -> [(label, value)]
+        bits  = 0
+        count = 0
+        for chunk in chunks:
+            bits  = (bits << 28) | chunk
+            count += 28
+        labels = []
+        while (count >= 4):
+            label = (bits >> (count - 4)) & 0b1111
+            size  = LABEL_BITS[label]
+            if (count - 4 < size): break
+            count -= 4 + size
+            value = (bits >> count) & ((1 << size) - 1)
+            if (label == 0 and value == 0 and (bits & ((1 << count) - 1)) == 0): break # padding
+            labels.append((label, value))
+        return labels
+
+    def store(self, message, silent):
+        key = (message.location, message.direction, message.event)
+        old = self.active.get(key)
+        if (old is not None):
+            # Repetition or update, keep the first reception time
+            message.received = old.received
+            message.count    = old.count + 1
+        self.active[key] = message
+        if (silent == 0): print ("TMC        : " + self.describe(message))
+
+    def expire(self):
+        now = ticks_ms()
+        self.lastExpire = now
+        for key in [key for key in self.active if ticks_diff(now, self.active[key].expires) > 0]:
+            del self.active[key]
+            self.expired += 1
+
+    def eventText(self, event):
+        if (self.events is None): self.events = openIndex(eventIndexPath)
+        text = self.events.lookup(event) if self.events is not None else None
+        return text if text is not None else "event " + str(event)
+
+    def locationText(self, location):
+        if (self.locations is None and self.LTN > 0): self.locations = openIndex(locationIndexPath % self.LTN)
+        text = self.locations.lookup(location) if self.locations is not None else None
+        return text if text is not None else "location " + str(location)
+
+    def describe(self, message):
+        text = self.eventText(message.event) + " - " + self.locationText(message.location) + " " + "+-"[message.direction]
+        if (message.extent): text += str(message.extent)
+        if (message.diversion): text += ", diversion"
+        for label, value in message.labels:
+            if (label == 9): text += ", " + self.eventText(value)
+            elif (label != 0): text += ", " + LABEL_NAME[label] + ": " + str(value)
+        return text
+
+    def getMessages(self):
+        # Active messages, newest first
+        self.expire()
+        now = ticks_ms()
+        return sorted(self.active.values(), key = lambda message: ticks_diff(now, message.received))
+
+    def printMessages(self):
+        messages = self.getMessages()
+        print ("TMC LTN: " + str(self.LTN) + ", SID: " + str(self.SID) + ", active: " + str(len(messages)) + ", single: " + str(self.single) +
+               ", multi: " + str(self.multi) + ", broken: " + str(self.broken) + ", expired: " + str(self.expired))
+        for message in messages:
+            print ("  " + self.describe(message) + " (x" + str(message.count) + ")")
+
+    def summary(self):
+        return "LTN: " + str(self.LTN) + ", SID: " + str(self.SID) + ", active: " + str(len(self.active))
@@ -0,0 +1,178 @@
+# (c) 2024 SA6HBR
+#
+# Traffic announcement service
+# EN50067_RDS_Standard.pdf
+#   3.2.1.3 TP / TA codes in group type 0A/0B
+#   3.1.5.19 Type 14 groups: Enhanced Other Networks information
+#
+# Own station : TP=1 and TA=1 in 0A/0B -> announcement on the tuned programme. Debounced by the
+#               decoder, rds.taAnnouncement (imports/rdsDecoder.py trafficGroup).
+# EON         : 14B with TP(ON)=1 and TA(ON)=1 -> announcement on another network,
+#               the frequency of that network comes from 14A variant 4 (AF) or 5-8 (mapped FM),
+#               kept by the decoder in rds.OtherNetworks.
+#
+# Every group is decoded while it runs, PS, RadioText and the rest of radio.rds stay current.
+#
+# Usage:
+#   ta = trafficAnnouncement(radio)          # raise volume on own station
+#   ta = trafficAnnouncement(radio, 1, 12)   # also follow EON to other networks
+#   ta.run(600000)
+#
+
+import time
+
+class trafficAnnouncement():
+
+    # Switching modes
+    VOLUME  = 0 # Only raise volume on the tuned station
+    CHANNEL = 1 # Raise volume and follow EON to the announcing station
+
+    # States
+    IDLE    = 0
+    OWN     = 1 # Announcement on the tuned station
+    EON     = 2 # Announcement on other network, we are tuned to it
+
+    eonDebounce     = 2       # 14B groups with TA(ON) in a row before we switch
+    maxAnnouncement = 300000  # ms, always return after this
+    rdsLostTime     = 5000    # ms without groups on the other network before we return
+    taWaitTime      = 2000    # ms the other network has to show its own TA after we switched
+    groupWait       = 200     # ms to wait for one group
+
+    def __init__(self, radio, mode = 0, taVolume = 12):
+        self.radio    = radio
+        self.mode     = mode
+        self.taVolume = taVolume
+
+        self.state          = self.IDLE
+        self.homeChannel    = 0
+        self.homeVolume     = 0
+        self.onsetTime      = 0
+        self.switchTime     = 0
+        self.lastGroupTime  = 0
+
+        # EON debounce, 14B of one other network in a row
+        self.eonCount       = 0
+        self.eonPI          = 0
+        self.activePI       = 0
+        self.activeHeard    = 0  # the other network has shown TA itself
+
+        # Statistics
+        self.switchCount    = 0
+        self.lastLatency    = 0
+        self.maxLatency     = 0
+
+    def run(self, maxTime = 60000):
+        # Until maxTime ms, Ctrl-C stops early. Always back home and at the old volume.
+        startTime = time.ticks_ms()
+        try:
+            while True:
+                if(time.ticks_diff(time.ticks_ms(), startTime) > maxTime) :break
+                self.poll()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.restore()
+
+    def poll(self):
+        radio = self.radio
+        if(radio.waitRDS(self.groupWait) == radio.HIGH):
+            groupCode = radio.decodeGroup()
+            if (groupCode >= 0):
+                self.lastGroupTime = radio.rdsReadyTime
+                self.handleGroup(groupCode)
+        self.checkTimeout()
+
+    def handleGroup(self, groupCode):
+        rds = self.radio.rds
+        if (groupCode <= 1):
+            self.ownTA(rds)
+        elif (groupCode == 29):
+            #14B: PI(ON) in block D
+            self.eonTA(rds, rds.blocks[rds.RDSD])
+
+    def ownTA(self, rds):
+        if (self.state == self.IDLE):
+            if (rds.taAnnouncement):
+                self.onsetTime = rds.taChangeTime
+                self.startOwn()
+        elif (self.state == self.OWN):
+            if (not rds.taAnnouncement): self.restore()
+        elif (rds.getPI() == self.activePI):
+            # On EON we watch TA of the station we switched to
+            if (rds.taAnnouncement): self.activeHeard = 1
+            elif (self.activeHeard): self.restore()
+
+    def eonTA(self, rds, PI):
+        if (self.mode != self.CHANNEL or self.state != self.IDLE): return
+        other = rds.OtherNetworks.get(PI)
+        if (other is not None and other[3] == 1 and other[2] == 1 and other[1] != 0):
+            if (PI != self.eonPI):
+                self.eonPI    = PI
+                self.eonCount = 0
+                self.onsetTime = self.lastGroupTime
+            self.eonCount += 1
+            if (self.eonCount >= self.eonDebounce):
+                self.startEON(PI, other[1])
+        elif (PI == self.eonPI):
+            self.eonCount = 0
+
+    def saveHome(self):
+        self.homeChannel = self.radio.getChannel()
+        self.homeVolume  = self.radio.getVolume()
+
+    def startOwn(self):
+        self.saveHome()
+        self.radio.setVolume(self.taVolume)
+        self.state = self.OWN
+        self.switched()
+
+    def startEON(self, PI, channel):
+        self.saveHome()
+        self.radio.setChannel(channel)
+        self.radio.setVolume(self.taVolume)
+        self.activePI    = PI
+        self.activeHeard = 0
+        self.state = self.EON
+        self.switched()
+
+    def switched(self):
+        self.switchTime  = time.ticks_ms()
+        latency          = time.ticks_diff(self.switchTime, self.onsetTime)
+        self.lastLatency = latency
+        if (latency > self.maxLatency): self.maxLatency = latency
+        self.switchCount += 1
+        print ("TA start   : " + ("own station" if self.state == self.OWN else "EON " + hex(self.activePI)[2:]) + ", latency " + str(latency) + " ms")
+
+    def checkTimeout(self):
+        if (self.state == self.IDLE): return
+        now = time.ticks_ms()
+        if (time.ticks_diff(now, self.switchTime) > self.maxAnnouncement):
+            self.restore()
+        elif (self.state == self.EON and time.ticks_diff(now, self.lastGroupTime) > self.rdsLostTime and time.ticks_diff(now, self.switchTime) > self.rdsLostTime):
+            self.restore()
+        elif (self.state == self.EON and self.activeHeard == 0 and time.ticks_diff(now, self.switchTime) > self.taWaitTime):
+            # The announcement was over before we got there, or the EON data was wrong
+            self.restore()
+
+    def restore(self):
+        # Always back to where we were, also called from run() on exit
+        if (self.state == self.IDLE): return
+        if (self.state == self.EON):
+            self.radio.setChannel(self.homeChannel)
+        self.radio.setVolume(self.homeVolume)
+        print ("TA end     : back on " + str(self.homeChannel/10) + " MHz, vol " + str(self.homeVolume) + " after " + str(time.ticks_diff(time.ticks_ms(), self.switchTime)) + " ms")
+        self.state       = self.IDLE
+        self.activePI    = 0
+        self.activeHeard = 0
+        self.eonPI       = 0
+        self.eonCount    = 0
+
+    def stop(self):
+        self.restore()
+
+    def getStats(self):
+        return (self.switchCount, self.lastLatency, self.maxLatency)
+
+    def printStats(self):
+        switches, lastLatency, maxLatency = self.getStats()
+        print ("TA         : " + str(switches) + " announcements, latency last " + str(lastLatency) + " ms, max " + str(maxLatency) + " ms")
@@ -0,0 +1,142 @@
+# (c) 2024 SA6HBR
+#
+# asyncio flavour of rdsRadio
+# tune, seek and the RDS stream yield to other tasks while the chip works.
+# All I2C access from the async methods goes through one lock, so a UI, a logger and
+# the radio can share the bus. The inherited blocking methods (powerUp, getRDS ...) still block.
+#
+# Usage:
+#   radio = rdsRadioAsync(0x10, 13, 4, 5)
+#   radio.powerUp()
+#
+#   async def main():
+#       await radio.tune(1038)
+#       async for a, b, c, d in radio.groups():
+#           print (rdsText(radio.rds.ProgrammeService))
+#
+#   asyncio.run(main())
+#
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+from imports.si4703Library import rdsRadio, rdsText
+
+class rdsGroupStream():
+    # async iterator over RDS groups, MicroPython has no async generators
+
+    def __init__(self, radio, decode = 1, interval = 0.01):
+        self.radio    = radio
+        self.decode   = decode
+        self.interval = interval
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        radio = self.radio
+        regs  = radio.radioRegister
+        while True:
+            # With GPIO2 connected the bus is not touched until the chip signals a group. Without it
+            # STATUSRSSI is polled and a group is yielded once, at the RDSR edge (radio.newGroup).
+            if (radio.gpio2Pin is None or radio.rdsReady):
+                async with radio.busLock:
+                    if (radio.waitRDS(0) == radio.HIGH):
+                        if (self.decode): radio.decodeGroup()
+                        return (regs[radio.RDSA], regs[radio.RDSB], regs[radio.RDSC], regs[radio.RDSD])
+            await asyncio.sleep(self.interval)
+
+class rdsRadioAsync(rdsRadio):
+
+    pollInterval = 0.01 # s between STC polls
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.busLock = asyncio.Lock()
+
+    async def waitSTC(self, maxTime):
+        # Poll STATUSRSSI (2 bytes) until STC or SF/BL, sleeping between polls
+        loops = int(maxTime / 1000 / self.pollInterval)
+        for i in range(loops):
+            async with self.busLock:
+                status = self.readStatusRSSI()
+            if (status & 0b0110000000000000): return 1
+            await asyncio.sleep(self.pollInterval)
+        return 0
+
+    async def tune(self, channel, maxTime = 3000):
+        self.rememberStation()
+        async with self.busLock:
+            self.readRadioRegisters()
+            #Set the TUNE bit high to begin a tuning operation.
+            #Set CHAN[9:0] bits to select the desired channel
+            self.radioRegister[0x03] &= ~(0b1111111111)
+            self.radioRegister[0x03] |= (1<<15) | (channel - self.FIRSTCHANNEL)
+            self.writeRadioRegisters()
+            self.lastChannel = channel
+
+        tuned = await self.waitSTC(maxTime)
+
+        async with self.busLock:
+            self.readRadioRegisters()
+            #Set the TUNE bit low to stop a tuning operation.
+            self.radioRegister[0x03] &= ~(1<<15)
+            self.writeRadioRegisters()
+        # As smartSeek: a station when it is strong enough
+        if (tuned): self.bandMap.record(self.CHANNEL, self.RSSI, self.RSSI >= self.bandMap.minRSSI)
+        self.clearRDSinfo()
+        self.recallStation()
+        return self.CHANNEL
+
+    async def seek(self, up = 1, maxTime = 15000):
+        # Returns SF/BL, 1 when the seek failed or stopped at the band limit
+        self.rememberStation()
+        async with self.busLock:
+            self.readRadioRegisters()
+            startChannel = self.CHANNEL
+            #SKMODE high: stop at the band limits. SEEKUP: direction. SEEK: start.
+            self.radioRegister[0x02] &= ~(0b1<<9)
+            self.radioRegister[0x02] |= (1<<10) | (up<<9) | (1<<8)
+            self.writeRadioRegisters()
+
+        done = await self.waitSTC(maxTime)
+
+        async with self.busLock:
+            self.readRadioRegisters()
+            SFBL = self.SFBL
+            #Set the SEEK bit low to end the seek operation and to set the STC bit low.
+            self.radioRegister[0x02] &= ~(0b1<<8)
+            self.writeRadioRegisters()
+            self.lastChannel = self.CHANNEL
+        # The band map learns from it as from radioSeek, smartSeek relies on it
+        if (done): self.learnSeek(startChannel, up, self.SEEK_BANDLIMIT if SFBL else self.SEEK_OK)
+        self.clearRDSinfo()
+        self.recallStation()
+        return SFBL
+
+    async def volume(self, volume):
+        async with self.busLock:
+            self.setVolume(volume)
+
+    async def rssi(self):
+        async with self.busLock:
+            self.readStatusRSSI()
+        return self.RSSI
+
+    def groups(self, decode = 1):
+        # async for a, b, c, d in radio.groups(): ...
+        return rdsGroupStream(self, decode)
+
+    async def programService(self, maxTime = 5000):
+        # Wait for a complete PS without blocking other tasks
+        try:
+            await asyncio.wait_for(self.waitProgramService(), maxTime / 1000)
+        except asyncio.TimeoutError:
+            pass
+        return rdsText(self.rds.ProgrammeService)
+
+    async def waitProgramService(self):
+        if (0 not in self.rds.ProgrammeService): return
+        async for group in self.groups():
+            if (0 not in self.rds.ProgrammeService): return
@@ -0,0 +1,281 @@
+# (c) 2024 SA6HBR
+#
+# Simulated Si4703 on a fake I2C bus
+# Runs on the Pico (no radio wired) and on a Linux host. It answers the same
+# readfrom_mem_into / readfrom_into / writeto_mem calls as machine.I2C, so:
+#
+#   radio = rdsRadio(0x10, 13, 4, 5, i2c=si4703Sim())
+#
+# Stations send RDS groups every 87.6 ms: 0A (PS, AF), 2A (RadioText), 1A (ECC),
+# 4A at every new minute, 3A/ODA, 14A/14B (EON) and any extra raw groups.
+#
+# Si4702-03-C19-1.pdf, register behaviour as far as the driver uses it:
+#   TUNE / SEEK set -> STC after tuneTime / seek sweep, SF/BL on a failed seek
+#   TUNE / SEEK cleared -> STC and SF/BL cleared
+#   RDSR set when a group is loaded into RDSA-RDSD, cleared rdsHold later or set again by the
+#   next group. Reading the registers does not clear it, a fast poll sees a group several times.
+#
+
+import time
+from array import array
+from imports.rdsTime import ticks_ms, ticks_us, ticks_diff
+from imports.rdsClock import dateToMJD
+
+FIRSTCHANNEL = 875
+LASTCHANNEL  = 1080
+
+class simStation():
+
+    def __init__(self, channel, PI, PS, RT = "", PTY = 0, TP = 0, RSSI = 45, AF = (), ECC = 0xE3, EON = (), ODA = (), extraGroups = ()):
+        self.channel = channel
+        self.PI      = PI
+        self.PS      = (PS + " " * 8)[:8]
+        self.PTY     = PTY
+        self.TP      = TP
+        self.TA      = 0
+        self.RSSI    = RSSI
+        self.AF      = AF       # channels, e.g. (1038, 1029)
+        self.ECC     = ECC
+        self.EON     = list(EON) # [PI, PS, channel, TP, TA, PTY] per other network
+        self.ODA     = ODA      # (AID, group code, message) announced in 3A
+        self.extraGroups = list(extraGroups) # raw (B, C, D), B without TP/PTY bits
+        self.RTFlag  = 0
+        self.setRadioText(RT)
+        self.sequence = 0
+        self.extraIndex = 0
+        self.lastMinute = -1
+
+    def setRadioText(self, RT):
+        RT = RT[:64]
+        if (len(RT) < 64): RT += "\r"
+        RT += " " * (-len(RT) % 4)
+        self.RT = RT
+        self.RTFlag ^= 1
+
+    def blockB(self, groupType, version, low5):
+        return (groupType << 12) | (version << 11) | (self.TP << 10) | (self.PTY << 5) | low5
+
+    def afCodes(self):
+        # AF method A: count code first, then the frequencies, filler 205 for an odd count
+        codes = [224 + len(self.AF)] + [ch - FIRSTCHANNEL for ch in self.AF]
+        if (len(codes) % 2): codes.append(205)
+        return codes
+
+    def nextGroup(self):
+        # (A, B, C, D)
+        year, month, day, hour, minute = time.gmtime()[0:5]
+        if (minute != self.lastMinute):
+            self.lastMinute = minute
+            MJD = dateToMJD(year, month, day)
+            return (self.PI, self.blockB(4, 0, MJD >> 15), ((MJD << 1) & 0xFFFF) | (hour >> 4), ((hour & 0xF) << 12) | (minute << 6) | 2)
+
+        n = self.sequence
+        self.sequence += 1
+        slot = n % 8
+        if (slot in (0, 2, 4, 6)):
+            # 0A, PS segment and AF pair
+            segment = (n // 2) % 4
+            codes = self.afCodes()
+            pair  = (n // 8) % (len(codes) // 2)
+            C = (codes[pair * 2] << 8) | codes[pair * 2 + 1]
+            D = (ord(self.PS[segment * 2]) << 8) | ord(self.PS[segment * 2 + 1])
+            return (self.PI, self.blockB(0, 0, (self.TA << 4) | (1 << 3) | segment), C, D)
+        if (slot in (1, 5)):
+            # 2A RadioText
+            segments = len(self.RT) // 4
+            segment  = (n // 4) % segments
+            text = self.RT[segment * 4:segment * 4 + 4]
+            return (self.PI, self.blockB(2, 0, (self.RTFlag << 4) | segment), (ord(text[0]) << 8) | ord(text[1]), (ord(text[2]) << 8) | ord(text[3]))
+
+        cycle = (n // 8) % 4
+        if (slot == 3 and cycle == 0):
+            # 1A variant 0, ECC
+            return (self.PI, self.blockB(1, 0, 0), self.ECC, 0)
+        if (slot == 3 and cycle == 1 and self.ODA):
+            AID, groupCode, message = self.ODA[(n // 32) % len(self.ODA)]
+            return (self.PI, self.blockB(3, 0, groupCode), message, AID)
+        if (slot == 3 and self.extraGroups):
+            # In list order, so the groups of a multi group message stay in sequence
+            B, C, D = self.extraGroups[self.extraIndex % len(self.extraGroups)]
+            self.extraIndex += 1
+            return (self.PI, B | (self.TP << 10) | (self.PTY << 5), C, D)
+        if (self.EON):
+            PI, PS, channel, TP, TA, PTY = self.EON[(n // 8) % len(self.EON)]
+            if (TA):
+                # 14B, switching signal
+                return (self.PI, self.blockB(14, 1, (TP << 4) | (TA << 3)), self.PI, PI)
+            variant = (n // 8) % 7
+            if (variant < 4):
+                PS = (PS + " " * 8)[:8]
+                return (self.PI, self.blockB(14, 0, (TP << 4) | variant), (ord(PS[variant * 2]) << 8) | ord(PS[variant * 2 + 1]), PI)
+            if (variant == 4):
+                return (self.PI, self.blockB(14, 0, (TP << 4) | 4), ((224 + 1) << 8) | (channel - FIRSTCHANNEL), PI)
+            if (variant == 5):
+                return (self.PI, self.blockB(14, 0, (TP << 4) | 5), ((self.channel - FIRSTCHANNEL) << 8) | (channel - FIRSTCHANNEL), PI)
+            return (self.PI, self.blockB(14, 0, (TP << 4) | 13), (PTY << 11) | TA, PI)
+        return (self.PI, self.blockB(0, 0, (self.TA << 4) | (1 << 3)), (205 << 8) | 205, (ord(self.PS[0]) << 8) | ord(self.PS[1]))
+
+def defaultStations():
+    # A small Swedish band
+    return [
+        simStation(1038, 0xE224, "P4 SR", "Sveriges Radio P4", PTY = 4, TP = 1, RSSI = 52, AF = (1038, 1029), EON = [[0xE201, "P1 SR", 929, 0, 0, 3]]),
+        simStation(929,  0xE201, "P1 SR", "Sveriges Radio P1 - Nyheter", PTY = 3, RSSI = 44, AF = (929,)),
+        simStation(1005, 0xE241, "RIX FM", "Rix FM", PTY = 10, RSSI = 38),
+        simStation(1067, 0xE2A0, "ROCKKLAS", "Rockklassiker", PTY = 11, RSSI = 31),
+    ]
+
+class si4703Sim():
+
+    tuneTime    = 60    # ms, P.13
+    seekStep    = 5     # ms per channel during a seek
+    groupPeriod = 87600 # us between RDS groups
+    rdsHold     = 40000 # us RDSR stays set after a group
+
+    def __init__(self, stations = None):
+        if (stations is None): stations = defaultStations()
+        self.stations = {}
+        for station in stations: self.stations[station.channel] = station
+        self.regs = array('H', [0] * 16)
+        self.regs[0x00] = 0x1242 # Device ID
+        self.regs[0x01] = 0x1253 # Chip ID, Si4703-C19
+        self.regs[0x05] = 0x0010
+        self.busyUntil  = 0
+        self.busy       = 0      # 1 tune, 2 seek
+        self.target     = 0
+        self.seekFail   = 0
+        self.nextGroup  = ticks_us()
+        self.groupTime  = self.nextGroup # when the group in RDSA-RDSD arrived
+        self.groups     = 0
+        self.reads      = 0
+        self.writes     = 0
+
+    def channel(self):
+        return (self.regs[0x0B] & 0b0000001111111111) + FIRSTCHANNEL
+
+    def station(self):
+        return self.stations.get(self.channel())
+
+    def powered(self):
+        return (self.regs[0x02] & 0b0000000000000001)
+
+    # I2C side
+
+    def writeto_mem(self, addr, memaddr, buf):
+        self.writes += 1
+        data = bytes((memaddr,)) + bytes(buf)
+        old02 = self.regs[0x02]
+        old03 = self.regs[0x03]
+        for i in range(len(data) // 2):
+            if (i + 2 > 0x07): break
+            self.regs[i + 2] = (data[i * 2] << 8) | data[i * 2 + 1]
+        self.registersWritten(old02, old03)
+
+    def registersWritten(self, old02, old03):
+        regs = self.regs
+        now  = ticks_ms()
+        # ENABLE + DISABLE -> powerDown
+        if ((regs[0x02] & 0b0000000001000001) == 0b0000000001000001):
+            regs[0x02] &= ~0b0000000001000001
+        # TUNE started
+        if ((regs[0x03] & 0x8000) and not (old03 & 0x8000)):
+            self.busy = 1
+            self.target = (regs[0x03] & 0b0000001111111111) + FIRSTCHANNEL
+            self.busyUntil = now + self.tuneTime
+        # SEEK started
+        if ((regs[0x02] & 0x0100) and not (old02 & 0x0100)):
+            self.busy = 2
+            self.startSeek(now)
+        # TUNE/SEEK cleared -> STC and SF/BL low
+        if (not (regs[0x03] & 0x8000) and not (regs[0x02] & 0x0100)):
+            self.busy = 0
+            regs[0x0A] &= ~0b0110000000000000
+
+    def startSeek(self, now):
+        regs   = self.regs
+        up     = (regs[0x02] >> 9) & 1
+        wrap   = not ((regs[0x02] >> 10) & 1)
+        SEEKTH = regs[0x05] >> 8
+        channel = self.channel()
+        steps  = 0
+        self.seekFail = 1
+        self.target   = LASTCHANNEL if up else FIRSTCHANNEL
+        while True:
+            channel += 1 if up else -1
+            steps += 1
+            if (channel > LASTCHANNEL or channel < FIRSTCHANNEL):
+                if (not wrap): break
+                channel = FIRSTCHANNEL if up else LASTCHANNEL
+            if (steps > LASTCHANNEL - FIRSTCHANNEL + 1): break
+            station = self.stations.get(channel)
+            if (station is not None and station.RSSI >= SEEKTH):
+                self.target   = channel
+                self.seekFail = 0
+                break
+        self.busyUntil = now + self.tuneTime + steps * self.seekStep
+
+    def update(self):
+        regs = self.regs
+        if (self.busy and ticks_diff(ticks_ms(), self.busyUntil) >= 0):
+            regs[0x0B] = (regs[0x0B] & 0xFC00) | (self.target - FIRSTCHANNEL)
+            regs[0x0A] |= 0b0100000000000000 # STC
+            if (self.busy == 2 and self.seekFail): regs[0x0A] |= 0b0010000000000000 # SF/BL
+            self.busy = 0
+            self.nextGroup = ticks_us()
+
+        station = self.station()
+        RSSI = 8
+        if (station is not None and self.powered()): RSSI = station.RSSI
+        regs[0x0A] = (regs[0x0A] & 0xFF00) | RSSI
+        if (RSSI >= 31): regs[0x0A] |= 0b0000000100000000   # ST
+        else: regs[0x0A] &= ~0b0000000100000000
+
+        if (station is None or not self.powered() or not (regs[0x04] & 0x1000) or self.busy):
+            regs[0x0A] &= ~0b1000100000000000 # RDSR, RDSS
+            return
+        regs[0x0A] |= 0b0000100000000000     # RDSS
+        now = ticks_us()
+        while (ticks_diff(now, self.nextGroup) >= 0):
+            # A group nobody read is overwritten, as in the chip
+            A, B, C, D = station.nextGroup()
+            regs[0x0C] = A
+            regs[0x0D] = B
+            regs[0x0E] = C
+            regs[0x0F] = D
+            regs[0x0A] |= 0b1000000000000000 # RDSR
+            self.groupTime = self.nextGroup
+            self.nextGroup += self.groupPeriod
+            self.groups += 1
+        if (ticks_diff(now, self.groupTime) >= self.rdsHold):
+            regs[0x0A] &= ~0b1000000000000000
+
+    def fill(self, buf):
+        self.update()
+        self.reads += 1
+        regs = self.regs
+        for i in range(len(buf) // 2):
+            reg = (i + 0x0A) & 0x0F
+            buf[i * 2]     = regs[reg] >> 8
+            buf[i * 2 + 1] = regs[reg] & 0xFF
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        self.fill(buf)
+
+    def readfrom_into(self, addr, buf):
+        self.fill(buf)
+
+    def readfrom_mem(self, addr, memaddr, n):
+        buf = bytearray(n)
+        self.fill(buf)
+        return bytes(buf)
+
+    # Test side
+
+    def setTA(self, channel, TA):
+        # Traffic announcement on a station, and in the EON lists of the other stations
+        self.stations[channel].TA = TA
+        for station in self.stations.values():
+            for eon in station.EON:
+                if (eon[2] == channel): eon[4] = TA
+
+    def setRadioText(self, channel, RT):
+        self.stations[channel].setRadioText(RT)
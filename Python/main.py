@@ -1,56 +1,251 @@
 # (c) 2024 SA6HBR
 #
 
-from imports.si4703Library import rdsRadio
+# Boot cost of the imports below, the group decoders are not among them (loaded at their first group)
 import time
+import gc
+bootStart = time.ticks_us()
+bootHeap  = gc.mem_alloc()
+
+from imports.si4703Library import rdsRadio, GROUPNAME, rdsText
+from imports.rdsSignal import signalSampler
+from imports.rdsScheduler import groupScheduler
+from imports.rdsHarvester import stationHarvester
+from imports.rdsStationDb import stationDb
+from imports.rdsPresets import presetBank
+from imports.rdsMonitor import rdsMonitor
+from imports.rdsTraffic import trafficAnnouncement
+from imports.rdsProfile import rdsProfiler
+import sys
+import select
+
+print ("Boot       : imports " + str(time.ticks_diff(time.ticks_us(), bootStart) // 1000) + " ms, heap " + str(gc.mem_alloc() - bootHeap) + " bytes")
 
 resetPin_id = 13
 sdioPin_id = 4
 sclkPin_id = 5
 radio = rdsRadio(0x10, resetPin_id, sdioPin_id, sclkPin_id)
+radio.attachStationDb(stationDb("stations.db"))
+presets = presetBank("presets.db")
+
+statusInterval = 500 # ms between status line checks
 
 def menu():
     print ()
-    print ('pu - Power up','pd - Power down','2  - Seek up','1  - Seek down','+  - Volume up','-  - Volume down','4A - Get time from RDS','More RDS: 0A, 1A, 2A, 10A and 14A', sep='\n')
-    
+    print ('pu - Power up',
+           'pd - Power down',
+           '2  - Seek up',
+           '1  - Seek down',
+           '+  - Volume up',
+           '-  - Volume down',
+           '3  - List all channels',
+           '4  - Get a random rds-message',
+           '5  - Get TP, PTY, PI',
+           '6  - Show all groups on/off',
+           '7  - Show only unknown groups on/off',
+           '8  - View registers',
+           '9  - Memory, loaded group decoders',
+           'R  - RSSI sampler',
+           'B  - I2C bus self-test',
+           'G  - Group statistics',
+           'N  - Band map',
+           'O  - Open data applications',
+           'T  - TMC traffic messages',
+           'H  - Harvest RDS from all stations',
+           'D  - Station database',
+           'M  - Monitor muted until TA, alarm, new RadioText or clock time',
+           'TA - Traffic announcements for 10 min, follows EON',
+           'PF - Profiler on/off, table when off',
+           'P0..P9 - Recall preset',
+           'S0..S9 - Store preset',
+           'P  - List presets',
+           '4A - Show time from RDS on/off',
+           'More RDS: 0A, 1A, 2A, 10A, 14A ... on/off',
+           'F  - Clear group filters',
+           'Q  - Quit',
+           sep='\n')
 
-try:
-    while True:
-        print ()
-        PS = radio.getPowerStatus()
-        if (PS==0):
+class console():
+    # Event loop: stdin is polled between RDS reads so the radio keeps decoding while we wait for a command
+
+    def __init__(self, radio):
+        self.radio      = radio
+        self.line       = ""
+        self.lastStatus = ""
+        self.statusTime = 0
+        self.liveFilter = []  # Group types printed as they arrive
+        self.showAll    = 0   # 6 - print every group
+        self.findNew    = 0   # 7 - print only unknown group types
+        self.running    = 1
+        self.scheduler  = groupScheduler(radio) # Without GPIO2, poll in step with the group rate
+        self.profiler   = rdsProfiler(radio)    # PF - only patched in while on
+        self.poller     = select.poll()
+        self.poller.register(sys.stdin, select.POLLIN)
+
+    def run(self):
+        self.radio.readRadioRegisters()
+        if (self.radio.ENABLE == 0):
             menu()
             print ()
             print ("Status - Power Down")
             print ("Write pu + ENTER for start si4703-chip")
+        self.status(1)
+        while self.running:
+            try:
+                if (self.poller.poll(0)):
+                    self.key(sys.stdin.read(1))
+                    continue
+                if (self.radio.ENABLE == 1):
+                    self.serviceRDS()
+                if (time.ticks_diff(time.ticks_ms(), self.statusTime) >= statusInterval):
+                    self.status()
+            except OSError:
+                # The bus did not come back after the retries and a recovery, keep the console and try again later
+                self.clearStatus()
+                self.radio.printBusStats()
+                time.sleep_ms(1000)
+                self.scheduler.reset()
+            # Stdin is checked at least every rdsPollInterval, the bus only when the scheduler is due
+            wait = self.radio.rdsPollInterval
+            if (self.radio.ENABLE == 1 and self.radio.gpio2Pin is None): wait = min(wait, self.scheduler.waitMs())
+            time.sleep_ms(wait)
+
+    def serviceRDS(self):
+        radio = self.radio
+        if (radio.gpio2Pin is None):
+            if (self.scheduler.poll() == 0): return
+        elif (radio.rdsReady == 0 or radio.waitRDS(0) != radio.HIGH): return # GPIO2: no pulse, no bus access
+        groupType = GROUPNAME[radio.radioRegister[radio.RDSB] >> 11]
+        if (self.showAll or groupType in self.liveFilter):
+            self.clearStatus()
+            radio.decodeGroup(0, 0, groupType, 0)
+            self.status(1)
         else:
-            print (("  "+str(radio.getChannel()/10))[-5:] + " MHz - RSSI: " + str(radio.getRSSI()) + " Vol: " + str(radio.getVolume()) + " " + radio.getProgramService())
-            
-        kbdInput = input(">>").upper()          
-        
-        if (PS==1):
-            if kbdInput == "2":radio.radioSeekUp()
-            if kbdInput == "1":radio.radioSeekDown()
+            if (self.findNew): self.clearStatus()
+            radio.decodeGroup(0, self.findNew, groupType, 1)
+            if (self.findNew): self.status(1)
+
+    def statusText(self):
+        radio = self.radio
+        if (radio.ENABLE == 0): return "Power Down >>" + self.line
+        return ("  "+str(radio.CHANNEL/10))[-5:] + " MHz - RSSI: " + ("0"+str(radio.RSSI))[-2:] + " Vol: " + ("0"+str(radio.VOLUME))[-2:] + " " + rdsText(radio.rds.ProgrammeService) + " >>" + self.line
+
+    def status(self, force = 0):
+        # Redraw the status line in place, only when something changed
+        self.statusTime = time.ticks_ms()
+        if (self.radio.stationDb is not None): self.radio.stationDb.poll() # Write-behind of changed station records
+        if (self.radio.ENABLE == 0): self.radio.readRadioRegisters()
+        text = self.statusText()
+        if (force == 0 and text == self.lastStatus): return
+        padding = len(self.lastStatus) - len(text)
+        sys.stdout.write("\r" + text + (" " * padding + "\b" * padding if padding > 0 else ""))
+        self.lastStatus = text
+
+    def clearStatus(self):
+        sys.stdout.write("\r" + " " * len(self.lastStatus) + "\r")
+        self.lastStatus = ""
+
+    def key(self, char):
+        if (char in ("\r", "\n")):
+            command = self.line.upper()
+            self.line = ""
+            print ()
+            self.lastStatus = ""
+            self.command(command)
+            self.status(1)
+        elif (char in ("\x08", "\x7f")):
+            self.line = self.line[:-1]
+            self.status(1)
+        elif (char >= " "):
+            self.line += char
+            self.status(1)
+
+    def command(self, kbdInput):
+        radio = self.radio
+        if (radio.ENABLE == 1):
+            if kbdInput in ("1", "2"):                                # Next station from the band map, a hardware seek where it is stale
+                result = radio.smartSeek(radio.HIGH if kbdInput == "2" else radio.LOW)
+                if (result != radio.SEEK_OK): print (("", "No station found", "Band limit", "Seek timeout")[result])
+                self.scheduler.reset()
             if kbdInput == "+":radio.setVolume(radio.getVolume()+1)
             if kbdInput == "-":radio.setVolume(radio.getVolume()-1)
 
             if kbdInput == "3":radio.getAllChannel()                 # Get a list of all radio-channels
             if kbdInput == "4":radio.getRDS()                        # Get a random rds-message
             if kbdInput == "5":radio.getRDS(1,0,"XX")                # Get TP, PTY, PI
-            if kbdInput == "6":radio.getSomeMessagesRDS(50,10000, 0) # read some rds-message
-            if kbdInput == "7":radio.getSomeMessagesRDS(50,60000, 1) # read only unknown
+            if kbdInput == "6":self.showAll = 1 - self.showAll       # Show all rds-messages
+            if kbdInput == "7":self.findNew = 1 - self.findNew       # Show only unknown
             if kbdInput == "8":print(', '.join([str(hex(i)) for i in radio.viewRadioRegisters()])) #view RadioRegisters
-            
-            if kbdInput in ("0A","1A","2A","10A","14A")     :radio.getSomeMessagesRDS(50, 5000, 0,kbdInput)
-            elif (kbdInput not in ("pu","pd") and len(kbdInput)>=2) :radio.getSomeMessagesRDS(50, 60000, 0,kbdInput)
-            
-        if kbdInput == "PU":radio.powerUp()
+            if kbdInput == "R":                                       # Sample RSSI/ST/AFC at 200 Hz for 10 s
+                sampler = signalSampler(radio, 200)
+                sampler.run(10000)
+                sampler.printHistory()
+            if kbdInput == "B":                                       # Time I2C reads and pick the fastest reliable bus speed
+                radio.busSelfTest()
+                radio.printBusStats()
+            if kbdInput == "N":radio.bandMap.printMap()               # Stations and empty channels learned by seek and scan
+            if kbdInput == "G":                                       # Groups per type, repeats skipped by the cache and polling
+                radio.rds.printGroupStats()
+                self.scheduler.printStats()
+            if kbdInput == "O":radio.rds.getOda().printApplications()    # ODA announced in 3A, RadioText+ tags, TMC
+            if kbdInput == "T":                                       # Active TMC messages from 8A
+                oda = radio.rds.getOda()
+                tmc = oda.app(0xCD46) or oda.app(0xCD47)
+                if (tmc is None): print ("No TMC on this station")
+                else: tmc.printMessages()
+            if kbdInput == "H":                                       # Scan, then collect PI, PS, PTY, ECC and AF from every station
+                harvester = stationHarvester(radio, radio.getAllChannel())
+                harvester.run(rounds = 2)
+                harvester.printReport()
+                self.scheduler.reset()
+            # Presets: P<n> recall, S<n> store
+            if (len(kbdInput) == 2 and kbdInput[0] in "PS" and kbdInput[1] in "0123456789"):
+                if kbdInput[0] == "P":presets.recall(int(kbdInput[1]), radio)
+                else:presets.store(int(kbdInput[1]), radio)
+                self.scheduler.reset()
+            if kbdInput == "P":presets.printPresets()
+            if kbdInput == "D" and radio.stationDb is not None:radio.stationDb.printStations() # Stations remembered on flash
+            if kbdInput == "M":                                       # Duty-cycled, time.sleep_ms keeps USB alive (lightsleep would not)
+                monitor = rdsMonitor(radio, sleeper = time.sleep_ms)
+                print ("Trigger    : " + str(monitor.run(600000)))
+                monitor.printReport()
+                radio.setMute(0)
+                self.scheduler.reset()
+            if kbdInput == "TA":                                      # Volume up for announcements, tuned to other networks by EON, Ctrl-C stops
+                traffic = trafficAnnouncement(radio, trafficAnnouncement.CHANNEL)
+                traffic.run(600000)
+                traffic.printStats()
+                self.scheduler.reset()
+            if kbdInput == "PF":                                      # Time driver operations, per operation histograms
+                if (self.profiler.enabled):
+                    self.profiler.disable()
+                    self.profiler.printTable()
+                else:
+                    self.profiler.clear()
+                    self.profiler.enable()
+                    print ("Profiler on")
+            if kbdInput == "9":
+                print("Heap after powerUp: %d, now: %d, free: %d, uptime: %d ms" % radio.memoryReport())
+                radio.rds.printModules()
+
+            # Group types are live filters on the running stream
+            if kbdInput in GROUPNAME:
+                if kbdInput in self.liveFilter: self.liveFilter.remove(kbdInput)
+                else: self.liveFilter.append(kbdInput)
+                print ("Showing    : " + (", ".join(self.liveFilter) if self.liveFilter else "-"))
+            if kbdInput == "F":self.liveFilter = []
+
+        if kbdInput == "PU":
+            radio.powerUp()
+            self.scheduler.reset()
         if kbdInput == "PD":radio.powerDown()
-        if kbdInput == "Q":break
+        if kbdInput == "Q":self.running = 0
         if kbdInput == "":menu()
-        
+
+try:
+    console(radio).run()
 except KeyboardInterrupt:
         print ("Exit")
-        
-radio.PowerDown()
+
+radio.powerDown()
 print ("Exit program")
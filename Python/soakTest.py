@@ -0,0 +1,42 @@
+# (c) 2024 SA6HBR
+#
+# Soak test, runs SCRIPT (see imports/rdsSoak.py) iterations times and prints the step
+# latencies and the heap. A progress line every 100 iterations shows slowdowns and leaks as
+# they build up.
+#
+# Run with: mpremote run soakTest.py
+# simulate = 1 runs against imports/si4703Sim.py, without a radio.
+#
+
+from imports.si4703Library import rdsRadio
+from imports.rdsSoak import soakRunner
+
+resetPin_id = 13
+sdioPin_id  = 4
+sclkPin_id  = 5
+gpio2Pin_id = None
+simulate    = 0
+iterations  = 1000
+maxTime     = 0      # ms, 0 = until iterations are done
+
+SCRIPT = """
+pu                  # power up
+tune 1038    <200
+ps           <3000  # programme service name
+2 x20        <3000  # seek up 20 times
+tune 1038    <200
+4a           <65000 # clock time, sent once a minute
++ x3
+- x3
+pd
+"""
+
+i2c = None
+if (simulate):
+    from imports.si4703Sim import si4703Sim
+    i2c = si4703Sim()
+
+radio = rdsRadio(0x10, resetPin_id, sdioPin_id, sclkPin_id, gpio2Pin_id, i2c=i2c)
+soak  = soakRunner(radio, SCRIPT)
+soak.run(iterations, maxTime)
+soak.printReport()
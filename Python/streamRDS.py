@@ -0,0 +1,65 @@
+# (c) 2024 SA6HBR
+#
+# Receiver node for host/rdsDaemon.py
+# Streams every raw RDS group, once, and a STATUSRSSI sample every statusInterval ms as binary
+# frames (imports/rdsFrame.py) over the USB-CDC serial port. Nothing is decoded on the Pico,
+# the host does that for all receivers. Without GPIO2 the groups are read in step with the
+# group rate (imports/rdsScheduler.py).
+#
+# Copy to the Pico as main.py on a receiver node, or run with: mpremote run streamRDS.py
+# Set receiverName per node, the daemon shows it next to the port.
+# simulate = 1 streams from imports/si4703Sim.py, for a daemon test without a radio.
+#
+
+from imports.si4703Library import rdsRadio
+from imports.rdsFrame import frameWriter
+from imports.rdsScheduler import groupScheduler
+import time
+import sys
+
+resetPin_id  = 13
+sdioPin_id   = 4
+sclkPin_id   = 5
+gpio2Pin_id  = None
+channel      = 1038
+receiverName = "pico-1"
+simulate     = 0
+
+statusInterval = 1000 # ms between STATUS frames
+helloInterval  = 10000 # ms between HELLO frames, lets the daemon name a port it opened late
+
+i2c = None
+if (simulate):
+    from imports.si4703Sim import si4703Sim
+    i2c = si4703Sim()
+
+radio = rdsRadio(0x10, resetPin_id, sdioPin_id, sclkPin_id, gpio2Pin_id, i2c=i2c)
+radio.powerUp()
+radio.setChannel(channel)
+
+scheduler = groupScheduler(radio) if gpio2Pin_id is None else None
+writer = frameWriter(sys.stdout.buffer)
+regs   = radio.radioRegister
+writer.hello(receiverName)
+statusTime = time.ticks_ms()
+helloTime  = statusTime
+
+try:
+    while True:
+        if (scheduler.poll() if scheduler is not None else radio.waitRDS(0) == radio.HIGH):
+            # BLERA in 0x0A, BLERB/C/D in 0x0B
+            BLER = (((regs[0x0A] >> 9) & 0b11) << 6) | ((regs[0x0B] >> 10) & 0b111111)
+            writer.group(radio.rdsReadyTime, regs[radio.RDSA], regs[radio.RDSB], regs[radio.RDSC], regs[radio.RDSD], BLER, radio.CHANNEL)
+        now = time.ticks_ms()
+        if (time.ticks_diff(now, statusTime) >= statusInterval):
+            statusTime = now
+            writer.status(now, radio.readStatusRSSI(), radio.CHANNEL)
+        if (time.ticks_diff(now, helloTime) >= helloInterval):
+            helloTime = now
+            writer.hello(receiverName)
+        wait = scheduler.waitMs() if scheduler is not None else 1
+        time.sleep_ms(min(wait, time.ticks_diff(statusTime, now) + statusInterval))
+except KeyboardInterrupt:
+    pass
+
+radio.powerDown()